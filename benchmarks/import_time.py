@@ -0,0 +1,79 @@
+"""
+Import-time check of the application's cold start.
+
+A run that finds no new files only needs the Drive listing, so importing
+main and building the Drive service must not pull in Gemini, gspread or the
+Pydantic schemas. Each measurement runs in a fresh interpreter.
+
+Usage (from the repository root):
+    python benchmarks/import_time.py [runs]
+
+Exits with status 1 if a heavy module is imported at startup.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+# Needed only once there are files to analyze
+HEAVY_MODULES = ["google.genai", "gspread", "gspread_formatting", "pydantic", "httpx"]
+
+COLD_START = f"""
+import json, sys, time
+from datetime import datetime, timedelta
+
+started = time.perf_counter()
+import main
+from google.oauth2.credentials import Credentials
+from google_services import GoogleClientPool
+
+
+class FakeAuth:
+    def get_credentials(self):
+        return Credentials(token="token", expiry=datetime.utcnow() + timedelta(hours=1))
+
+
+pool = GoogleClientPool(FakeAuth())
+# The listing request is built, not executed
+pool.drive().files().list(q="trashed = false")
+pool.close()
+print(json.dumps({{
+    "seconds": time.perf_counter() - started,
+    "modules": len(sys.modules),
+    "heavy": [name for name in {HEAVY_MODULES!r} if name in sys.modules],
+}}))
+"""
+
+
+def measure() -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", COLD_START],
+        cwd=SRC,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    results = [measure() for _ in range(runs)]
+
+    seconds = sorted(result["seconds"] for result in results)
+    print(
+        f"Cold start over {runs} runs: {seconds[0]:.3f}-{seconds[-1]:.3f}s, "
+        f"{results[0]['modules']} modules."
+    )
+
+    heavy = sorted({name for result in results for name in result["heavy"]})
+    if heavy:
+        print(f"Heavy modules imported at startup: {', '.join(heavy)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Micro-benchmark of building sheet rows from reports.
+
+Compares the compiled index plan of GoogleSheetEditor.prepare_rows with the
+previous per-row builder, which re-parsed the column letters of the mapping
+for every report. Both must produce the same rows.
+
+Usage (from the repository root):
+    python benchmarks/row_building.py [report count]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from gspread.utils import column_letter_to_index  # noqa: E402
+
+from constants import ConfigFiles  # noqa: E402
+from excel_table.google_spreadsheets.editor import GoogleSheetEditor  # noqa: E402
+
+REPORT = {
+    "transcription": "Менеджер: Добрий день\nКлієнт: Добрий день",
+    "call_type": "Запис на сервіс",
+    "manager_name": "Іван",
+    "script_greeting": True,
+    "script_farewell": False,
+    "car_info_body_asked": True,
+    "car_info_year_asked": True,
+    "car_info_mileage_asked": False,
+    "upsale_diagnostics_offered": False,
+    "upsale_previous_work_asked": True,
+    "service_booking_date": "",
+    "top_works_mentioned": ["Заміна оливи ДВЗ", "Комплексне ТО"],
+    "parts_discussed": "",
+    "call_result": "Запис створено",
+    "comment": "Коментар",
+    "total_score": 4,
+    "is_comment_negative": False,
+    "duplicate_of": None,
+    "source_file_name": "call.mp3",
+}
+
+
+def per_row_builder(mapping: dict, data: dict) -> list:
+    """The row builder used before the mapping was compiled."""
+    max_col_num = max(column_letter_to_index(letter) for letter in mapping.values())
+    row = [""] * max_col_num
+    for field, col_letter in mapping.items():
+        col_index = column_letter_to_index(col_letter) - 1
+        value = data.get(field)
+        if isinstance(value, bool):
+            row[col_index] = "1" if value else "0"
+        elif isinstance(value, list):
+            row[col_index] = ", ".join(map(str, value))
+        elif value is None:
+            row[col_index] = ""
+        else:
+            row[col_index] = str(value)
+    return row
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    reports = [dict(REPORT) for _ in range(count)]
+
+    editor = GoogleSheetEditor(client=None, worksheet=None)
+    editor.load_mapping(ConfigFiles.COLUMN_MAPPING)
+
+    started = time.perf_counter()
+    expected = [per_row_builder(editor.mapping, report) for report in reports]
+    per_row_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    rows = editor.prepare_rows(reports)
+    compiled_time = time.perf_counter() - started
+
+    assert rows == expected, "prepare_rows output differs from the per-row builder"
+    print(
+        f"{count} reports: per-row builder {per_row_time:.2f}s, "
+        f"prepare_rows {compiled_time:.2f}s (x{per_row_time / compiled_time:.1f})"
+    )
+
+
+if __name__ == "__main__":
+    main()
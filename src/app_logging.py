@@ -0,0 +1,124 @@
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import queue
+import sys
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Context attached to every record logged in the current thread/task.
+# Worker threads have to copy the context explicitly (contextvars.copy_context).
+run_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "run_id", default=None
+)
+file_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "file_id", default=None
+)
+
+_listener: Optional[QueueListener] = None
+
+
+@contextmanager
+def log_context(run_id: Optional[str] = None, file_id: Optional[str] = None):
+    """Sets the run_id / file_id of the records logged inside the block."""
+    tokens = []
+    if run_id is not None:
+        tokens.append((run_id_var, run_id_var.set(run_id)))
+    if file_id is not None:
+        tokens.append((file_id_var, file_id_var.set(file_id)))
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    """Copies the current run_id / file_id onto the record."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.run_id = run_id_var.get()
+        record.file_id = file_id_var.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats each record as a single JSON line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key in ("run_id", "file_id"):
+            value = getattr(record, key, None)
+            if value is not None:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class _ContextQueueHandler(QueueHandler):
+    """
+    Puts records on the queue with the message already merged and the
+    traceback rendered, so the listener thread never touches objects that
+    the logging thread may still be changing.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        return record
+
+
+def configure_logging(level: str = "INFO", log_format: str = "text"):
+    """
+    Configures logging once, at the entry point.
+
+    Records are put on an in-memory queue by the logging thread and written
+    to stdout by a single background listener, so slow output never blocks
+    the workers.
+
+    Args:
+        level: Root log level name.
+        log_format: "text" or "json" (one JSON object per line).
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    output_handler = logging.StreamHandler(sys.stdout)
+    if log_format == "json":
+        output_handler.setFormatter(JsonFormatter())
+    else:
+        output_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = _ContextQueueHandler(log_queue)
+    # The filter runs in the logging thread, where the context is set
+    queue_handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    root.handlers[:] = [queue_handler]
+    root.setLevel(level.upper())
+
+    _listener = QueueListener(log_queue, output_handler)
+    _listener.start()
+    # Flushes the records left on the queue when the process exits
+    atexit.register(_listener.stop)
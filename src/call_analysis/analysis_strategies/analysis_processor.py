@@ -1,22 +1,99 @@
 import logging
-from typing import List, Dict, Any
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, TYPE_CHECKING
 
 from .base_strategy import BaseAnalysisStrategy
-from .gemini.output_schema import CallAnalysisResult
+from .gemini.output_schema import (
+    CallAnalysisResult,
+    CallEvaluation,
+    format_transcript,
+    transcript_adapter,
+)
 from google_drive.audio_downloader import AudioDownloader
+from call_analysis.deduplicator import CallDeduplicator
+from call_analysis.pre_filter import skipped_call_analysis
+from app_logging import log_context
+from tracing import start_span
+from memory_profiling import track_file_memory
 from constants import TableConfig
-from utils import configure_logging
 
-configure_logging()
+if TYPE_CHECKING:
+    from call_analysis.pre_filter import RecordingPreFilter
+    from call_analysis.run_checkpoint import RunCheckpoint
+    from call_analysis.transcript_cache import CachedTranscript, TranscriptCache
+    from call_analysis.rule_scorer import ScriptRuleScorer
+    from call_analysis.works_catalog import WorksCatalogIndex
+
 logger = logging.getLogger(__name__)
 
 
+@dataclass(slots=True)
 class ProcessedCall:
-    """Container for storing the source file name and its analysis result."""
+    """
+    Container for storing the source file name and its analysis result.
+
+    This is the single internal record passed from the analyzer to the result
+    handlers. The analysis stays a validated Pydantic object; handlers read
+    fields through get() instead of working on dumped dict copies.
+    """
+
+    source_file_name: str
+    analysis: CallAnalysisResult
+    source_file_id: Optional[str] = None
+    # Name of the original recording if this file is a duplicate of it
+    duplicate_of: Optional[str] = None
+    # Why the pre-filter skipped the recording; its analysis is only a marker
+    skip_reason: Optional[str] = None
+    total_score: Optional[int] = None
+    _transcription: Optional[str] = field(default=None, repr=False)
+
+    @property
+    def transcript(self) -> list:
+        return self.analysis.transcript
+
+    @property
+    def transcription(self) -> str:
+        """The transcript formatted for the sheet view, built once on first use."""
+        if self._transcription is None:
+            self._transcription = self._create_transcription_string()
+        return self._transcription
+
+    def _create_transcription_string(self) -> str:
+        if not self.transcript:
+            return "Transcription is missing."
+
+        return format_transcript(self.transcript)
+
+    def transcript_json(self) -> bytes:
+        """Serializes the transcript to JSON bytes in a single pass."""
+        return transcript_adapter.dump_json(self.transcript, indent=2)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Dict-like read access to the report fields, as used by the column mapping.
+        """
+        if key == "source_file_name":
+            return self.source_file_name
+        if key == "duplicate_of":
+            return self.duplicate_of
+        if key == TableConfig.TOTAL_SCORE:
+            return self.total_score
+        if key == "transcription":
+            return self.transcription
+        return self.analysis.__dict__.get(key, default)
 
-    def __init__(self, source_file_name: str, analysis: CallAnalysisResult):
-        self.source_file_name = source_file_name
-        self.analysis = analysis
+
+def create_skipped_call(
+    file_id: Optional[str], file_name: str, skip_reason: str
+) -> ProcessedCall:
+    """Creates the record of a recording that was skipped by the pre-filter."""
+    return ProcessedCall(
+        source_file_name=file_name,
+        analysis=skipped_call_analysis(skip_reason),
+        source_file_id=file_id,
+        skip_reason=skip_reason,
+    )
 
 
 class CallAnalyzer:
@@ -30,18 +107,57 @@ class CallAnalyzer:
         self,
         strategy: BaseAnalysisStrategy,
         downloader: AudioDownloader,
+        deduplicator: Optional[CallDeduplicator] = None,
+        checkpoint: Optional["RunCheckpoint"] = None,
+        transcript_cache: Optional["TranscriptCache"] = None,
+        pre_filter: Optional["RecordingPreFilter"] = None,
     ):
         self._strategy = strategy
         self._downloader = downloader
+        self._deduplicator = deduplicator
+        self._checkpoint = checkpoint
+        self._transcript_cache = transcript_cache
+        self._pre_filter = pre_filter
         logger.info(
             f"CallAnalyzer initialized with strategy: {self._strategy.__class__.__name__}"
         )
 
-    def analyze_files(self, audio_files: List[Dict[str, str]]) -> List[ProcessedCall]:
+    def _store(self, processed_results: List[ProcessedCall], call: ProcessedCall):
+        processed_results.append(call)
+        if self._checkpoint:
+            self._checkpoint.record_call(call)
+
+    def analyze_files(
+        self,
+        audio_files: List[Dict[str, str]],
+        known_results: Optional[List[ProcessedCall]] = None,
+    ) -> List[ProcessedCall]:
         """
         Downloads and analyzes a list of audio files using the injected strategy.
+        If a deduplicator is set, copies of recordings analyzed in this or an
+        earlier run reuse the original's result instead of being sent to the strategy.
+        If a pre-filter is set, the recordings it rejects get a marker result.
+
+        Args:
+            audio_files: Drive file dicts to analyze.
+            known_results: Results from an earlier attempt of the same run.
+                           These files are not analyzed again, but can still
+                           serve as originals for duplicates.
+
+        Returns:
+            Only the newly produced results.
         """
         processed_results = []
+        processed_by_id: Dict[str, ProcessedCall] = {
+            call.source_file_id: call for call in known_results or []
+        }
+        checksum_duplicates = []
+
+        if self._deduplicator:
+            audio_files, checksum_duplicates = self._deduplicator.split_by_checksum(
+                audio_files
+            )
+
         for file in audio_files:
             file_name = file.get("name", "Unknown")
             file_id = file.get("id", None)
@@ -50,84 +166,270 @@ class CallAnalyzer:
                 logger.warning(f"Skipping file '{file_name}' - missing 'id'.")
                 continue
 
-            logger.info(f"Processing file: {file_name} ({file_id})")
+            if file_id in processed_by_id:
+                logger.info(f"File {file_name} was already analyzed. Skipping.")
+                continue
 
-            # 1. Download file
-            audio_bytes = self._downloader.download_file_in_memory(file_id)
-            if not audio_bytes:
-                logger.warning(f"Failed to download {file_name}. Skipping.")
+            # One trace per audio file
+            with log_context(file_id=file_id), start_span(
+                "call.analyze", file_id=file_id, file_name=file_name
+            ), track_file_memory(file_name):
+                self._analyze_file(
+                    file_id,
+                    file_name,
+                    processed_results,
+                    processed_by_id,
+                    file_size=file.get("size"),
+                    checksum=file.get("md5Checksum"),
+                )
+
+        # 5. Attach the results of the originals to their checksum duplicates
+        for file, original_id in checksum_duplicates:
+            if file.get("id") in processed_by_id:
+                continue
+            original = processed_by_id.get(original_id)
+            if not original:
+                logger.warning(
+                    f"Original of duplicate file {file.get('name')} was not analyzed. Skipping."
+                )
                 continue
+            self._store(
+                processed_results,
+                self._create_duplicate(file.get("id"), file.get("name"), original),
+            )
+
+        if self._deduplicator:
+            self._deduplicator.save()
+
+        return processed_results
 
-            # 2. Delegate analysis to the strategy
-            logger.info(
-                f"Sending file to '{self._strategy.__class__.__name__}' for analysis..."
+    def _analyze_file(
+        self,
+        file_id: str,
+        file_name: str,
+        processed_results: List[ProcessedCall],
+        processed_by_id: Dict[str, ProcessedCall],
+        file_size: Optional[str] = None,
+        checksum: Optional[str] = None,
+    ):
+        """Downloads and analyzes a single file (or reuses an identical one's result)."""
+        logger.info(f"Processing file: {file_name} ({file_id})")
+
+        # A copy analyzed in an earlier run is found before the download
+        if self._deduplicator and checksum:
+            earlier_copy = self._deduplicator.find_earlier_copy(
+                file_id, checksum=checksum
             )
-            call_analysis = self._strategy.analyse_call(audio_bytes)
+            if earlier_copy:
+                duplicate = self._create_cached_duplicate(
+                    file_id, file_name, earlier_copy
+                )
+                self._store(processed_results, duplicate)
+                processed_by_id[file_id] = duplicate
+                return
+
+        # 1. Download file
+        audio_bytes = self._downloader.download_file_in_memory(file_id, file_size)
+        if not audio_bytes:
+            logger.warning(f"Failed to download {file_name}. Skipping.")
+            return
 
-            # 3. Store result
-            if call_analysis:
-                processed_call = ProcessedCall(
-                    source_file_name=file_name, analysis=call_analysis
+        # Missed calls and silent recordings are not worth a request
+        if self._pre_filter:
+            skip_reason = self._pre_filter.check(audio_bytes)
+            if skip_reason:
+                logger.info(f"File {file_name} skipped by pre-filter: {skip_reason}.")
+                skipped_call = create_skipped_call(file_id, file_name, skip_reason)
+                self._store(processed_results, skipped_call)
+                processed_by_id[file_id] = skipped_call
+                return
+
+        # 2. Reuse the result of an identical recording, if there is one
+        audio_hash = None
+        if self._deduplicator:
+            audio_hash = self._deduplicator.audio_hash(audio_bytes)
+            original_id = self._deduplicator.find_original(audio_hash)
+            duplicate = None
+            if original_id:
+                duplicate = self._create_duplicate(
+                    file_id, file_name, processed_by_id[original_id]
                 )
-                processed_results.append(processed_call)
-                logger.info(f"File {file_name} successfully analyzed.")
             else:
-                logger.warning(f"Analysis of file {file_name} failed. Skipping.")
+                earlier_copy = self._deduplicator.find_earlier_copy(
+                    file_id, audio_hash=audio_hash
+                )
+                if earlier_copy:
+                    duplicate = self._create_cached_duplicate(
+                        file_id, file_name, earlier_copy
+                    )
+            if duplicate:
+                self._store(processed_results, duplicate)
+                processed_by_id[file_id] = duplicate
+                return
 
-        return processed_results
+        # 3. Delegate analysis to the strategy
+        logger.info(
+            f"Sending file to '{self._strategy.__class__.__name__}' for analysis..."
+        )
+        call_analysis = self._strategy.analyse_call(audio_bytes)
+
+        # 4. Store result
+        if call_analysis:
+            processed_call = ProcessedCall(
+                source_file_name=file_name,
+                analysis=call_analysis,
+                source_file_id=file_id,
+            )
+            self._store(processed_results, processed_call)
+            processed_by_id[file_id] = processed_call
+            if audio_hash:
+                self._deduplicator.remember(audio_hash, file_id, checksum)
+            self._cache_transcript(processed_call, audio_bytes, audio_hash)
+            logger.info(f"File {file_name} successfully analyzed.")
+        else:
+            logger.warning(f"Analysis of file {file_name} failed. Skipping.")
+
+    def _cache_transcript(
+        self, call: ProcessedCall, audio_bytes: bytes, audio_hash: Optional[str]
+    ):
+        """
+        Keeps the transcript and the evaluation, so the call can be re-scored
+        without its audio and copies in later runs can reuse the analysis.
+        """
+        if not self._transcript_cache or not call.transcript:
+            return
+        audio_hash = audio_hash or CallDeduplicator.audio_hash(audio_bytes)
+        evaluation = CallEvaluation.model_validate(
+            call.analysis.model_dump(exclude={"transcript"})
+        )
+        try:
+            cached = self._transcript_cache.get(audio_hash)
+            if cached and cached.evaluation == evaluation:
+                # Already cached by the strategy, together with its prompt ID
+                evaluation = None
+            self._transcript_cache.put(
+                audio_hash,
+                call.transcript,
+                source_file_id=call.source_file_id,
+                source_file_name=call.source_file_name,
+                evaluation=evaluation,
+            )
+        except OSError as e:
+            logger.warning(
+                f"Failed to cache transcript of {call.source_file_name}: {e}"
+            )
+
+    @staticmethod
+    def _create_cached_duplicate(
+        file_id: str, file_name: str, original: "CachedTranscript"
+    ) -> ProcessedCall:
+        """Creates a record for a copy of a recording analyzed in an earlier run."""
+        logger.info(
+            f"File {file_name} is a duplicate of {original.source_file_name}, "
+            f"analyzed in an earlier run. Reusing its analysis."
+        )
+        return ProcessedCall(
+            source_file_name=file_name,
+            analysis=CallAnalysisResult(
+                transcript=original.transcript, **dict(original.evaluation)
+            ),
+            source_file_id=file_id,
+            duplicate_of=original.source_file_name,
+        )
+
+    def _create_duplicate(
+        self, file_id: str, file_name: str, original: ProcessedCall
+    ) -> ProcessedCall:
+        """Creates a record for a duplicate that shares the original's analysis."""
+        logger.info(
+            f"File {file_name} is a duplicate of {original.source_file_name}. Reusing its analysis."
+        )
+        return ProcessedCall(
+            source_file_name=file_name,
+            analysis=original.analysis,
+            source_file_id=file_id,
+            duplicate_of=original.source_file_name,
+            skip_reason=original.skip_reason,
+        )
 
 
 class ReportEvaluator:
     """
     Handles post-analysis processing:
-    1. Converts Pydantic models to dictionaries.
-    2. Scores and evaluates the results based on business logic.
+    scores and evaluates the results based on business logic.
     """
 
-    def __init__(self, processed_calls: List[ProcessedCall]):
+    def __init__(
+        self,
+        processed_calls: List[ProcessedCall],
+        rule_scorer: Optional["ScriptRuleScorer"] = None,
+        works_index: Optional["WorksCatalogIndex"] = None,
+    ):
         self._processed_calls = processed_calls
-        self._report_dicts = []
+        self._rule_scorer = rule_scorer
+        self._works_index = works_index
+        # Mentions that didn't map to any catalog entry -> number of calls
+        self.unmapped_mentions: Counter = Counter()
 
-    def _transform_models_to_dicts(self):
+    def _normalize_top_works(self):
         """
-        Converts the list of ProcessedCall objects to a list of dicts,
-        merging the source_file_name with the dumped analysis data.
+        Replaces the free-text work mentions with their canonical catalog
+        entries, so the sheet aggregates don't fragment on spelling variants.
         """
-        self._report_dicts = []
-
+        seen_analyses = set()
         for call in self._processed_calls:
-            analysis_dict = call.analysis.model_dump()
-            analysis_dict["source_file_name"] = call.source_file_name
-            self._report_dicts.append(analysis_dict)
-
-    def _transform_value(self, key: str, value: Any) -> Any:
-        """Transforms a single value for the final report (e.g., bool to 1/0)."""
-        if isinstance(value, bool):
-            if key in TableConfig.BOOL_TO_INT_FIELDS:
-                return 1 if value else 0
-            elif key == TableConfig.NEGATIVE_COMMENT:
-                return value  # Keep boolean
+            if call.skip_reason:
+                continue
+            # Duplicates share the analysis object of their original
+            if id(call.analysis) in seen_analyses:
+                continue
+            seen_analyses.add(id(call.analysis))
 
-        if value is None:
-            return ""  # Replace None with empty string
+            normalized, unmapped = self._works_index.normalize_mentions(
+                call.analysis.top_works_mentioned
+            )
+            call.analysis.top_works_mentioned = normalized
+            self.unmapped_mentions.update(match.mention for match in unmapped)
 
-        return value
+        if self.unmapped_mentions:
+            logger.warning(
+                f"Work mentions not found in the catalog: {dict(self.unmapped_mentions)}"
+            )
 
     def _evaluate_reports(self):
-        """Iterates over report dicts to score them."""
-        for report_dict in self._report_dicts:
-            final_score = 0
-            for key, value in report_dict.items():
-                new_value = self._transform_value(key, value)
-                report_dict[key] = new_value
+        """Scores each processed call in place. Skipped calls stay unscored."""
+        for call in self._processed_calls:
+            if call.skip_reason:
+                continue
+            values = call.analysis.__dict__
+            call.total_score = sum(
+                1 for key in TableConfig.BOOL_TO_INT_FIELDS if values.get(key)
+            )
 
-                # Add to score if it's a field we're tracking
-                if key in TableConfig.BOOL_TO_INT_FIELDS:
-                    final_score += new_value  # new_value is already 1 or 0
+    def _check_script_rules(self):
+        """
+        Compares the script fields decided by the local rules with the LLM output.
+        The LLM values are kept; disagreements are logged for review.
+        """
+        disagreeing_calls = 0
+        for call in self._processed_calls:
+            if call.duplicate_of or call.skip_reason:
+                continue
+            decisions = self._rule_scorer.score(call.transcript)
+            disagreements = self._rule_scorer.find_disagreements(
+                decisions, call.analysis
+            )
+            if disagreements:
+                disagreeing_calls += 1
+                logger.warning(
+                    f"Script rules disagree with the analysis of {call.source_file_name}: {disagreements}"
+                )
 
-            report_dict[TableConfig.TOTAL_SCORE] = final_score
+        logger.info(
+            f"Script rules check: {disagreeing_calls} of {len(self._processed_calls)} calls disagree with the analysis."
+        )
 
-    def generate_evaluated_reports(self) -> List[Dict[str, Any]]:
+    def generate_evaluated_reports(self) -> List[ProcessedCall]:
         """
         Public method to run the entire post-processing pipeline.
         """
@@ -135,11 +437,12 @@ class ReportEvaluator:
             f"Starting post-processing for {len(self._processed_calls)} reports..."
         )
 
-        # 1. Pydantic -> Dict
-        self._transform_models_to_dicts()
-
-        # 2. Score dicts
-        self._evaluate_reports()
+        with start_span("reports.evaluate", reports=len(self._processed_calls)):
+            if self._works_index:
+                self._normalize_top_works()
+            self._evaluate_reports()
+            if self._rule_scorer:
+                self._check_script_rules()
 
         logger.info("Post-processing and evaluation complete.")
-        return self._report_dicts
+        return self._processed_calls
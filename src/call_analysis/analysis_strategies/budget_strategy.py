@@ -0,0 +1,218 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, List, Optional
+
+from .base_strategy import BaseAnalysisStrategy
+from .gemini.output_schema import CallAnalysisResult
+from call_analysis.audio_info import estimate_duration
+
+logger = logging.getLogger(__name__)
+
+# Fallback for recordings whose duration can't be read: 128 kbps MP3
+_BYTES_PER_SECOND = 16_000
+
+
+class _BudgetWindow:
+    """Token spend of a sliding time window, as [timestamp, tokens] entries."""
+
+    def __init__(self, name: str, limit: int, length: float):
+        self.name = name
+        self.limit = limit
+        self.length = length
+        self.entries: Deque[List[float]] = deque()
+        self.used = 0
+
+    def expire(self, now: float):
+        while self.entries and self.entries[0][0] <= now - self.length:
+            self.used -= self.entries.popleft()[1]
+
+    def wait_time(self, tokens: int, now: float) -> float:
+        """Seconds until `tokens` more fit into the window (0 if they fit now)."""
+        excess = self.used + tokens - self.limit
+        if excess <= 0:
+            return 0.0
+        for timestamp, entry_tokens in self.entries:
+            excess -= entry_tokens
+            if excess <= 0:
+                return timestamp + self.length - now
+        return self.length
+
+
+class TokenBudgetScheduler:
+    """
+    Paces requests to a tokens-per-minute and a tokens-per-day budget.
+
+    acquire() reserves the estimated tokens of a request, waiting until they
+    fit into both sliding windows; settle() replaces the estimate with the
+    actual usage once the response is known. A long backlog is therefore
+    sent at the highest rate the quotas sustain, instead of failing in
+    bursts until the quota window resets.
+    """
+
+    def __init__(
+        self,
+        tokens_per_minute: int = 0,
+        tokens_per_day: int = 0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Args:
+            tokens_per_minute: Budget of a rolling minute; 0 means no limit.
+            tokens_per_day: Budget of a rolling 24 hours; 0 means no limit.
+        """
+        self._windows = [
+            _BudgetWindow(name, limit, length)
+            for name, limit, length in (
+                ("per-minute", tokens_per_minute, 60.0),
+                ("per-day", tokens_per_day, 86_400.0),
+            )
+            if limit > 0
+        ]
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self.total_wait = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._windows)
+
+    def acquire(self, tokens: int) -> Optional[List[float]]:
+        """
+        Blocks until the tokens fit into the budget and reserves them.
+
+        Returns:
+            The reservation to settle(), or None if no budget is set.
+        """
+        if not self._windows:
+            return None
+
+        while True:
+            with self._lock:
+                now = self._clock()
+                wait, reason = 0.0, None
+                for window in self._windows:
+                    window.expire(now)
+                    # A request bigger than the whole budget waits for an empty window
+                    needed = min(tokens, window.limit)
+                    window_wait = window.wait_time(needed, now)
+                    if window_wait > wait:
+                        wait = window_wait
+                        reason = (
+                            f"{window.name} budget: {window.used}/{window.limit} tokens used, "
+                            f"next call needs ~{tokens}"
+                        )
+
+                if wait <= 0:
+                    # One entry shared by all windows, so settle() corrects them all
+                    reservation = [now, tokens]
+                    for window in self._windows:
+                        window.entries.append(reservation)
+                        window.used += tokens
+                    return reservation
+
+            logger.info(f"Pausing for {wait:.1f}s - {reason}.")
+            self.total_wait += wait
+            self._sleep(wait)
+
+    def settle(self, reservation: Optional[List[float]], tokens: int):
+        """Replaces the estimate of a reservation with the actual token count."""
+        if reservation is None:
+            return
+        with self._lock:
+            difference = tokens - reservation[1]
+            reservation[1] = tokens
+            now = self._clock()
+            for window in self._windows:
+                # Entries that already expired are no longer counted
+                if reservation[0] > now - window.length:
+                    window.used += difference
+
+
+class BudgetedAnalysisStrategy(BaseAnalysisStrategy):
+    """
+    Puts a TokenBudgetScheduler in front of a Gemini strategy.
+
+    The input tokens of a call are estimated from the audio duration
+    (Gemini counts 32 tokens per second of audio) and the prompt size,
+    plus a reserve for the output. The estimate is corrected by the actual
+    usage_metadata of each response, and the ratio between them is learned,
+    so later estimates follow the real usage.
+    """
+
+    def __init__(
+        self,
+        strategy: BaseAnalysisStrategy,
+        scheduler: TokenBudgetScheduler,
+        prompt_tokens: int,
+        audio_tokens_per_second: int = 32,
+        output_tokens: int = 2000,
+    ):
+        """
+        Args:
+            strategy: The wrapped strategy; it should expose `last_usage`.
+            scheduler: Scheduler shared by all strategies of the run.
+            prompt_tokens: Estimated token count of the prompt.
+            audio_tokens_per_second: Input tokens per second of audio.
+            output_tokens: Expected output (and thinking) tokens of a call.
+        """
+        self._strategy = strategy
+        self._scheduler = scheduler
+        self._prompt_tokens = prompt_tokens
+        self._audio_tokens_per_second = audio_tokens_per_second
+        self._output_tokens = output_tokens
+        # Moving average of actual / estimated tokens
+        self._correction = 1.0
+        self._correction_lock = threading.Lock()
+
+    @property
+    def model(self) -> Optional[str]:
+        return getattr(self._strategy, "model", None)
+
+    @property
+    def last_usage(self):
+        return getattr(self._strategy, "last_usage", None)
+
+    def estimate_tokens(self, audio_file_data: bytes) -> int:
+        duration = estimate_duration(audio_file_data)
+        if duration is None:
+            duration = len(audio_file_data) / _BYTES_PER_SECOND
+        estimate = (
+            self._prompt_tokens
+            + duration * self._audio_tokens_per_second
+            + self._output_tokens
+        )
+        return int(estimate * self._correction)
+
+    def _learn(self, estimate: int, actual: int):
+        if estimate <= 0 or actual <= 0:
+            return
+        with self._correction_lock:
+            ratio = actual / (estimate / self._correction)
+            self._correction = 0.8 * self._correction + 0.2 * ratio
+
+    @staticmethod
+    def _total_tokens(usage) -> int:
+        return (usage.total_token_count or 0) or (
+            (usage.prompt_token_count or 0)
+            + (usage.candidates_token_count or 0)
+            + (usage.thoughts_token_count or 0)
+        )
+
+    def analyse_call(self, audio_file_data: bytes) -> CallAnalysisResult | None:
+        estimate = self.estimate_tokens(audio_file_data)
+        reservation = self._scheduler.acquire(estimate)
+        try:
+            return self._strategy.analyse_call(audio_file_data)
+        finally:
+            usage = self.last_usage
+            if usage is not None:
+                self._scheduler.settle(reservation, self._total_tokens(usage))
+                # The estimate is for a single request: a call retried by the
+                # strategy is learned from per attempt, not from its sum
+                attempts = getattr(self._strategy, "attempt_usages", None) or [usage]
+                for attempt_usage in attempts:
+                    self._learn(estimate, self._total_tokens(attempt_usage))
@@ -0,0 +1,102 @@
+import contextvars
+import logging
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from .base_strategy import BaseAnalysisStrategy
+from .gemini.output_schema import CallAnalysisResult
+
+logger = logging.getLogger(__name__)
+
+# Tenant whose calls are made in the current context (set by each tenant's thread)
+current_tenant: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "current_tenant", default=None
+)
+
+
+class FairShareGate:
+    """
+    Limits the number of concurrent analysis calls of all tenants and hands
+    the free slots out fairly.
+
+    When a slot frees up, it goes to the waiting tenant with the lowest
+    served / weight ratio (weighted round-robin), so a tenant with a large
+    backlog can't starve the others: a tenant with weight 2 gets twice the
+    calls of a tenant with weight 1 while both have work.
+    """
+
+    def __init__(self, weights: Dict[str, int], max_concurrent: int = 2):
+        """
+        Args:
+            weights: tenant name -> weight.
+            max_concurrent: Analysis calls allowed to run at the same time.
+        """
+        self._weights = {name: max(weight, 1) for name, weight in weights.items()}
+        self._order = {name: index for index, name in enumerate(weights)}
+        self._max_concurrent = max(max_concurrent, 1)
+        self._in_flight = 0
+        self._waiting: Counter = Counter()
+        self._served: Counter = Counter()
+        self._condition = threading.Condition()
+
+    def _next_tenant(self) -> str:
+        return min(
+            (name for name, count in self._waiting.items() if count > 0),
+            key=lambda name: (
+                self._served[name] / self._weights[name],
+                self._order[name],
+            ),
+        )
+
+    def acquire(self, tenant: str):
+        """Blocks until it is the tenant's turn and a slot is free."""
+        with self._condition:
+            self._waiting[tenant] += 1
+            while not (
+                self._in_flight < self._max_concurrent and self._next_tenant() == tenant
+            ):
+                self._condition.wait()
+            self._waiting[tenant] -= 1
+            self._in_flight += 1
+            self._served[tenant] += 1
+            # The next waiting tenant may fit into a remaining slot
+            self._condition.notify_all()
+
+    def release(self):
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    @contextmanager
+    def slot(self):
+        """Holds a slot of the current tenant (see current_tenant) while the block runs."""
+        self.acquire(current_tenant.get())
+        try:
+            yield
+        finally:
+            self.release()
+
+    def served(self) -> Dict[str, int]:
+        with self._condition:
+            return dict(self._served)
+
+
+class FairShareStrategy(BaseAnalysisStrategy):
+    """
+    Runs every call through a FairShareGate shared by all tenants,
+    on behalf of the current tenant (see current_tenant).
+    """
+
+    def __init__(self, strategy: BaseAnalysisStrategy, gate: FairShareGate):
+        self._strategy = strategy
+        self._gate = gate
+
+    def analyse_call(self, audio_file_data: bytes) -> CallAnalysisResult | None:
+        with self._gate.slot():
+            return self._strategy.analyse_call(audio_file_data)
+
+    def log_stats(self):
+        if hasattr(self._strategy, "log_stats"):
+            self._strategy.log_stats()
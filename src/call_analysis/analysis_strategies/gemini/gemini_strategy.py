@@ -1,5 +1,6 @@
 import logging
-import json
+import threading
+from typing import Optional
 from google.genai import Client, types
 from pydantic import ValidationError
 from ..base_strategy import BaseAnalysisStrategy
@@ -7,12 +8,21 @@ from call_analysis.analysis_strategies.gemini.output_schema import (
     CallAnalysisResult,
     config,
 )
-from utils import read_json, read_file, _format_list, configure_logging
+from utils import read_json, read_file, _format_list
+from tracing import start_span
 
-configure_logging()
 logger = logging.getLogger(__name__)
 
 
+def record_usage(span, usage: Optional[types.GenerateContentResponseUsageMetadata]):
+    """Annotates a span with the token counts of a response."""
+    if usage is None:
+        return
+    span.set_attribute("prompt_tokens", usage.prompt_token_count)
+    span.set_attribute("output_tokens", usage.candidates_token_count)
+    span.set_attribute("thoughts_tokens", usage.thoughts_token_count)
+
+
 class GeminiAnalysisStrategy(BaseAnalysisStrategy):
     """
     A concrete strategy implementation that uses the Gemini API
@@ -32,8 +42,23 @@ class GeminiAnalysisStrategy(BaseAnalysisStrategy):
         self._model = model
         self._prompt = prompt
         self._api_config = config
+        # Per-thread state, e.g. the token usage of the last response
+        self._local = threading.local()
         logger.debug("GeminiAnalysisStrategy initialized.")
 
+    @property
+    def model(self) -> str:
+        return self._model
+
+    @property
+    def prompt(self) -> str:
+        return self._prompt
+
+    @property
+    def last_usage(self) -> Optional[types.GenerateContentResponseUsageMetadata]:
+        """Token usage of the last response received in the calling thread."""
+        return getattr(self._local, "usage", None)
+
     @staticmethod
     def build_prompt_from_template(criteria_path: str, template_path: str) -> str:
         """
@@ -62,11 +87,17 @@ class GeminiAnalysisStrategy(BaseAnalysisStrategy):
         """
         audio_part = types.Part.from_bytes(data=audio_bytes, mime_type="audio/mp3")
 
-        response = self._client.models.generate_content(
-            model=self._model,
-            contents=[self._prompt, audio_part],
-            generation_config=self._api_config,
-        )
+        with start_span(
+            "gemini.generate_content", model=self._model, audio_bytes=len(audio_bytes)
+        ) as span:
+            response = self._client.models.generate_content(
+                model=self._model,
+                contents=[self._prompt, audio_part],
+                config=self._api_config,
+            )
+            record_usage(span, response.usage_metadata)
+
+        self._local.usage = response.usage_metadata
         return response
 
     def analyse_call(self, audio_file_data: bytes) -> CallAnalysisResult | None:
@@ -74,31 +105,35 @@ class GeminiAnalysisStrategy(BaseAnalysisStrategy):
         Analyzes the audio, parses the JSON response, and validates it.
         This is the implementation of the abstract method.
         """
+        self._local.usage = None
         try:
             # 1. Get the raw response from the API
             logger.debug("Sending audio to Gemini API...")
             raw_response = self._transcribe_audio(audio_file_data)
 
             # 2. Check if the response contains a parsed object (if response_schema is used)
-            if hasattr(raw_response, "parsed") and raw_response.parsed:
-                call_analysis = raw_response.parsed
-                logger.info("Successfully parsed response using 'response_schema'.")
-                return call_analysis
-            else:
-                # If .parsed is empty or not available, try to parse the text manually
-                logger.info("Parsing response from raw text...")
-                response_dict = json.loads(raw_response.text)
-                call_analysis = CallAnalysisResult(**response_dict)
-                return call_analysis
-
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON parsing error: {e}")
-            logger.error(
-                f"   Received response: {getattr(raw_response, 'text', 'no text')[:200]}..."
-            )
-            return None
+            with start_span(
+                "gemini.validate", response_chars=len(raw_response.text or "")
+            ):
+                if hasattr(raw_response, "parsed") and raw_response.parsed:
+                    call_analysis = raw_response.parsed
+                    logger.info("Successfully parsed response using 'response_schema'.")
+                    return call_analysis
+                else:
+                    # If .parsed is empty or not available, validate the raw JSON text
+                    # directly, without an intermediate dict.
+                    logger.info("Parsing response from raw text...")
+                    call_analysis = CallAnalysisResult.model_validate_json(
+                        raw_response.text
+                    )
+                    return call_analysis
+
         except ValidationError as e:
+            # model_validate_json reports malformed JSON as a validation error too
             logger.error(f"Pydantic validation error: {e}")
+            logger.error(
+                f"   Received response: {(getattr(raw_response, 'text', None) or 'no text')[:200]}..."
+            )
             return None
         except Exception as e:
             logger.error(f"Unexpected error during Gemini analysis: {e}")
@@ -0,0 +1,226 @@
+from bisect import bisect_right
+from typing import Iterator, List, Optional, Set, Tuple
+
+_WHITESPACE = " \t\r\n"
+
+
+class MalformedJsonStreamError(ValueError):
+    """The streamed text can no longer become the expected JSON object."""
+
+
+class JsonStreamEvents:
+    FIELD = "field"  # a top-level field is complete: (FIELD, key, raw JSON value)
+    ITEM = "item"  # an element of a streamed array is complete: (ITEM, key, raw JSON)
+    END = "end"  # the top-level object is closed: (END, None, None)
+
+
+class IncrementalJsonObjectScanner:
+    """
+    Scans a JSON object that arrives in chunks and reports its pieces
+    as soon as they are complete, without re-parsing the received text.
+    The chunks are kept as they arrive (not concatenated), and every
+    character is scanned once, so the work is linear in the text size.
+
+    Only the structure is tracked here (nesting, strings, separators);
+    the values themselves are returned raw, to be validated by the caller.
+    Elements of the arrays listed in `streamed_arrays` are reported one by
+    one, before the whole array is complete.
+    """
+
+    def __init__(self, streamed_arrays: Optional[Set[str]] = None):
+        self._streamed_arrays = streamed_arrays or set()
+        self._chunks: List[str] = []
+        # Position of the first character of each chunk in the whole text
+        self._chunk_starts: List[int] = []
+        self._length = 0
+
+        # Open containers: "{" or "["
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escaped = False
+        self._finished = False
+        # The last character outside strings that isn't whitespace
+        self._previous = ""
+
+        # Top-level object state
+        self._expect = "start"  # start, key, colon, value, separator
+        self._key_start = -1
+        self._current_key: Optional[str] = None
+        self._value_start = -1
+        self._item_start = -1
+
+    @property
+    def text(self) -> str:
+        """The whole text received so far."""
+        if len(self._chunks) > 1:
+            self._chunks = ["".join(self._chunks)]
+            self._chunk_starts = [0]
+        return self._chunks[0] if self._chunks else ""
+
+    def __len__(self) -> int:
+        return self._length
+
+    def _slice(self, start: int, end: int) -> str:
+        """Returns text[start:end], joining only the chunks it spans."""
+        first = bisect_right(self._chunk_starts, start) - 1
+        last = bisect_right(self._chunk_starts, end - 1) - 1
+        if first == last:
+            offset = self._chunk_starts[first]
+            return self._chunks[first][start - offset : end - offset]
+        text = "".join(self._chunks[first : last + 1])
+        offset = self._chunk_starts[first]
+        return text[start - offset : end - offset]
+
+    def feed(self, chunk: str) -> Iterator[Tuple[str, Optional[str], Optional[str]]]:
+        """
+        Adds a chunk of text and yields the pieces it completed.
+
+        Raises:
+            MalformedJsonStreamError: as soon as the text can't be a JSON object.
+        """
+        if not chunk:
+            return
+        self._chunks.append(chunk)
+        self._chunk_starts.append(self._length)
+        start = self._length
+        self._length += len(chunk)
+
+        for index, char in enumerate(chunk, start):
+            if self._finished:
+                if char not in _WHITESPACE:
+                    raise MalformedJsonStreamError(
+                        f"Unexpected text after the object at {index}."
+                    )
+                continue
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    if len(self._stack) == 1 and self._expect == "key":
+                        self._current_key = self._slice(self._key_start + 1, index)
+                        self._expect = "colon"
+                continue
+
+            if char in _WHITESPACE:
+                continue
+
+            if char in "}]" and self._previous == ",":
+                raise MalformedJsonStreamError(
+                    f"Trailing comma before {char!r} at {index}."
+                )
+            self._previous = char
+            depth = len(self._stack)
+
+            # --- Top level: only "{" is allowed ---
+            if depth == 0:
+                if self._expect != "start" or char != "{":
+                    raise MalformedJsonStreamError(
+                        f"Expected '{{' at {index}, got {char!r}."
+                    )
+                self._stack.append("{")
+                self._expect = "key"
+                continue
+
+            # --- Inside the top-level object ---
+            if depth == 1:
+                if self._expect == "key":
+                    if char == '"':
+                        self._in_string = True
+                        self._key_start = index
+                    elif char == "}" and self._current_key is None:
+                        yield from self._close_object()
+                    else:
+                        raise MalformedJsonStreamError(
+                            f"Expected a key at {index}, got {char!r}."
+                        )
+                    continue
+
+                if self._expect == "colon":
+                    if char != ":":
+                        raise MalformedJsonStreamError(
+                            f"Expected ':' at {index}, got {char!r}."
+                        )
+                    self._expect = "value"
+                    continue
+
+                if self._expect == "value":
+                    self._value_start = index
+                    self._expect = "separator"
+                    if char in "{[":
+                        self._stack.append(char)
+                    elif char == '"':
+                        self._in_string = True
+                    elif char in ",}]:":
+                        raise MalformedJsonStreamError(
+                            f"Expected a value at {index}, got {char!r}."
+                        )
+                    continue
+
+                # "separator": the end of a scalar value, or of the object
+                if char == ",":
+                    yield self._complete_field(index)
+                    self._expect = "key"
+                elif char == "}":
+                    yield self._complete_field(index)
+                    yield from self._close_object()
+                elif char in '{[]:"':
+                    raise MalformedJsonStreamError(
+                        f"Unexpected {char!r} after a value at {index}."
+                    )
+                continue
+
+            # --- Nested values ---
+            if char == '"':
+                self._in_string = True
+                if self._streamed_item_level(depth) and self._item_start < 0:
+                    self._item_start = index
+            elif char in "{[":
+                if self._streamed_item_level(depth) and self._item_start < 0:
+                    self._item_start = index
+                self._stack.append(char)
+            elif char in "}]":
+                expected = "{" if char == "}" else "["
+                if self._stack[-1] != expected:
+                    raise MalformedJsonStreamError(f"Mismatched {char!r} at {index}.")
+                # The streamed array itself closes: its last scalar element is complete
+                if self._streamed_item_level(depth) and self._item_start >= 0:
+                    yield self._complete_item(index)
+                self._stack.pop()
+                if self._streamed_item_level(len(self._stack)) and (
+                    self._item_start >= 0
+                ):
+                    yield self._complete_item(index + 1)
+            elif char == ",":
+                if self._streamed_item_level(depth) and self._item_start >= 0:
+                    yield self._complete_item(index)
+            elif self._streamed_item_level(depth) and self._item_start < 0:
+                # A number, true, false or null element
+                self._item_start = index
+
+    def _streamed_item_level(self, depth: int) -> bool:
+        """True when the scanner is directly inside a streamed top-level array."""
+        return (
+            depth == 2
+            and self._stack[1] == "["
+            and self._current_key in self._streamed_arrays
+        )
+
+    def _complete_item(self, end: int):
+        raw = self._slice(self._item_start, end).strip()
+        self._item_start = -1
+        return JsonStreamEvents.ITEM, self._current_key, raw
+
+    def _complete_field(self, end: int):
+        raw = self._slice(self._value_start, end).strip()
+        key = self._current_key
+        self._current_key = None
+        return JsonStreamEvents.FIELD, key, raw
+
+    def _close_object(self):
+        self._stack.pop()
+        self._finished = True
+        yield JsonStreamEvents.END, None, None
@@ -1,5 +1,5 @@
 from enum import Enum
-from pydantic import BaseModel, Field, field_serializer
+from pydantic import BaseModel, Field, TypeAdapter, field_serializer
 from typing import List, Optional
 
 
@@ -17,10 +17,15 @@ class DialogLine(BaseModel):
     text: str
 
 
-class CallAnalysisResult(BaseModel):
+class CallTranscript(BaseModel):
+    """Output of the transcription pass of the two-pass mode."""
 
     transcript: List[DialogLine] = Field(description="Повна транскрипція розмови.")
 
+
+class CallEvaluation(BaseModel):
+    """The analytical fields, which can be produced from the transcript text alone."""
+
     call_type: str = Field(
         description="Тип звернення: Консультація, Запис на сервіс, Уточнення, Скарга, Відмова."
     )
@@ -76,7 +81,33 @@ class CallAnalysisResult(BaseModel):
     )
 
 
+class CallAnalysisResult(CallEvaluation, CallTranscript):
+    """
+    The full result of a call: the transcript followed by the evaluation
+    (fields of the last base class come first in the schema).
+    """
+
+
+def format_transcript(transcript: List[DialogLine]) -> str:
+    """Formats the transcript as "Speaker: text" lines."""
+    return "\n".join(f"{line.speaker.value}: {line.text}" for line in transcript)
+
+
+# Serializes a transcript straight to JSON bytes, without building dicts first.
+transcript_adapter = TypeAdapter(List[DialogLine])
+
+
 config = {
     "response_mime_type": "application/json",
     "response_schema": CallAnalysisResult,
 }
+
+transcription_config = {
+    "response_mime_type": "application/json",
+    "response_schema": CallTranscript,
+}
+
+evaluation_config = {
+    "response_mime_type": "application/json",
+    "response_schema": CallEvaluation,
+}
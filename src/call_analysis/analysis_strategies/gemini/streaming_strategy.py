@@ -0,0 +1,191 @@
+import logging
+import time
+from typing import Dict, List, Optional
+from google.genai import Client, types
+from pydantic import TypeAdapter, ValidationError
+from .gemini_strategy import GeminiAnalysisStrategy, record_usage
+from .json_stream import (
+    IncrementalJsonObjectScanner,
+    JsonStreamEvents,
+    MalformedJsonStreamError,
+)
+from call_analysis.analysis_strategies.gemini.output_schema import (
+    CallAnalysisResult,
+    DialogLine,
+)
+from tracing import start_span
+
+logger = logging.getLogger(__name__)
+
+TRANSCRIPT_FIELD = "transcript"
+
+# The same line repeated this many times in a row means the model is looping
+MAX_REPEATED_LINES = 8
+
+# Validators of the single top-level fields, built once
+_FIELD_ADAPTERS: Dict[str, TypeAdapter] = {
+    name: TypeAdapter(field.annotation)
+    for name, field in CallAnalysisResult.model_fields.items()
+    if name != TRANSCRIPT_FIELD
+}
+
+_TOKEN_COUNT_FIELDS = [
+    name
+    for name in types.GenerateContentResponseUsageMetadata.model_fields
+    if name.endswith("_token_count")
+]
+
+
+def _add_usage(
+    total: Optional[types.GenerateContentResponseUsageMetadata],
+    usage: Optional[types.GenerateContentResponseUsageMetadata],
+) -> Optional[types.GenerateContentResponseUsageMetadata]:
+    """Sums the token counts of two responses (either may be missing)."""
+    if total is None or usage is None:
+        return total or usage
+    return types.GenerateContentResponseUsageMetadata(
+        **{
+            name: (getattr(total, name) or 0) + (getattr(usage, name) or 0)
+            for name in _TOKEN_COUNT_FIELDS
+        }
+    )
+
+
+class StreamingGeminiAnalysisStrategy(GeminiAnalysisStrategy):
+    """
+    Receives the analysis with generate_content_stream and validates it
+    piece by piece while it is being generated: every transcript line and
+    every top-level field is checked as soon as it is complete.
+
+    Malformed or looping output is detected early. The stream is then
+    dropped (no more output tokens are paid for) and the request is retried,
+    instead of waiting for a complete response that fails validation anyway.
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        model: str,
+        prompt: str,
+        max_attempts: int = 2,
+    ):
+        """
+        Args:
+            client: An authenticated Google Gemini Client.
+            model: The model name.
+            prompt: The fully constructed prompt string.
+            max_attempts: Attempts per call when the output is malformed.
+        """
+        super().__init__(client=client, model=model, prompt=prompt)
+        self._max_attempts = max_attempts
+
+    @property
+    def attempt_usages(self) -> List[types.GenerateContentResponseUsageMetadata]:
+        """
+        Token usage of each attempt of the last call in the calling thread,
+        the dropped ones included; last_usage is their sum.
+        """
+        usages = getattr(self._local, "attempt_usages", [])
+        return [usage for usage in usages if usage is not None]
+
+    def _validate_piece(self, event: str, key: str, raw: str):
+        """Validates a completed piece."""
+        if event == JsonStreamEvents.ITEM:
+            value = DialogLine.model_validate_json(raw)
+        elif key == TRANSCRIPT_FIELD:
+            # Its lines were already validated one by one
+            return None
+        else:
+            adapter = _FIELD_ADAPTERS.get(key)
+            if adapter is None:
+                raise MalformedJsonStreamError(f"Unexpected field '{key}'.")
+            value = adapter.validate_json(raw)
+        return value
+
+    def _stream_analysis(self, audio_bytes: bytes) -> CallAnalysisResult:
+        """
+        Streams one response and validates it incrementally.
+        Its token usage is recorded as an attempt of the current call.
+
+        Raises:
+            MalformedJsonStreamError or ValidationError as soon as the output is bad.
+        """
+        audio_part = types.Part.from_bytes(data=audio_bytes, mime_type="audio/mp3")
+        scanner = IncrementalJsonObjectScanner(streamed_arrays={TRANSCRIPT_FIELD})
+        previous_line, repeats = None, 0
+        usage = None
+
+        with start_span(
+            "gemini.generate_content_stream",
+            model=self._model,
+            audio_bytes=len(audio_bytes),
+        ) as span:
+            started = time.perf_counter()
+            stream = self._client.models.generate_content_stream(
+                model=self._model,
+                contents=[self._prompt, audio_part],
+                config=self._api_config,
+            )
+            try:
+                for chunk in stream:
+                    if chunk.usage_metadata:
+                        # Each chunk reports the usage of the whole stream so far
+                        usage = chunk.usage_metadata
+                    if not chunk.text:
+                        continue
+
+                    for event, key, raw in scanner.feed(chunk.text):
+                        if event == JsonStreamEvents.END:
+                            continue
+                        value = self._validate_piece(event, key, raw)
+
+                        if event == JsonStreamEvents.ITEM:
+                            if repeats == 0:
+                                span.set_attribute(
+                                    "first_piece_ms",
+                                    round((time.perf_counter() - started) * 1000),
+                                )
+                            line = (value.speaker, value.text)
+                            repeats = repeats + 1 if line == previous_line else 1
+                            previous_line = line
+                            if repeats >= MAX_REPEATED_LINES:
+                                raise MalformedJsonStreamError(
+                                    f"The model repeats the same line: {value.text[:50]!r}."
+                                )
+            finally:
+                # Closes the HTTP stream if we stopped reading early
+                close = getattr(stream, "close", None)
+                if close:
+                    close()
+                record_usage(span, usage)
+                # A dropped attempt is paid for as well
+                self._local.attempt_usages.append(usage)
+                self._local.usage = _add_usage(self._local.usage, usage)
+                span.set_attribute("response_chars", len(scanner))
+
+        # The pieces are valid; the final check covers the object as a whole
+        return CallAnalysisResult.model_validate_json(scanner.text)
+
+    def analyse_call(self, audio_file_data: bytes) -> CallAnalysisResult | None:
+        self._local.usage = None
+        self._local.attempt_usages = []
+        for attempt in range(1, self._max_attempts + 1):
+            try:
+                logger.debug("Streaming audio analysis from Gemini API...")
+                call_analysis = self._stream_analysis(audio_file_data)
+                logger.info("Successfully parsed streamed response.")
+                return call_analysis
+
+            except (MalformedJsonStreamError, ValidationError) as e:
+                usage = self._local.attempt_usages[-1]
+                tokens = usage.total_token_count if usage else "unknown"
+                logger.warning(
+                    f"Malformed streamed response (attempt {attempt}/{self._max_attempts}, "
+                    f"{tokens} tokens): {e}"
+                )
+            except Exception as e:
+                logger.error(f"Unexpected error during Gemini analysis: {e}")
+                return None
+
+        logger.error("No valid response received from Gemini.")
+        return None
@@ -0,0 +1,183 @@
+import hashlib
+import logging
+from typing import List, Optional, Type
+from google.genai import Client, types
+from pydantic import BaseModel, ValidationError
+from .gemini_strategy import GeminiAnalysisStrategy, record_usage
+from call_analysis.analysis_strategies.gemini.output_schema import (
+    CallAnalysisResult,
+    CallEvaluation,
+    CallTranscript,
+    DialogLine,
+    format_transcript,
+    transcription_config,
+    evaluation_config,
+)
+from call_analysis.deduplicator import CallDeduplicator
+from call_analysis.transcript_cache import CachedTranscript, TranscriptCache
+from tracing import start_span
+
+logger = logging.getLogger(__name__)
+
+
+class TwoPassGeminiStrategy(GeminiAnalysisStrategy):
+    """
+    Splits the analysis into two Gemini requests:
+    1. Transcription - audio in, DialogLine list out. Cached by audio hash.
+    2. Evaluation - the evaluation prompt over the transcript text only.
+
+    A recording is transcribed at most once; re-running the analysis with
+    changed criteria costs only the cheap text-only pass.
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        model: str,
+        transcription_prompt: str,
+        evaluation_prompt: str,
+        cache: TranscriptCache,
+    ):
+        """
+        Initializes the two-pass strategy.
+
+        Args:
+            client: An authenticated Google Gemini Client.
+            model: The model name used for both passes.
+            transcription_prompt: The prompt of the audio transcription pass.
+            evaluation_prompt: The fully constructed prompt of the text-only evaluation pass.
+            cache: Transcript cache shared between runs.
+        """
+        super().__init__(client=client, model=model, prompt=evaluation_prompt)
+        self._transcription_prompt = transcription_prompt
+        self._cache = cache
+        self._evaluation_prompt_id = hashlib.blake2b(
+            evaluation_prompt.encode("utf-8"), digest_size=8
+        ).hexdigest()
+
+    @property
+    def evaluation_prompt_id(self) -> str:
+        """
+        Identifies the evaluation prompt (with the criteria injected).
+        Cached evaluations made with a different prompt are outdated.
+        """
+        return self._evaluation_prompt_id
+
+    def _add_usage(self, usage: Optional[types.GenerateContentResponseUsageMetadata]):
+        """Sums up the token usage of both passes of the current call."""
+        if usage is None:
+            return
+        previous = self.last_usage
+        if previous is None:
+            self._local.usage = usage
+            return
+        self._local.usage = types.GenerateContentResponseUsageMetadata(
+            prompt_token_count=(previous.prompt_token_count or 0)
+            + (usage.prompt_token_count or 0),
+            candidates_token_count=(previous.candidates_token_count or 0)
+            + (usage.candidates_token_count or 0),
+            thoughts_token_count=(previous.thoughts_token_count or 0)
+            + (usage.thoughts_token_count or 0),
+            total_token_count=(previous.total_token_count or 0)
+            + (usage.total_token_count or 0),
+        )
+
+    def _generate(
+        self, contents: list, api_config: dict, schema: Type[BaseModel]
+    ) -> Optional[BaseModel]:
+        """Sends one request and validates the response against the schema."""
+        raw_response = None
+        try:
+            with start_span(
+                "gemini.generate_content", model=self._model, schema=schema.__name__
+            ) as span:
+                raw_response = self._client.models.generate_content(
+                    model=self._model, contents=contents, config=api_config
+                )
+                record_usage(span, raw_response.usage_metadata)
+            self._add_usage(raw_response.usage_metadata)
+
+            with start_span(
+                "gemini.validate", response_chars=len(raw_response.text or "")
+            ):
+                if getattr(raw_response, "parsed", None):
+                    return raw_response.parsed
+                return schema.model_validate_json(raw_response.text)
+
+        except ValidationError as e:
+            logger.error(f"Pydantic validation error ({schema.__name__}): {e}")
+            logger.error(
+                f"   Received response: {(getattr(raw_response, 'text', None) or 'no text')[:200]}..."
+            )
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error during Gemini request: {e}")
+            return None
+
+    def _transcribe(
+        self, audio_file_data: bytes, audio_hash: str
+    ) -> Optional[List[DialogLine]]:
+        """Pass one: returns the cached transcript or transcribes the audio."""
+        cached = self._cache.get(audio_hash)
+        if cached:
+            logger.info("Using cached transcript.")
+            return cached.transcript
+
+        logger.debug("Sending audio to Gemini API for transcription...")
+        audio_part = types.Part.from_bytes(data=audio_file_data, mime_type="audio/mp3")
+        result = self._generate(
+            [self._transcription_prompt, audio_part],
+            transcription_config,
+            CallTranscript,
+        )
+        if result is None:
+            return None
+
+        self._cache.put(audio_hash, result.transcript)
+        return result.transcript
+
+    def _evaluate(self, transcript: List[DialogLine]) -> Optional[CallEvaluation]:
+        """Pass two: evaluates the transcript text, without any audio."""
+        logger.debug("Sending transcript to Gemini API for evaluation...")
+        return self._generate(
+            [self._prompt, format_transcript(transcript)],
+            evaluation_config,
+            CallEvaluation,
+        )
+
+    def _evaluate_and_cache(
+        self, audio_hash: str, transcript: List[DialogLine]
+    ) -> CallAnalysisResult | None:
+        evaluation = self._evaluate(transcript)
+        if evaluation is None:
+            return None
+
+        self._cache.put(
+            audio_hash,
+            transcript,
+            evaluation=evaluation,
+            evaluation_prompt_id=self.evaluation_prompt_id,
+        )
+        return self.combine(transcript, evaluation)
+
+    @staticmethod
+    def combine(
+        transcript: List[DialogLine], evaluation: CallEvaluation
+    ) -> CallAnalysisResult:
+        return CallAnalysisResult(transcript=transcript, **dict(evaluation))
+
+    def analyse_call(self, audio_file_data: bytes) -> CallAnalysisResult | None:
+        self._local.usage = None
+        audio_hash = CallDeduplicator.audio_hash(audio_file_data)
+
+        transcript = self._transcribe(audio_file_data, audio_hash)
+        if transcript is None:
+            logger.error("Transcription pass failed.")
+            return None
+
+        return self._evaluate_and_cache(audio_hash, transcript)
+
+    def rescore(self, entry: CachedTranscript) -> CallAnalysisResult | None:
+        """Runs only the evaluation pass over a cached transcript."""
+        self._local.usage = None
+        return self._evaluate_and_cache(entry.audio_hash, entry.transcript)
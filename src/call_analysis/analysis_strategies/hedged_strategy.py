@@ -0,0 +1,186 @@
+import contextvars
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Deque, Optional, Tuple
+
+from .base_strategy import BaseAnalysisStrategy
+from .gemini.output_schema import CallAnalysisResult
+
+if TYPE_CHECKING:
+    from .fair_share_strategy import FairShareGate
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class HedgeStats:
+    calls: int = 0
+    hedges_issued: int = 0
+    # The hedge returned the result before the primary request
+    hedges_won: int = 0
+
+
+class HedgedAnalysisStrategy(BaseAnalysisStrategy):
+    """
+    Cuts the tail latency of a strategy with hedged requests.
+
+    Each call is sent as usual; if it hasn't completed after a percentile
+    (e.g. p90) of the recent request latencies, the same call is sent a
+    second time and the first valid result wins. The hedge rate is capped,
+    so at most `max_hedge_rate` of the calls cost a second request.
+
+    A request that is already running can't be interrupted, so the losing
+    request is abandoned: its result is ignored when it arrives.
+
+    With a FairShareGate, every request - the hedge included - takes a call
+    slot of the current tenant. The hedge delay and the latencies are
+    measured from the moment a request has its slot and a worker thread,
+    so waiting for them doesn't trigger hedges.
+    """
+
+    def __init__(
+        self,
+        strategy: BaseAnalysisStrategy,
+        percentile: float = 0.9,
+        max_hedge_rate: float = 0.1,
+        min_samples: int = 20,
+        min_delay: float = 5.0,
+        window: int = 100,
+        max_workers: int = 8,
+        gate: Optional["FairShareGate"] = None,
+    ):
+        """
+        Args:
+            strategy: The wrapped strategy; it has to be thread-safe.
+            percentile: Latency percentile after which a hedge is sent.
+            max_hedge_rate: Largest share of calls that may be hedged.
+            min_samples: Latencies needed before hedging starts.
+            min_delay: Shortest hedge delay in seconds.
+            window: Number of recent latencies the percentile is taken from.
+            max_workers: Threads for the requests, including abandoned ones.
+            gate: Shared limit of concurrent calls of all tenants, if any.
+        """
+        self._strategy = strategy
+        self._gate = gate
+        self._percentile = percentile
+        self._max_hedge_rate = max_hedge_rate
+        self._min_samples = min_samples
+        self._min_delay = min_delay
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="hedge"
+        )
+        self._lock = threading.Lock()
+        self._stats = HedgeStats()
+        logger.info(
+            f"HedgedAnalysisStrategy initialized: p{percentile * 100:.0f} delay, "
+            f"max hedge rate {max_hedge_rate:.0%}."
+        )
+
+    def _timed_call(
+        self, audio_file_data: bytes, running: threading.Event
+    ) -> CallAnalysisResult | None:
+        with self._gate.slot() if self._gate else nullcontext():
+            running.set()
+            started = time.monotonic()
+            result = self._strategy.analyse_call(audio_file_data)
+            finished = time.monotonic()
+        if result is not None:
+            with self._lock:
+                self._latencies.append(finished - started)
+        return result
+
+    def _submit(self, audio_file_data: bytes) -> Tuple[Future, threading.Event]:
+        """
+        Returns:
+            The request's future and an event that is set once the request
+            is running (or has finished without running).
+        """
+        running = threading.Event()
+        # The worker thread keeps the log context (and the tenant) of the call
+        context = contextvars.copy_context()
+        future = self._executor.submit(
+            context.run, self._timed_call, audio_file_data, running
+        )
+        future.add_done_callback(lambda _: running.set())
+        return future, running
+
+    def _hedge_delay(self) -> Optional[float]:
+        """The current hedge delay, or None if the call may not be hedged."""
+        with self._lock:
+            if len(self._latencies) < self._min_samples:
+                return None
+            hedge_budget = self._max_hedge_rate * self._stats.calls
+            if self._stats.hedges_issued + 1 > hedge_budget:
+                return None
+            latencies = sorted(self._latencies)
+        index = int(self._percentile * (len(latencies) - 1))
+        return max(latencies[index], self._min_delay)
+
+    @staticmethod
+    def _result(future: Future) -> CallAnalysisResult | None:
+        try:
+            return future.result()
+        except Exception as e:
+            logger.error(f"Analysis request failed: {e}")
+            return None
+
+    def analyse_call(self, audio_file_data: bytes) -> CallAnalysisResult | None:
+        with self._lock:
+            self._stats.calls += 1
+
+        primary, primary_running = self._submit(audio_file_data)
+        delay = self._hedge_delay()
+        if delay is None:
+            return self._result(primary)
+
+        # The delay counts from the start of the request, not from its wait
+        # for a worker thread or a call slot
+        primary_running.wait()
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return self._result(primary)
+
+        with self._lock:
+            self._stats.hedges_issued += 1
+        logger.info(f"No response after {delay:.1f}s. Sending a hedged request.")
+        hedge, _ = self._submit(audio_file_data)
+
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = self._result(future)
+                if result is None:
+                    continue
+                if future is hedge:
+                    with self._lock:
+                        self._stats.hedges_won += 1
+                    logger.info("The hedged request won.")
+                # Not started yet (all workers busy) - drop it
+                for loser in pending:
+                    loser.cancel()
+                return result
+        return None
+
+    def close(self):
+        """Stops the worker threads; requests that haven't started are cancelled."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_stats(self) -> HedgeStats:
+        with self._lock:
+            return HedgeStats(**vars(self._stats))
+
+    def log_stats(self):
+        stats = self.get_stats()
+        logger.info(
+            f"Hedging: {stats.calls} calls, {stats.hedges_issued} hedges issued, "
+            f"{stats.hedges_won} won."
+        )
+        if hasattr(self._strategy, "log_stats"):
+            self._strategy.log_stats()
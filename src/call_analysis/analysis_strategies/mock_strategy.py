@@ -5,9 +5,7 @@ from call_analysis.analysis_strategies.gemini.output_schema import (
     SpeakerTypes,
     CallAnalysisResult,
 )
-from utils import configure_logging
 
-configure_logging()
 logger = logging.getLogger(__name__)
 
 
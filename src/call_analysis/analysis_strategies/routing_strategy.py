@@ -0,0 +1,150 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from .base_strategy import BaseAnalysisStrategy
+from .gemini.output_schema import CallAnalysisResult
+from call_analysis.audio_info import estimate_duration
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ModelRoute:
+    """
+    One model the router can send a call to.
+
+    Attributes:
+        name: Model name used in logs and statistics.
+        strategy: The strategy that calls this model.
+        max_duration: Longest call (seconds) this route accepts; None means no limit.
+        max_size: Largest file (bytes) this route accepts; None means no limit.
+        input_price: USD per 1M input tokens.
+        output_price: USD per 1M output tokens.
+    """
+
+    name: str
+    strategy: BaseAnalysisStrategy
+    max_duration: Optional[float] = None
+    max_size: Optional[int] = None
+    input_price: float = 0.0
+    output_price: float = 0.0
+
+    def accepts(self, duration: Optional[float], size: int) -> bool:
+        if self.max_size is not None and size > self.max_size:
+            return False
+        if self.max_duration is not None:
+            # Unknown duration: don't risk a cheap model on it
+            if duration is None or duration > self.max_duration:
+                return False
+        return True
+
+
+@dataclass
+class ModelUsageStats:
+    """Per-model counters used for tuning the routing thresholds."""
+
+    calls: int = 0
+    failures: int = 0
+    total_latency: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cost: float = 0.0
+
+    @property
+    def average_latency(self) -> float:
+        return self.total_latency / self.calls if self.calls else 0.0
+
+
+class RoutingAnalysisStrategy(BaseAnalysisStrategy):
+    """
+    A strategy that wraps several strategies (models), ordered from the
+    cheapest/fastest to the strongest.
+
+    Each call starts on the first route that accepts its duration and file
+    size. If the result is missing (e.g. the response failed CallAnalysisResult
+    validation), the call is escalated to the next, stronger route.
+    """
+
+    def __init__(self, routes: List[ModelRoute]):
+        if not routes:
+            raise ValueError("At least one route is required.")
+        self._routes = routes
+        self._stats: Dict[str, ModelUsageStats] = {
+            route.name: ModelUsageStats() for route in routes
+        }
+        self._stats_lock = threading.Lock()
+        logger.info(
+            f"RoutingAnalysisStrategy initialized with routes: {[route.name for route in routes]}"
+        )
+
+    def _select_route_index(self, duration: Optional[float], size: int) -> int:
+        for index, route in enumerate(self._routes):
+            if route.accepts(duration, size):
+                return index
+        # Nothing accepts the call - use the strongest model
+        return len(self._routes) - 1
+
+    def _record(self, route: ModelRoute, latency: float, succeeded: bool):
+        usage = getattr(route.strategy, "last_usage", None)
+        input_tokens = (usage.prompt_token_count or 0) if usage else 0
+        output_tokens = (
+            (usage.candidates_token_count or 0) + (usage.thoughts_token_count or 0)
+            if usage
+            else 0
+        )
+        cost = (
+            input_tokens * route.input_price + output_tokens * route.output_price
+        ) / 1_000_000
+
+        with self._stats_lock:
+            stats = self._stats[route.name]
+            stats.calls += 1
+            stats.failures += 0 if succeeded else 1
+            stats.total_latency += latency
+            stats.input_tokens += input_tokens
+            stats.output_tokens += output_tokens
+            stats.cost += cost
+
+    def analyse_call(self, audio_file_data: bytes) -> CallAnalysisResult | None:
+        duration = estimate_duration(audio_file_data)
+        size = len(audio_file_data)
+        start_index = self._select_route_index(duration, size)
+
+        duration_str = f"{duration:.0f}s" if duration is not None else "unknown"
+        logger.info(
+            f"Routing call (duration: {duration_str}, size: {size} bytes) to '{self._routes[start_index].name}'."
+        )
+
+        for route in self._routes[start_index:]:
+            started = time.perf_counter()
+            result = route.strategy.analyse_call(audio_file_data)
+            self._record(route, time.perf_counter() - started, result is not None)
+
+            if result is not None:
+                return result
+
+            logger.warning(f"Model '{route.name}' returned no valid result.")
+            if route is not self._routes[-1]:
+                logger.info("Escalating the call to the next model...")
+
+        return None
+
+    def get_stats(self) -> Dict[str, ModelUsageStats]:
+        """Returns a snapshot of the per-model statistics."""
+        with self._stats_lock:
+            return {
+                name: ModelUsageStats(**vars(stats))
+                for name, stats in self._stats.items()
+            }
+
+    def log_stats(self):
+        for name, stats in self.get_stats().items():
+            logger.info(
+                f"Model '{name}': {stats.calls} calls, {stats.failures} failed, "
+                f"avg latency {stats.average_latency:.1f}s, "
+                f"tokens in/out {stats.input_tokens}/{stats.output_tokens}, "
+                f"cost ${stats.cost:.4f}"
+            )
@@ -0,0 +1,294 @@
+import logging
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ID3V2_HEADER_SIZE = 10
+ID3V1_TAG_SIZE = 128
+
+# Bitrates (kbps) by [version group][layer][index]; version group 0 = MPEG-1, 1 = MPEG-2/2.5
+_BITRATES = {
+    (0, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (0, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (0, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (1, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (1, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (1, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+
+# Sample rates (Hz) by version bits: 3 = MPEG-1, 2 = MPEG-2, 0 = MPEG-2.5
+_SAMPLE_RATES = {
+    3: [44100, 48000, 32000],
+    2: [22050, 24000, 16000],
+    0: [11025, 12000, 8000],
+}
+
+
+@dataclass
+class FrameHeader:
+    """The fields of a 4-byte MPEG audio frame header needed to walk the stream."""
+
+    version: int  # version bits: 3 = MPEG-1, 2 = MPEG-2, 0 = MPEG-2.5
+    layer: int  # 1, 2 or 3
+    bitrate: int  # bits per second
+    sample_rate: int  # Hz
+    padding: int
+    protected: bool  # a 16-bit CRC follows the header
+    channel_mode: int  # 3 = mono
+
+    @property
+    def samples_per_frame(self) -> int:
+        if self.layer == 1:
+            return 384
+        if self.layer == 3 and self.version != 3:
+            return 576
+        return 1152
+
+    @property
+    def frame_size(self) -> int:
+        if self.layer == 1:
+            return (12 * self.bitrate // self.sample_rate + self.padding) * 4
+        slot_count = self.samples_per_frame // 8 * self.bitrate // self.sample_rate
+        return slot_count + self.padding
+
+
+def audio_payload_bounds(audio_bytes: bytes) -> Tuple[int, int]:
+    """
+    Returns (start, end) of the audio data with the leading ID3v2 tag
+    and the trailing ID3v1 tag excluded.
+    """
+    start = 0
+    end = len(audio_bytes)
+
+    if audio_bytes[:3] == b"ID3" and end >= ID3V2_HEADER_SIZE:
+        # Tag size is a 28-bit "synchsafe" integer (7 bits per byte)
+        tag_size = 0
+        for byte in audio_bytes[6:10]:
+            tag_size = (tag_size << 7) | (byte & 0x7F)
+        start = ID3V2_HEADER_SIZE + tag_size
+        # Footer present flag
+        if audio_bytes[5] & 0x10:
+            start += ID3V2_HEADER_SIZE
+
+    if end - start >= ID3V1_TAG_SIZE and (
+        audio_bytes[end - ID3V1_TAG_SIZE : end - ID3V1_TAG_SIZE + 3] == b"TAG"
+    ):
+        end -= ID3V1_TAG_SIZE
+
+    return min(start, end), end
+
+
+def parse_frame_header(audio_bytes: bytes, offset: int) -> Optional[FrameHeader]:
+    """Parses the frame header at the offset. Returns None if there is no valid header."""
+    if offset + 4 > len(audio_bytes):
+        return None
+
+    b1, b2, b3 = (
+        audio_bytes[offset + 1],
+        audio_bytes[offset + 2],
+        audio_bytes[offset + 3],
+    )
+    # 11 sync bits
+    if audio_bytes[offset] != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+
+    version = (b1 >> 3) & 0x03
+    layer_bits = (b1 >> 1) & 0x03
+    bitrate_index = (b2 >> 4) & 0x0F
+    sample_rate_index = (b2 >> 2) & 0x03
+
+    if version == 1 or layer_bits == 0 or bitrate_index in (0, 15):
+        return None
+    if sample_rate_index == 3:
+        return None
+
+    layer = 4 - layer_bits
+    version_group = 0 if version == 3 else 1
+    bitrate = _BITRATES[(version_group, layer)][bitrate_index] * 1000
+
+    return FrameHeader(
+        version=version,
+        layer=layer,
+        bitrate=bitrate,
+        sample_rate=_SAMPLE_RATES[version][sample_rate_index],
+        padding=(b2 >> 1) & 0x01,
+        protected=not (b1 & 0x01),
+        channel_mode=(b3 >> 6) & 0x03,
+    )
+
+
+def find_first_frame(
+    audio_bytes: bytes, start: int, end: int
+) -> Tuple[int, Optional[FrameHeader]]:
+    """
+    Finds the first valid frame header in [start, end).
+    A candidate counts only if another valid header follows right after it,
+    which filters out random 0xFF bytes in the data.
+    """
+    offset = audio_bytes.find(b"\xff", start, end)
+    while offset != -1:
+        header = parse_frame_header(audio_bytes, offset)
+        if header:
+            next_offset = offset + header.frame_size
+            if next_offset >= end or parse_frame_header(audio_bytes, next_offset):
+                return offset, header
+        offset = audio_bytes.find(b"\xff", offset + 1, end)
+    return -1, None
+
+
+def _side_info_size(header: FrameHeader) -> int:
+    """Size (bytes) of the Layer III side information that follows the header."""
+    mono = header.channel_mode == 3
+    if header.version == 3:
+        return 17 if mono else 32
+    return 9 if mono else 17
+
+
+def _xing_frame_count(
+    audio_bytes: bytes, offset: int, header: FrameHeader
+) -> Optional[int]:
+    """
+    Reads the total frame count from a Xing/Info (VBR) header in the first frame, if present.
+    """
+    # The tag is placed after the CRC (if any) and the side information of the first frame
+    tag_offset = offset + 4 + (2 if header.protected else 0) + _side_info_size(header)
+
+    tag = audio_bytes[tag_offset : tag_offset + 4]
+    if tag not in (b"Xing", b"Info"):
+        return None
+
+    flags = int.from_bytes(audio_bytes[tag_offset + 4 : tag_offset + 8], "big")
+    if not flags & 0x01:
+        return None
+    return int.from_bytes(audio_bytes[tag_offset + 8 : tag_offset + 12], "big")
+
+
+def estimate_duration(audio_bytes: bytes) -> Optional[float]:
+    """
+    Estimates the duration (seconds) of an MP3 recording without decoding it.
+    Uses the frame count from the Xing/Info header when present,
+    otherwise assumes a constant bitrate equal to the first frame's one.
+
+    Returns:
+        Duration in seconds, or None if no MPEG audio frame was found.
+    """
+    start, end = audio_payload_bounds(audio_bytes)
+    offset, header = find_first_frame(audio_bytes, start, end)
+    if header is None:
+        return None
+
+    frame_count = _xing_frame_count(audio_bytes, offset, header)
+    if frame_count:
+        return frame_count * header.samples_per_frame / header.sample_rate
+
+    return (end - offset) * 8 / header.bitrate
+
+
+@dataclass
+class AudioActivity:
+    """Duration and voice activity of a recording, measured from the frame headers."""
+
+    duration: float  # seconds
+    frames: int
+    # Frames whose loudest granule reaches the gain threshold;
+    # None if unknown (no Layer III frames, the only ones with a gain)
+    active_frames: Optional[int]
+
+    @property
+    def active_ratio(self) -> Optional[float]:
+        if self.active_frames is None:
+            return None
+        return self.active_frames / self.frames if self.frames else 0.0
+
+
+def _frame_gain(audio_bytes: bytes, offset: int, header: FrameHeader) -> int:
+    """
+    Returns the largest global_gain of the frame's granules that carry audio data
+    (part2_3_length > 0), or 0 for a silent frame.
+
+    The global gain is the quantizer step of a granule (1.5 dB per unit),
+    so it follows the loudness of the signal without decoding the samples.
+    Only Layer III frames have it.
+    """
+    mono = header.channel_mode == 3
+    channels = 1 if mono else 2
+    # Bit position of the first granule's part2_3_length, skipping
+    # main_data_begin, the private bits and (MPEG-1) scfsi
+    if header.version == 3:
+        position = 9 + (5 if mono else 3) + 4 * channels
+        granules, stride = 2, 59
+    else:
+        position = 8 + (1 if mono else 2)
+        granules, stride = 1, 63
+
+    side_info_start = offset + 4 + (2 if header.protected else 0)
+    side_info_size = _side_info_size(header)
+    side_info_bits = side_info_size * 8
+    side_info = int.from_bytes(
+        audio_bytes[side_info_start : side_info_start + side_info_size], "big"
+    )
+
+    gain = 0
+    for _ in range(granules * channels):
+        part2_3_length = (side_info >> (side_info_bits - position - 12)) & 0xFFF
+        if part2_3_length:
+            # global_gain follows part2_3_length (12 bits) and big_values (9 bits)
+            global_gain = (side_info >> (side_info_bits - position - 29)) & 0xFF
+            gain = max(gain, global_gain)
+        position += stride
+    return gain
+
+
+def measure_activity(
+    audio_bytes: bytes, min_global_gain: int = 165
+) -> Optional[AudioActivity]:
+    """
+    Walks all frame headers of an MP3 recording (without decoding it) and
+    measures its exact duration and the share of frames with voice-level energy.
+
+    Args:
+        min_global_gain: Frames below this gain count as silence or line noise;
+                         speech encoded by LAME is mostly above 165, hiss below 160.
+
+    Returns:
+        The activity, or None if no MPEG audio frame was found. Layer I and II
+        recordings get only the duration: their voice activity is unknown.
+    """
+    start, end = audio_payload_bounds(audio_bytes)
+    offset, header = find_first_frame(audio_bytes, start, end)
+    if header is None:
+        return None
+
+    # The Xing/Info frame carries no audio
+    if _xing_frame_count(audio_bytes, offset, header) is not None:
+        offset += header.frame_size
+        header = parse_frame_header(audio_bytes, offset)
+
+    duration = 0.0
+    frames = layer3_frames = active_frames = 0
+    while offset < end:
+        if header is None:
+            # Broken data: continue from the next valid frame
+            offset, header = find_first_frame(audio_bytes, offset + 1, end)
+            if header is None:
+                break
+        frame_size = header.frame_size
+        if frame_size <= 0 or offset + frame_size > end:
+            break
+
+        frames += 1
+        duration += header.samples_per_frame / header.sample_rate
+        if header.layer == 3:
+            layer3_frames += 1
+            if _frame_gain(audio_bytes, offset, header) >= min_global_gain:
+                active_frames += 1
+
+        offset += frame_size
+        header = parse_frame_header(audio_bytes, offset)
+
+    return AudioActivity(
+        duration=duration,
+        frames=frames,
+        active_frames=active_frames if layer3_frames else None,
+    )
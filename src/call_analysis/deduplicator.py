@@ -0,0 +1,173 @@
+import logging
+import hashlib
+import json
+import os
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, List, Dict, Optional, Tuple
+from call_analysis.audio_info import audio_payload_bounds
+from constants import DedupConfig
+
+if TYPE_CHECKING:
+    from call_analysis.transcript_cache import CachedTranscript, TranscriptCache
+
+logger = logging.getLogger(__name__)
+
+
+class CallDeduplicator:
+    """
+    Detects copies of the same recording that were exported under different names,
+    so that each call is analyzed (and billed) only once - also when the copy
+    arrives in a later run.
+
+    Works in two stages:
+    1. Drive 'md5Checksum' - finds byte-identical files before anything is downloaded.
+    2. Audio hash - a byte hash of the MP3 audio frames with the ID3 tags stripped,
+       which also matches copies that differ only in their metadata.
+       It is not an acoustic fingerprint: a re-encoded copy is not matched.
+
+    Within a run, copies reuse the result of their original. Across runs, the
+    checksums of analyzed recordings are kept in an index file, and the analysis
+    of the original is read from the transcript cache (keyed by the audio hash).
+    """
+
+    def __init__(
+        self,
+        transcript_cache: Optional["TranscriptCache"] = None,
+        index_path: str = DedupConfig.INDEX_FILE,
+        retention_days: int = DedupConfig.RETENTION_DAYS,
+    ):
+        """
+        Args:
+            transcript_cache: Source of the analyses of earlier runs;
+                              without it, only copies within a run are found.
+            index_path: Index of the checksums of analyzed recordings.
+            retention_days: How long a checksum is kept in the index.
+        """
+        # audio hash -> file id of the first successfully analyzed copy of this run
+        self._audio_hashes: Dict[str, str] = {}
+        self._transcript_cache = transcript_cache
+        self._index_path = index_path
+        self._retention_days = retention_days
+        # md5Checksum -> {"audio_hash", "day"} of recordings analyzed in any run
+        self._checksums: Dict[str, dict] = {}
+        if transcript_cache:
+            self._load()
+
+    def _load(self):
+        if not os.path.exists(self._index_path):
+            return
+        try:
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                self._checksums = json.load(f).get("checksums", {})
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to read dedup index {self._index_path}: {e}")
+
+    def save(self):
+        """Writes the index atomically, without the entries older than the retention."""
+        if not self._transcript_cache:
+            return
+        oldest_day = (date.today() - timedelta(days=self._retention_days)).isoformat()
+        self._checksums = {
+            checksum: entry
+            for checksum, entry in self._checksums.items()
+            if entry.get("day", "") >= oldest_day
+        }
+        temp_path = f"{self._index_path}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({"checksums": self._checksums}, f)
+            os.replace(temp_path, self._index_path)
+        except OSError as e:
+            logger.warning(f"Failed to save dedup index {self._index_path}: {e}")
+
+    def split_by_checksum(
+        self, audio_files: List[Dict[str, str]]
+    ) -> Tuple[List[Dict[str, str]], List[Tuple[Dict[str, str], str]]]:
+        """
+        Splits the file listing into unique files and checksum duplicates.
+
+        Args:
+            audio_files: Drive file dicts, ideally listed with the 'md5Checksum' field.
+
+        Returns:
+            (unique_files, duplicates), where duplicates is a list of
+            (file, original_id) pairs - every extra copy together with the id
+            of the first file with the same checksum.
+        """
+        first_by_checksum: Dict[str, str] = {}
+        unique_files = []
+        duplicates = []
+
+        for file in audio_files:
+            checksum = file.get("md5Checksum")
+            file_id = file.get("id")
+
+            if checksum and file_id:
+                original_id = first_by_checksum.get(checksum)
+                if original_id:
+                    logger.info(
+                        f"File '{file.get('name')}' has the same checksum as {original_id}. Marked as duplicate."
+                    )
+                    duplicates.append((file, original_id))
+                    continue
+                first_by_checksum[checksum] = file_id
+
+            unique_files.append(file)
+
+        if duplicates:
+            logger.info(f"Found {len(duplicates)} duplicate files by checksum.")
+
+        return unique_files, duplicates
+
+    def find_original(self, audio_hash: str) -> Optional[str]:
+        """Returns the id of a copy with this audio hash analyzed in this run, if any."""
+        return self._audio_hashes.get(audio_hash)
+
+    def find_earlier_copy(
+        self,
+        file_id: str,
+        audio_hash: Optional[str] = None,
+        checksum: Optional[str] = None,
+    ) -> Optional["CachedTranscript"]:
+        """
+        Looks up a copy of the recording analyzed in an earlier run,
+        by its audio hash or (before the download) by its Drive checksum.
+
+        Returns:
+            The cached analysis of the other copy, or None if there is no
+            other copy or its analysis was not cached.
+        """
+        if not self._transcript_cache:
+            return None
+        if audio_hash is None and checksum:
+            audio_hash = self._checksums.get(checksum, {}).get("audio_hash")
+        if audio_hash is None:
+            return None
+
+        entry = self._transcript_cache.get(audio_hash)
+        if entry is None or entry.evaluation is None:
+            return None
+        # The same file listed again is not a copy of itself
+        if not entry.source_file_id or entry.source_file_id == file_id:
+            return None
+        return entry
+
+    def remember(self, audio_hash: str, file_id: str, checksum: Optional[str] = None):
+        """Registers a successfully analyzed file under its audio hash and checksum."""
+        self._audio_hashes.setdefault(audio_hash, file_id)
+        if checksum:
+            self._checksums[checksum] = {
+                "audio_hash": audio_hash,
+                "day": date.today().isoformat(),
+            }
+
+    @staticmethod
+    def audio_hash(audio_bytes: bytes) -> str:
+        """
+        Computes a byte hash of the audio content.
+        ID3v2 (leading) and ID3v1 (trailing) tags are excluded, so re-tagged
+        or renamed copies of the same recording produce the same value.
+        """
+        start, end = audio_payload_bounds(audio_bytes)
+        digest = hashlib.blake2b(memoryview(audio_bytes)[start:end], digest_size=16)
+        return digest.hexdigest()
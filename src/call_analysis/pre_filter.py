@@ -0,0 +1,96 @@
+import logging
+from typing import Optional
+
+from call_analysis.analysis_strategies.gemini.output_schema import CallAnalysisResult
+from call_analysis.audio_info import measure_activity
+
+logger = logging.getLogger(__name__)
+
+SKIPPED_CALL_RESULT = "Not analyzed"
+
+
+class RecordingPreFilter:
+    """
+    Cheap check that runs before a recording is sent for analysis.
+
+    Missed-call stubs, rings and silent lines cost a full Gemini request
+    while there is nothing to evaluate. The filter walks the MP3 frame
+    headers (no decoding) to get the exact duration and an energy-based
+    voice-activity estimate, and rejects recordings below the thresholds.
+    """
+
+    def __init__(
+        self,
+        min_duration: float = 10.0,
+        min_active_ratio: float = 0.15,
+        min_global_gain: int = 165,
+    ):
+        """
+        Args:
+            min_duration: Shorter recordings are skipped (seconds).
+            min_active_ratio: Recordings with a smaller share of voice-level
+                              frames are skipped; 0 turns the check off.
+            min_global_gain: Frame gain that counts as voice (see measure_activity).
+        """
+        self._min_duration = min_duration
+        self._min_active_ratio = min_active_ratio
+        self._min_global_gain = min_global_gain
+        logger.info(
+            f"RecordingPreFilter initialized: min duration {min_duration}s, "
+            f"min voice activity {min_active_ratio:.0%}."
+        )
+
+    def check(self, audio_bytes: bytes) -> Optional[str]:
+        """
+        Returns:
+            The reason to skip the recording, or None if it should be analyzed.
+            Recordings that can't be parsed are passed through to the analysis.
+        """
+        activity = measure_activity(audio_bytes, self._min_global_gain)
+        if activity is None or not activity.frames:
+            logger.warning("No MPEG audio frames found. Skipping the pre-filter.")
+            return None
+
+        if activity.duration < self._min_duration:
+            return f"too short ({activity.duration:.1f}s)"
+
+        if activity.active_ratio is None:
+            logger.debug(
+                "Recording: %.1fs, voice activity unknown (no Layer III frames).",
+                activity.duration,
+            )
+            return None
+        logger.debug(
+            "Recording: %.1fs, %.0f%% voice activity.",
+            activity.duration,
+            activity.active_ratio * 100,
+        )
+        if activity.active_ratio < self._min_active_ratio:
+            return f"no speech ({activity.active_ratio:.0%} voice activity)"
+        return None
+
+
+def skipped_call_analysis(reason: str) -> CallAnalysisResult:
+    """
+    Creates the marker analysis of a skipped recording: an empty transcript
+    and blank script fields, so its sheet row shows why it was not analyzed.
+    """
+    # Not validated: the script fields stay None instead of False
+    return CallAnalysisResult.model_construct(
+        transcript=[],
+        call_type="",
+        manager_name=None,
+        script_greeting=None,
+        script_farewell=None,
+        car_info_body_asked=None,
+        car_info_year_asked=None,
+        car_info_mileage_asked=None,
+        upsale_diagnostics_offered=None,
+        upsale_previous_work_asked=None,
+        service_booking_date=None,
+        top_works_mentioned=[],
+        parts_discussed=None,
+        call_result=SKIPPED_CALL_RESULT,
+        comment=f"Skipped by pre-filter: {reason}.",
+        is_comment_negative=None,
+    )
@@ -0,0 +1,236 @@
+import logging
+import json
+import os
+from datetime import date, timedelta
+from typing import Dict, List
+
+from call_analysis.analysis_strategies.analysis_processor import ProcessedCall
+from constants import TableConfig, SummaryConfig
+
+logger = logging.getLogger(__name__)
+
+UNKNOWN_MANAGER = "Unknown"
+
+
+class ReportAggregator:
+    """
+    Keeps running per-manager / per-day / per-call_type sums and counts of the
+    script metrics (TableConfig.BOOL_TO_INT_FIELDS) and total_score.
+
+    The state is stored in a JSON file between runs, and each run only adds
+    its own evaluated reports, so the dashboard never has to be recomputed
+    from the full history.
+
+    The contribution of every added file is remembered, so a resumed run
+    doesn't count its reports twice, and a file that comes back with new
+    values (e.g. after re-scoring) replaces its old contribution. Only the
+    last `retention_days` days are kept that way: older days are closed,
+    their per-file contributions are dropped and their groups stay as they are.
+    """
+
+    METRICS = TableConfig.BOOL_TO_INT_FIELDS + [TableConfig.TOTAL_SCORE]
+
+    def __init__(
+        self,
+        state_path: str = SummaryConfig.STATE_FILE,
+        retention_days: int = SummaryConfig.RETENTION_DAYS,
+    ):
+        self._state_path = state_path
+        self._retention_days = retention_days
+        # "manager|day|call_type" -> {"manager", "day", "call_type", "count", "sums"}
+        self._groups: Dict[str, dict] = {}
+        # file ID -> {"group": key, "day": day, "values": [metric values]}
+        self._contributions: Dict[str, dict] = {}
+        self._load()
+
+    def _load(self):
+        """
+        Reads the state file. An unreadable or malformed file is moved aside
+        (".corrupt") and the aggregates start empty, so one bad write doesn't
+        stop every later run.
+        """
+        if not os.path.exists(self._state_path):
+            return
+        try:
+            with open(self._state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            groups, contributions = self._validate(state)
+        except (OSError, ValueError) as e:
+            corrupt_path = f"{self._state_path}.corrupt"
+            logger.error(
+                f"Failed to read aggregates {self._state_path}: {e}. "
+                f"Starting with empty aggregates; the file is kept as {corrupt_path}."
+            )
+            try:
+                os.replace(self._state_path, corrupt_path)
+            except OSError as move_error:
+                logger.warning(f"Failed to move {self._state_path}: {move_error}")
+            return
+
+        self._groups = groups
+        self._contributions = contributions
+        # Files added before the contributions were kept can't be replaced,
+        # only skipped; they age out like the rest
+        today = date.today().isoformat()
+        for file_id in state.get("applied_file_ids", []):
+            self._contributions.setdefault(file_id, {"group": None, "day": today})
+        logger.info(
+            f"Loaded aggregates: {len(self._groups)} groups, {len(self._contributions)} recent calls."
+        )
+
+    @staticmethod
+    def _validate(state) -> tuple:
+        """
+        Checks the shape of a loaded state.
+
+        Returns:
+            (groups, contributions)
+
+        Raises:
+            ValueError: If the state is not a valid aggregates state.
+        """
+        if not isinstance(state, dict):
+            raise ValueError("the state is not a JSON object")
+        groups = state.get("groups", {})
+        contributions = state.get("contributions", {})
+        if not isinstance(groups, dict) or not isinstance(contributions, dict):
+            raise ValueError("'groups' and 'contributions' must be JSON objects")
+        group_fields = {"manager", "day", "call_type", "count", "sums"}
+        for key, group in groups.items():
+            if not isinstance(group, dict) or not group_fields <= group.keys():
+                raise ValueError(f"malformed group '{key}'")
+        for file_id, contribution in contributions.items():
+            if not isinstance(contribution, dict) or "day" not in contribution:
+                raise ValueError(f"malformed contribution of file '{file_id}'")
+            key = contribution.get("group")
+            if key is not None and (
+                key not in groups or not isinstance(contribution.get("values"), list)
+            ):
+                raise ValueError(f"malformed contribution of file '{file_id}'")
+        if not isinstance(state.get("applied_file_ids", []), list):
+            raise ValueError("'applied_file_ids' must be a JSON array")
+        return groups, contributions
+
+    def _oldest_open_day(self) -> str:
+        return (date.today() - timedelta(days=self._retention_days)).isoformat()
+
+    def save(self):
+        """
+        Drops the contributions of the closed days and writes the state
+        atomically, so a crash never leaves half a file.
+        """
+        oldest_day = self._oldest_open_day()
+        self._contributions = {
+            file_id: contribution
+            for file_id, contribution in self._contributions.items()
+            if contribution["day"] >= oldest_day
+        }
+        state = {"groups": self._groups, "contributions": self._contributions}
+        temp_path = f"{self._state_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(temp_path, self._state_path)
+
+    def _apply(self, key: str, values: List[int], sign: int):
+        """Adds (sign=1) or subtracts (sign=-1) one call's values to its group."""
+        group = self._groups[key]
+        group["count"] += sign
+        sums = group["sums"]
+        for metric, value in zip(self.METRICS, values):
+            sums[metric] = sums.get(metric, 0) + sign * value
+        if group["count"] <= 0:
+            del self._groups[key]
+
+    def add_reports(
+        self, reports: List[ProcessedCall], days_by_file_id: Dict[str, str]
+    ) -> int:
+        """
+        Adds evaluated reports to the running aggregates.
+        A report of an already added file replaces its earlier values.
+
+        Args:
+            reports: Evaluated reports (total_score is set).
+            days_by_file_id: file ID -> day of the call ("YYYY-MM-DD").
+                             Files without a day keep their earlier day,
+                             new ones are counted for today.
+
+        Returns:
+            The number of reports that were added or replaced.
+        """
+        today = date.today().isoformat()
+        oldest_day = self._oldest_open_day()
+        added = replaced = 0
+
+        for report in reports:
+            # Duplicates are the same call; reports without an ID can't be deduplicated.
+            # Calls skipped by the pre-filter have nothing to count.
+            if report.duplicate_of or report.skip_reason or not report.source_file_id:
+                continue
+
+            file_id = report.source_file_id
+            previous = self._contributions.get(file_id)
+            day = (
+                days_by_file_id.get(file_id) or (previous and previous["day"]) or today
+            )
+            if day < oldest_day:
+                logger.warning(
+                    f"Day {day} of file {file_id} is closed in the aggregates. Skipping."
+                )
+                continue
+
+            manager = (report.get("manager_name") or "").strip() or UNKNOWN_MANAGER
+            call_type = report.get("call_type") or ""
+            key = f"{manager}|{day}|{call_type}"
+            values = [int(report.get(metric) or 0) for metric in self.METRICS]
+
+            if previous:
+                if previous["group"] is None:
+                    # Added before the contributions were kept: can't be replaced
+                    continue
+                if previous["group"] == key and previous["values"] == values:
+                    continue
+                self._apply(previous["group"], previous["values"], sign=-1)
+                replaced += 1
+            else:
+                added += 1
+
+            self._groups.setdefault(
+                key,
+                {
+                    "manager": manager,
+                    "day": day,
+                    "call_type": call_type,
+                    "count": 0,
+                    "sums": dict.fromkeys(self.METRICS, 0),
+                },
+            )
+            self._apply(key, values, sign=1)
+            self._contributions[file_id] = {"group": key, "day": day, "values": values}
+
+        logger.info(
+            f"Added {added} reports to the aggregates, replaced {replaced} earlier ones."
+        )
+        return added + replaced
+
+    def summary_rows(self) -> List[List]:
+        """
+        Builds the summary table: one row per manager/day/call_type with the
+        number of calls, the share of calls with each metric and the average score.
+        The newest days come first.
+        """
+        header = ["manager", "day", "call_type", "calls"] + self.METRICS
+        groups = sorted(
+            self._groups.values(),
+            key=lambda group: (group["manager"], group["call_type"]),
+        )
+        groups.sort(key=lambda group: group["day"], reverse=True)
+
+        rows = [header]
+        for group in groups:
+            count = group["count"]
+            sums = group["sums"]
+            rows.append(
+                [group["manager"], group["day"], group["call_type"], count]
+                + [round(sums.get(metric, 0) / count, 2) for metric in self.METRICS]
+            )
+        return rows
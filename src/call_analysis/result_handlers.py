@@ -1,18 +1,24 @@
 import logging
 import os
-from typing import List, Dict, Any
+from typing import Dict, List, Optional
 
+from call_analysis.analysis_strategies.analysis_processor import ProcessedCall
+from call_analysis.report_aggregator import ReportAggregator
+from call_analysis.transcript_bundle import TranscriptBundleWriter
 from excel_table.google_spreadsheets.editor import GoogleSheetEditor
 from google_drive.file_uploader import FileUploader
-from constants import TableConfig, CellBackgroundColors
+from constants import (
+    TableConfig,
+    CellBackgroundColors,
+    SummaryConfig,
+    SheetWriteModes,
+)
 from utils import (
-    write_json_file,
+    write_binary_file,
     create_full_path,
     get_start_end_row,
-    configure_logging,
 )
 
-configure_logging()
 logger = logging.getLogger(__name__)
 
 
@@ -22,79 +28,69 @@ class SheetResultHandler:
     results in a Google Sheet.
     """
 
-    def __init__(self, editor: GoogleSheetEditor):
+    def __init__(
+        self, editor: GoogleSheetEditor, write_mode: str = TableConfig.WRITE_MODE
+    ):
         """
         Initializes the handler with an existing GoogleSheetEditor instance.
+
+        Args:
+            write_mode: "append" or "upsert" (see SheetWriteModes).
         """
         self._editor = editor
+        if write_mode not in (SheetWriteModes.APPEND, SheetWriteModes.UPSERT):
+            logger.warning(f"Unknown sheet write mode '{write_mode}'. Using append.")
+            write_mode = SheetWriteModes.APPEND
+        self._write_mode = write_mode
         if not self._editor.mapping:
             logger.warning(
                 "GoogleSheetEditor has no mapping loaded. Call load_mapping()."
             )
 
-    def _create_transcription_string(self, dialogue_lines: List[Dict]) -> str:
-        """
-        Creates a formatted string from transcript dialogue lines.
-        """
-        if not dialogue_lines:
-            return "Transcription is missing."
-
-        formatted_lines = [
-            f"{line.get('speaker', 'Unknown')}: {line.get('text', '')}"
-            for line in dialogue_lines
-        ]
-        return "\n".join(formatted_lines)
-
     def _prepare_reports_for_writing(
-        self, analysis_reports_dicts: List[Dict[str, Any]]
+        self, reports: List[ProcessedCall]
     ) -> List[List[str]]:
         """
-        Converts a list of report dicts into a list of rows for the sheet.
+        Converts a list of processed calls into a list of rows for the sheet.
+        The records are read in place: the formatted transcription is
+        provided by the record itself, so no per-report copies are made.
         """
-        rows_to_add = []
-        for report_dict in analysis_reports_dicts:
-            # IMPORTANT: We create a copy to avoid modifying the original dict,
-            # which is needed by TranscriptHandler.
-            report_copy = report_dict.copy()
-
-            # Format transcription for sheet view
-            transcript_str = self._create_transcription_string(
-                report_copy.get("transcript", [])
-            )
-            report_copy.pop("transcript", None)  # Remove original list
-            report_copy["transcription"] = transcript_str  # Add formatted string
+        return self._editor.prepare_rows(reports)
 
-            # Use the editor's internal logic to map dict keys to row cells
-            prepared_row = self._editor._prepare_row_data(report_copy)
-            rows_to_add.append(prepared_row)
-
-        return rows_to_add
-
-    def _color_report_cells(
-        self, write_response: dict, analysis_reports_dicts: List[Dict[str, Any]]
-    ):
+    @staticmethod
+    def _get_appended_row_numbers(write_response: dict) -> List[int]:
         """
-        Colors cells based on the analysis results (e.g., negative comments).
+        Returns the row numbers written by an append, read from its 'updatedRange'.
         """
         updated_range = write_response.get("updates", {}).get("updatedRange")
         if not updated_range:
             logger.error(
                 "Response doesn't contain 'updatedRange'. Skipping cell coloring."
             )
-            return
+            return []
 
         start_row, end_row = get_start_end_row(updated_range)
         if start_row > end_row:
             logger.error(
                 f"Invalid row range. start: {start_row}, end: {end_row}. Skipping cell coloring."
             )
-            return
+            return []
+
+        return list(range(start_row, end_row + 1))
 
-        rows_to_color = range(start_row, end_row + 1)
+    def _color_report_cells(self, row_numbers: List[int], reports: List[ProcessedCall]):
+        """
+        Colors cells based on the analysis results (e.g., negative comments).
+
+        Args:
+            row_numbers: The sheet row of each report, in the same order.
+        """
+        if not row_numbers:
+            return
 
         # Build a list of colors based on the reports
         color_sequence = []
-        for report in analysis_reports_dicts:
+        for report in reports:
             is_negative = report.get(TableConfig.NEGATIVE_COMMENT, False)
             color = (
                 CellBackgroundColors.RED if is_negative else CellBackgroundColors.GREEN
@@ -111,38 +107,96 @@ class SheetResultHandler:
 
         # Apply coloring
         logger.info(
-            f"Applying cell formatting to range {col_letter}{start_row}:{col_letter}{end_row}..."
+            f"Applying cell formatting to {len(row_numbers)} rows of column {col_letter}..."
         )
-        for index, color in enumerate(color_sequence):
-            row = rows_to_color[index]
+        for row, color in zip(row_numbers, color_sequence):
             self._editor.color_cell(row, col_letter, color.red, color.green, color.blue)
 
-    def save_and_format_reports(self, reports: List[Dict[str, Any]], sheet_url: str):
+    def _write_rows(self, rows: List[List[str]], sheet_url: str) -> Optional[List[int]]:
+        """
+        Writes the rows in the configured mode.
+
+        Returns:
+            The sheet row number of each row, or None if the write failed.
+        """
+        if self._write_mode == SheetWriteModes.UPSERT:
+            return self._editor.upsert_rows(rows, TableConfig.UPSERT_KEY)
+
+        response = self._editor.write_rows(sheet_url=sheet_url, rows_to_add=rows)
+        if not response:
+            return None
+        return self._get_appended_row_numbers(response)
+
+    def save_and_format_reports(
+        self, reports: List[ProcessedCall], sheet_url: str
+    ) -> bool:
         """
         Main public method.
         Writes all reports to the sheet and then colors the cells.
+
+        Returns:
+            True if the rows were written (cell coloring is cosmetic
+            and doesn't affect the result), False otherwise.
         """
         if not reports:
             logger.warning("No reports to write to Google Sheet.")
-            return
+            return False
 
         logger.info("Preparing reports for Google Sheet...")
         # 1. Prepare data for batch writing
-        rows_to_add = self._prepare_reports_for_writing(reports)
+        rows_to_write = self._prepare_reports_for_writing(reports)
 
         # 2. Use batch writing
-        logger.info("Writing reports to Google Sheet...")
-        response = self._editor.write_rows(sheet_url=sheet_url, rows_to_add=rows_to_add)
+        logger.info(f"Writing reports to Google Sheet ({self._write_mode} mode)...")
+        row_numbers = self._write_rows(rows_to_write, sheet_url)
 
-        if not response:
+        if row_numbers is None:
             logger.error("Failed to write rows. Aborting cell coloring.")
-            return
+            return False
 
-        logger.info(f"Successfully wrote {len(rows_to_add)} rows.")
+        logger.info(f"Successfully wrote {len(rows_to_write)} rows.")
 
         # 3. Color cells
-        self._color_report_cells(response, reports)
+        self._color_report_cells(row_numbers, reports)
         logger.info("Cell coloring applied.")
+        return True
+
+
+class SummaryResultHandler:
+    """
+    Updates the running aggregates with the new reports
+    and rewrites the summary tab of the spreadsheet.
+    """
+
+    def __init__(
+        self,
+        editor: GoogleSheetEditor,
+        aggregator: ReportAggregator,
+        worksheet_title: str = SummaryConfig.SHEET_TITLE,
+    ):
+        self._editor = editor
+        self._aggregator = aggregator
+        self._worksheet_title = worksheet_title
+
+    def update_summary(
+        self, reports: List[ProcessedCall], days_by_file_id: Dict[str, str]
+    ) -> bool:
+        """
+        Main public method.
+
+        The aggregates are saved before the tab is written: the tab is always
+        rebuilt from the full state, so a failed write is fixed by the next run.
+
+        Returns:
+            True if the summary tab was written.
+        """
+        self._aggregator.add_reports(reports, days_by_file_id)
+        self._aggregator.save()
+
+        logger.info(f"Writing summary to worksheet '{self._worksheet_title}'...")
+        return self._editor.write_table(
+            self._worksheet_title, self._aggregator.summary_rows()
+        )
 
 
 class TranscriptHandler:
@@ -156,10 +210,18 @@ class TranscriptHandler:
         uploader: FileUploader,
         local_save_directory: str,
         drive_folder_id: str,
+        bundle_name: Optional[str] = None,
     ):
+        """
+        Args:
+            bundle_name: If set, all transcripts are written into one zip
+                         bundle of this name (see TranscriptBundleWriter)
+                         and uploaded with a single request.
+        """
         self._uploader = uploader
         self._local_dir = local_save_directory
         self._drive_folder_id = drive_folder_id
+        self._bundle_name = bundle_name
         os.makedirs(self._local_dir, exist_ok=True)  # Ensure directory exists
 
     def _get_local_filepath(self, source_file_name: str) -> str:
@@ -170,30 +232,51 @@ class TranscriptHandler:
         file_name = f"{base_name}_transcript.json"
         return create_full_path(self._local_dir, file_name)
 
-    def save_and_upload_transcripts(self, reports: List[Dict[str, Any]]):
+    def save_and_upload_transcripts(
+        self, reports: List[ProcessedCall]
+    ) -> List[ProcessedCall]:
         """
         Main public method.
         Saves transcripts locally, then uploads them to Google Drive.
 
-        **Assumption**: Each dict in 'reports' contains:
-        - 'source_file_name' (str): The original audio file name.
-        - 'transcript' (List[dict]): The original transcript data.
+        Returns:
+            The reports whose transcripts are stored on Drive, including
+            those that don't need a file of their own (duplicates and
+            calls without a transcript).
         """
+        if self._bundle_name:
+            return self._save_and_upload_bundle(reports)
+
         logger.info("Processing transcript files...")
-        saved_file_paths = []
+        confirmed_reports = []
+        saved_files = []
 
         # 1. Save all transcripts locally
         for report in reports:
             logger.debug(
-                f"Processing report for transcript: {report.get('source_file_name')}"
+                "Processing report for transcript: %s", report.source_file_name
             )
-            source_name = report.get("source_file_name")
-            transcript_content = report.get("transcript")
+            source_name = report.source_file_name
+
+            if report.duplicate_of:
+                logger.info(
+                    f"Skipping transcript for duplicate {source_name} (same as {report.duplicate_of})."
+                )
+                confirmed_reports.append(report)
+                continue
 
-            if not source_name or not transcript_content:
+            if report.skip_reason:
+                logger.info(
+                    f"Skipping transcript for {source_name} - not analyzed ({report.skip_reason})."
+                )
+                confirmed_reports.append(report)
+                continue
+
+            if not source_name or not report.transcript:
                 logger.warning(
-                    "Skipping transcript save for a report - missing 'source_file_name' or 'transcript' key."
+                    "Skipping transcript save for a report - missing 'source_file_name' or 'transcript'."
                 )
+                confirmed_reports.append(report)
                 continue
 
             # Get local file path
@@ -201,20 +284,82 @@ class TranscriptHandler:
 
             # Write JSON data
             try:
-                write_json_file(transcript_content, file_path)
-                saved_file_paths.append(file_path)
+                write_binary_file(report.transcript_json(), file_path)
+                saved_files.append((report, file_path))
             except Exception as e:
                 logger.error(f"Error saving local transcript '{file_path}': {e}")
 
-        logger.info(f"Saved {len(saved_file_paths)} transcript files locally.")
+        logger.info(f"Saved {len(saved_files)} transcript files locally.")
 
         # 2. Upload all saved files to Google Drive
-        if saved_file_paths:
+        if saved_files:
             logger.info(
-                f"Uploading {len(saved_file_paths)} transcripts to Google Drive folder '{self._drive_folder_id}'..."
+                f"Uploading {len(saved_files)} transcripts to Google Drive folder '{self._drive_folder_id}'..."
             )
-            self._uploader.upload_multiple_files(
-                local_file_paths=saved_file_paths, folder_id=self._drive_folder_id
+            uploaded_count = 0
+            for report, file_path in saved_files:
+                file_id = self._uploader.upload_file(
+                    local_file_path=file_path, folder_id=self._drive_folder_id
+                )
+                if file_id:
+                    uploaded_count += 1
+                    confirmed_reports.append(report)
+
+            logger.info(
+                f"Upload complete. Successfully uploaded {uploaded_count} out of {len(saved_files)} files."
             )
         else:
             logger.info("No local transcript files to upload.")
+
+        return confirmed_reports
+
+    def _save_and_upload_bundle(
+        self, reports: List[ProcessedCall]
+    ) -> List[ProcessedCall]:
+        """
+        Writes all transcripts into one bundle and uploads it.
+        The bundle is a single file, so its reports are confirmed all together.
+        """
+        logger.info("Bundling transcript files...")
+        bundled_reports = []
+        skipped_reports = []
+        bundle_path = create_full_path(self._local_dir, self._bundle_name)
+
+        with TranscriptBundleWriter(bundle_path) as bundle:
+            for report in reports:
+                if (
+                    report.duplicate_of
+                    or report.skip_reason
+                    or not report.source_file_name
+                ):
+                    skipped_reports.append(report)
+                    continue
+                if not report.transcript:
+                    logger.warning(
+                        f"Skipping transcript of {report.source_file_name} - it is empty."
+                    )
+                    skipped_reports.append(report)
+                    continue
+                bundle.add(
+                    report.source_file_name,
+                    report.source_file_id,
+                    report.transcript_json(),
+                )
+                bundled_reports.append(report)
+
+        if not bundled_reports:
+            logger.info("No transcripts to upload.")
+            os.remove(bundle_path)
+            return skipped_reports
+
+        logger.info(
+            f"Uploading bundle of {len(bundled_reports)} transcripts to Google Drive folder '{self._drive_folder_id}'..."
+        )
+        file_id = self._uploader.upload_file(
+            local_file_path=bundle_path, folder_id=self._drive_folder_id
+        )
+        if not file_id:
+            logger.error(f"Failed to upload transcript bundle {bundle_path}.")
+            return skipped_reports
+
+        return skipped_reports + bundled_reports
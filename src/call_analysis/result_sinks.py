@@ -0,0 +1,299 @@
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+import urllib.request
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set
+
+from call_analysis.analysis_strategies.analysis_processor import ProcessedCall
+from call_analysis.result_handlers import (
+    SheetResultHandler,
+    SummaryResultHandler,
+    TranscriptHandler,
+)
+from call_analysis.run_checkpoint import RunCheckpoint, RunStages
+from tracing import start_span
+
+logger = logging.getLogger(__name__)
+
+
+def report_record(report: ProcessedCall) -> Dict[str, Any]:
+    """The JSON form of an evaluated report, as stored by the local and webhook sinks."""
+    return {
+        "source_file_id": report.source_file_id,
+        "source_file_name": report.source_file_name,
+        "duplicate_of": report.duplicate_of,
+        "skip_reason": report.skip_reason,
+        "total_score": report.total_score,
+        "analysis": (
+            None if report.skip_reason else report.analysis.model_dump(mode="json")
+        ),
+    }
+
+
+class ResultSink(ABC):
+    """
+    A destination of the evaluated reports.
+
+    Attributes:
+        name: Unique name, also the checkpoint stage of the sink.
+        lane: Sinks of the same lane run one after another in one thread,
+              e.g. because they share a client that is not thread-safe.
+    """
+
+    name: str
+    lane: str
+
+    @abstractmethod
+    def write(self, reports: List[ProcessedCall]) -> List[ProcessedCall]:
+        """
+        Stores the reports.
+
+        Returns:
+            The reports the sink has acknowledged (stored for good).
+        """
+        pass
+
+
+class SheetSink(ResultSink):
+    """Rows of the results sheet."""
+
+    name = RunStages.SHEET
+    lane = "sheets"
+
+    def __init__(self, handler: SheetResultHandler, sheet_url: str):
+        self._handler = handler
+        self._sheet_url = sheet_url
+
+    def write(self, reports: List[ProcessedCall]) -> List[ProcessedCall]:
+        if self._handler.save_and_format_reports(
+            reports=reports, sheet_url=self._sheet_url
+        ):
+            return reports
+        return []
+
+
+class SummarySink(ResultSink):
+    """The per-manager summary tab, written after the rows (same spreadsheet)."""
+
+    name = RunStages.SUMMARY
+    lane = "sheets"
+
+    def __init__(self, handler: SummaryResultHandler, days_by_file_id: Dict[str, str]):
+        self._handler = handler
+        self._days_by_file_id = days_by_file_id
+
+    def write(self, reports: List[ProcessedCall]) -> List[ProcessedCall]:
+        if self._handler.update_summary(reports, self._days_by_file_id):
+            return reports
+        return []
+
+
+class TranscriptSink(ResultSink):
+    """Transcript files on Google Drive."""
+
+    name = RunStages.TRANSCRIPTS
+    lane = "drive"
+
+    def __init__(self, handler: TranscriptHandler):
+        self._handler = handler
+
+    def write(self, reports: List[ProcessedCall]) -> List[ProcessedCall]:
+        return self._handler.save_and_upload_transcripts(reports=reports)
+
+
+class LocalStoreSink(ResultSink):
+    """Appends the reports to a local JSONL file, one report per line."""
+
+    name = RunStages.LOCAL_STORE
+    lane = "local"
+
+    def __init__(self, path: str):
+        self._path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def write(self, reports: List[ProcessedCall]) -> List[ProcessedCall]:
+        lines = [
+            json.dumps(report_record(report), ensure_ascii=False) + "\n"
+            for report in reports
+        ]
+        with open(self._path, "a", encoding="utf-8") as f:
+            f.writelines(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        logger.info(f"Stored {len(reports)} reports in {self._path}.")
+        return reports
+
+
+class WebhookSink(ResultSink):
+    """POSTs the reports of the run as one JSON document to a URL."""
+
+    name = RunStages.WEBHOOK
+    lane = "webhook"
+
+    def __init__(self, url: str, run_id: str, timeout: float = 30):
+        self._url = url
+        self._run_id = run_id
+        self._timeout = timeout
+
+    def write(self, reports: List[ProcessedCall]) -> List[ProcessedCall]:
+        body = json.dumps(
+            {
+                "run_id": self._run_id,
+                "reports": [report_record(report) for report in reports],
+            },
+            ensure_ascii=False,
+        ).encode("utf-8")
+        request = urllib.request.Request(
+            self._url,
+            data=body,
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        # Non-2xx responses raise HTTPError
+        with urllib.request.urlopen(request, timeout=self._timeout) as response:
+            logger.info(
+                f"Webhook accepted {len(reports)} reports (HTTP {response.status})."
+            )
+        return reports
+
+
+@dataclass
+class SinkOutcome:
+    name: str
+    pending: int = 0
+    acknowledged: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+    # The stage was completed by an earlier attempt of the run
+    already_completed: bool = False
+
+    @property
+    def completed(self) -> bool:
+        return self.already_completed or (
+            self.error is None and self.acknowledged == self.pending
+        )
+
+
+class ResultDispatcher:
+    """
+    Fans the evaluated reports out to all sinks in parallel.
+
+    Every sink runs isolated: its errors are logged and only fail that sink,
+    and its time is measured on its own. The reports each sink acknowledges
+    are confirmed in the run checkpoint under the sink's name, so a resumed
+    run only retries the missing ones; the run is complete only when every
+    sink has acknowledged every report.
+    """
+
+    def __init__(self, sinks: List[ResultSink], checkpoint: RunCheckpoint):
+        names = [sink.name for sink in sinks]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Sink names must be unique: {names}")
+        self._sinks = sinks
+        self._checkpoint = checkpoint
+        # The checkpoint file is appended to from the lane threads
+        self._checkpoint_lock = threading.Lock()
+
+    def _pending_reports(
+        self, sink: ResultSink, reports: List[ProcessedCall]
+    ) -> List[ProcessedCall]:
+        confirmed = set(self._checkpoint.confirmed_file_ids(sink.name))
+        return [report for report in reports if report.source_file_id not in confirmed]
+
+    def _run_sink(self, sink: ResultSink, reports: List[ProcessedCall]) -> SinkOutcome:
+        outcome = SinkOutcome(name=sink.name)
+        if self._checkpoint.is_completed(sink.name):
+            logger.info(f"Sink '{sink.name}' already completed in this run.")
+            outcome.already_completed = True
+            return outcome
+
+        pending = self._pending_reports(sink, reports)
+        outcome.pending = len(pending)
+        started = time.perf_counter()
+        acknowledged = []
+        try:
+            if pending:
+                with start_span("results.sink", sink=sink.name, reports=len(pending)):
+                    acknowledged = sink.write(pending)
+        except Exception as e:
+            outcome.error = str(e)
+            logger.error(f"Sink '{sink.name}' failed: {e}")
+        outcome.seconds = time.perf_counter() - started
+        outcome.acknowledged = len(acknowledged)
+
+        with self._checkpoint_lock:
+            if acknowledged:
+                self._checkpoint.confirm_files(
+                    sink.name, [report.source_file_id for report in acknowledged]
+                )
+            if outcome.completed:
+                self._checkpoint.complete_stage(sink.name)
+
+        logger.info(
+            f"Sink '{sink.name}': {outcome.acknowledged}/{outcome.pending} reports "
+            f"acknowledged in {outcome.seconds:.2f}s."
+        )
+        return outcome
+
+    def _run_lane(
+        self, sinks: List[ResultSink], reports: List[ProcessedCall]
+    ) -> List[SinkOutcome]:
+        return [self._run_sink(sink, reports) for sink in sinks]
+
+    def dispatch(self, reports: List[ProcessedCall]) -> List[SinkOutcome]:
+        """
+        Writes the reports to all sinks and waits for every one of them.
+
+        Returns:
+            The outcome of each sink, in the order of the sinks.
+        """
+        lanes: Dict[str, List[ResultSink]] = {}
+        for sink in self._sinks:
+            lanes.setdefault(sink.lane, []).append(sink)
+
+        logger.info(
+            f"Dispatching {len(reports)} reports to {len(self._sinks)} sinks "
+            f"in {len(lanes)} lanes..."
+        )
+        outcomes: Dict[str, SinkOutcome] = {}
+        started = time.perf_counter()
+        with ThreadPoolExecutor(
+            max_workers=max(len(lanes), 1), thread_name_prefix="sink"
+        ) as executor:
+            # Each lane thread keeps the log context and the current span of the run
+            futures = [
+                executor.submit(
+                    contextvars.copy_context().run,
+                    self._run_lane,
+                    lane_sinks,
+                    reports,
+                )
+                for lane_sinks in lanes.values()
+            ]
+            for future in as_completed(futures):
+                for outcome in future.result():
+                    outcomes[outcome.name] = outcome
+
+        logger.info(f"All sinks finished in {time.perf_counter() - started:.2f}s.")
+        return [outcomes[sink.name] for sink in self._sinks]
+
+    def acknowledged_file_ids(self, reports: List[ProcessedCall]) -> List[str]:
+        """Returns the IDs of the reports that every sink has acknowledged."""
+        acknowledged: Optional[Set[str]] = None
+        for sink in self._sinks:
+            if self._checkpoint.is_completed(sink.name):
+                sink_ids = {report.source_file_id for report in reports}
+            else:
+                sink_ids = set(self._checkpoint.confirmed_file_ids(sink.name))
+            acknowledged = sink_ids if acknowledged is None else acknowledged & sink_ids
+        return [
+            report.source_file_id
+            for report in reports
+            if acknowledged is not None and report.source_file_id in acknowledged
+        ]
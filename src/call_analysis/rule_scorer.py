@@ -0,0 +1,141 @@
+import logging
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from call_analysis.analysis_strategies.gemini.output_schema import DialogLine
+from utils import read_json
+
+logger = logging.getLogger(__name__)
+
+# Apostrophe variants found in transcripts are matched as a plain "'"
+_APOSTROPHES = str.maketrans({"’": "'", "ʼ": "'", "`": "'", "‘": "'"})
+
+
+class RuleWindows:
+    START = "start"  # the first N lines of the speaker
+    END = "end"  # the last N lines of the speaker
+    ANY = "any"  # every line of the speaker
+
+
+@dataclass
+class _RuleGroup:
+    """
+    All rules that scan the same lines (same speaker and window),
+    with one compiled regex per phrase group.
+    """
+
+    speaker: str
+    window: str
+    lines: int
+    # (field, regex of one of its phrase groups)
+    patterns: List[tuple]
+
+
+class ScriptRuleScorer:
+    """
+    Decides the boolean script-compliance fields (greeting, farewell,
+    car info questions) from the transcript with phrase rules.
+
+    A field is decided (True) only when every phrase group of its rule
+    matches in the speaker's lines of the rule's window. Otherwise the rule
+    is not confident (None) and the field is left to the LLM - the absence
+    of a phrase doesn't prove the question wasn't asked.
+
+    Rules with the same speaker and window share the window's text, which
+    is built once. Each phrase group is searched on its own: phrases of
+    different fields may overlap ("скільки кілометрів" / "кілометрів"),
+    and a match of one group must not hide the text another group needs.
+    """
+
+    def __init__(self, rules: Dict[str, dict]):
+        """
+        Args:
+            rules: field -> {"speaker": ..., "window": "start" | "end" | "any",
+                   "lines": N, "phrase_groups": [[phrase, ...], ...]}.
+        """
+        self.fields: List[str] = list(rules)
+        self._rule_groups = self._compile(rules)
+        logger.debug(f"ScriptRuleScorer initialized for fields: {self.fields}")
+
+    @classmethod
+    def from_file(cls, path: str) -> "ScriptRuleScorer":
+        return cls(read_json(path))
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return text.translate(_APOSTROPHES).casefold()
+
+    def _compile(self, rules: Dict[str, dict]) -> List[_RuleGroup]:
+        by_scope: Dict[tuple, List[tuple]] = {}
+
+        for field, rule in rules.items():
+            window = rule.get("window", RuleWindows.ANY)
+            lines = rule.get("lines", 0) if window != RuleWindows.ANY else 0
+            patterns = by_scope.setdefault((rule["speaker"], window, lines), [])
+
+            for phrases in rule["phrase_groups"]:
+                alternatives = "|".join(
+                    re.escape(self._normalize(phrase))
+                    for phrase in sorted(phrases, key=len, reverse=True)
+                )
+                # Phrases match from a word start, so inflected forms match too
+                patterns.append((field, re.compile(rf"\b(?:{alternatives})")))
+
+        return [
+            _RuleGroup(speaker=speaker, window=window, lines=lines, patterns=patterns)
+            for (speaker, window, lines), patterns in by_scope.items()
+        ]
+
+    def score(self, transcript: List[DialogLine]) -> Dict[str, Optional[bool]]:
+        """
+        Returns:
+            field -> True if the rule is confident the script item was done,
+            None if the rule can't decide.
+        """
+        decisions: Dict[str, Optional[bool]] = dict.fromkeys(self.fields)
+        lines_by_speaker: Dict[str, List[str]] = {}
+        for line in transcript:
+            lines_by_speaker.setdefault(line.speaker.value, []).append(line.text)
+
+        for rule_group in self._rule_groups:
+            lines = lines_by_speaker.get(rule_group.speaker)
+            if not lines:
+                continue
+            if rule_group.window == RuleWindows.START:
+                lines = lines[: rule_group.lines]
+            elif rule_group.window == RuleWindows.END:
+                lines = lines[-rule_group.lines :]
+
+            text = self._normalize("\n".join(lines))
+            # A field is decided only if every one of its phrase groups matches
+            matched_fields = {}
+            for field, pattern in rule_group.patterns:
+                if matched_fields.get(field, True):
+                    matched_fields[field] = pattern.search(text) is not None
+
+            for field, matched in matched_fields.items():
+                if matched:
+                    decisions[field] = True
+
+        return decisions
+
+    @staticmethod
+    def is_confident(decisions: Dict[str, Optional[bool]]) -> bool:
+        """True if every rule field was decided."""
+        return all(value is not None for value in decisions.values())
+
+    @staticmethod
+    def find_disagreements(
+        decisions: Dict[str, Optional[bool]], analysis
+    ) -> Dict[str, Optional[bool]]:
+        """
+        Returns field -> rule decision for the decided fields where
+        the LLM analysis says otherwise.
+        """
+        values = analysis.__dict__
+        return {
+            field: value
+            for field, value in decisions.items()
+            if value is not None and values.get(field) != value
+        }
@@ -0,0 +1,184 @@
+import logging
+import json
+import os
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from call_analysis.analysis_strategies.analysis_processor import (
+    ProcessedCall,
+    create_skipped_call,
+)
+from call_analysis.analysis_strategies.gemini.output_schema import CallAnalysisResult
+from constants import Directories
+from utils import create_full_path
+
+logger = logging.getLogger(__name__)
+
+
+class RunStages:
+    ANALYSIS = "analysis"
+    SHEET = "sheet"
+    SUMMARY = "summary"
+    TRANSCRIPTS = "transcripts"
+    LOCAL_STORE = "local_store"
+    WEBHOOK = "webhook"
+    ARCHIVE = "archive"
+
+
+class RunCheckpoint:
+    """
+    Append-only JSONL journal of a single pipeline run.
+
+    Every stage output is written as soon as it is produced (each analyzed
+    call on its own line), so a failure in a later stage doesn't throw away
+    the paid Gemini analysis: the run can be resumed by its run id and
+    continues from the first incomplete stage.
+    """
+
+    def __init__(self, run_id: str, directory: str = Directories.RUNS):
+        self.run_id = run_id
+        self._path = create_full_path(directory, f"{run_id}.jsonl")
+        os.makedirs(directory, exist_ok=True)
+
+        self.audio_folder_id: Optional[str] = None
+        # Name of the tenant the run belongs to (None for runs made before tenants)
+        self.tenant: Optional[str] = None
+        self.audio_files: List[Dict[str, str]] = []
+        self.processed_calls: List[ProcessedCall] = []
+        self._completed_stages: set[str] = set()
+        # stage -> file IDs already confirmed by that stage
+        self._confirmed_files: Dict[str, List[str]] = {}
+
+    @staticmethod
+    def new_run_id() -> str:
+        return f"{datetime.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:6]}"
+
+    def exists(self) -> bool:
+        return os.path.exists(self._path)
+
+    def _append(self, record: Dict[str, Any]):
+        line = json.dumps(record, ensure_ascii=False)
+        with open(self._path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def start(
+        self,
+        audio_folder_id: str,
+        audio_files: List[Dict[str, str]],
+        tenant: Optional[str] = None,
+    ):
+        """Records the input of the run: the tenant, the folder and the listed files."""
+        self.audio_folder_id = audio_folder_id
+        self.audio_files = audio_files
+        self.tenant = tenant
+        self._append(
+            {
+                "type": "run_started",
+                "run_id": self.run_id,
+                "started_at": datetime.now().isoformat(),
+                "tenant": tenant,
+                "audio_folder_id": audio_folder_id,
+                "audio_files": audio_files,
+            }
+        )
+        logger.info(f"Run {self.run_id} checkpoint: {self._path}")
+
+    def record_call(self, call: ProcessedCall):
+        """Records one analyzed call as soon as its analysis is available."""
+        self.processed_calls.append(call)
+        self._append(
+            {
+                "type": "call_analyzed",
+                "source_file_id": call.source_file_id,
+                "source_file_name": call.source_file_name,
+                "duplicate_of": call.duplicate_of,
+                "skip_reason": call.skip_reason,
+                # The marker of a skipped call is rebuilt from its reason
+                "analysis": (
+                    None if call.skip_reason else call.analysis.model_dump(mode="json")
+                ),
+            }
+        )
+
+    def confirm_files(self, stage: str, file_ids: List[str]):
+        """
+        Records the files a stage has handled, so that a resumed run
+        only retries the remaining ones.
+        """
+        self._confirmed_files.setdefault(stage, []).extend(file_ids)
+        self._append({"type": "files_confirmed", "stage": stage, "file_ids": file_ids})
+
+    def complete_stage(self, stage: str):
+        self._completed_stages.add(stage)
+        self._append({"type": "stage_completed", "stage": stage})
+
+    def is_completed(self, stage: str) -> bool:
+        return stage in self._completed_stages
+
+    def confirmed_file_ids(self, stage: str) -> List[str]:
+        return self._confirmed_files.get(stage, [])
+
+    def load(self):
+        """
+        Restores the run state from the journal.
+        A truncated last line (e.g. after a crash mid-write) is skipped.
+        """
+        if not self.exists():
+            raise FileNotFoundError(f"No checkpoint found for run '{self.run_id}'.")
+
+        with open(self._path, "r", encoding="utf-8") as f:
+            content = f.read()
+
+        for line_number, line in enumerate(content.splitlines(), start=1):
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(
+                    f"Skipping unreadable line {line_number} in {self._path}."
+                )
+                continue
+            self._apply(record)
+
+        # Terminate a truncated last line, so new records start on a line of their own
+        if content and not content.endswith("\n"):
+            with open(self._path, "a", encoding="utf-8") as f:
+                f.write("\n")
+
+        logger.info(
+            f"Loaded run {self.run_id}: {len(self.processed_calls)} analyzed calls, "
+            f"completed stages: {sorted(self._completed_stages) or 'none'}."
+        )
+
+    def _apply(self, record: Dict[str, Any]):
+        record_type = record.get("type")
+
+        if record_type == "run_started":
+            self.audio_folder_id = record.get("audio_folder_id")
+            self.tenant = record.get("tenant")
+            self.audio_files = record.get("audio_files", [])
+        elif record_type == "call_analyzed" and record.get("skip_reason"):
+            call = create_skipped_call(
+                record.get("source_file_id"),
+                record["source_file_name"],
+                record["skip_reason"],
+            )
+            call.duplicate_of = record.get("duplicate_of")
+            self.processed_calls.append(call)
+        elif record_type == "call_analyzed":
+            self.processed_calls.append(
+                ProcessedCall(
+                    source_file_name=record["source_file_name"],
+                    analysis=CallAnalysisResult.model_validate(record["analysis"]),
+                    source_file_id=record.get("source_file_id"),
+                    duplicate_of=record.get("duplicate_of"),
+                )
+            )
+        elif record_type == "files_confirmed":
+            self._confirmed_files.setdefault(record["stage"], []).extend(
+                record.get("file_ids", [])
+            )
+        elif record_type == "stage_completed":
+            self._completed_stages.add(record["stage"])
@@ -0,0 +1,126 @@
+import json
+import logging
+import os
+import zipfile
+from typing import Dict, List, Optional
+
+from call_analysis.analysis_strategies.gemini.output_schema import (
+    DialogLine,
+    transcript_adapter,
+)
+
+logger = logging.getLogger(__name__)
+
+INDEX_NAME = "index.json"
+
+
+class TranscriptBundleWriter:
+    """
+    Collects the transcripts of a run into one compressed zip file, so the
+    whole run is uploaded with a single request instead of one file per call.
+
+    Each transcript is its own deflated member, and index.json maps
+    source_file_name -> member name and Drive file ID. Together with the
+    zip's central directory this lets a reader open any single transcript
+    without decompressing the rest of the bundle.
+
+    Usage:
+        with TranscriptBundleWriter(path) as bundle:
+            bundle.add(name, file_id, transcript_json)
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+        self._temp_path = f"{path}.tmp"
+        self._zip = zipfile.ZipFile(
+            self._temp_path, "w", compression=zipfile.ZIP_DEFLATED
+        )
+        self._index: Dict[str, dict] = {}
+        self._members: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __enter__(self) -> "TranscriptBundleWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self._zip.close()
+            os.remove(self._temp_path)
+
+    def _member_name(self, source_file_name: str) -> str:
+        base_name, _ = os.path.splitext(source_file_name)
+        member = f"{base_name}_transcript.json"
+        # Files from different folders may share a name
+        counter = 1
+        while member in self._members:
+            counter += 1
+            member = f"{base_name}_transcript_{counter}.json"
+        self._members.add(member)
+        return member
+
+    def add(self, source_file_name: str, source_file_id: Optional[str], data: bytes):
+        """Adds the transcript JSON of one call."""
+        if source_file_name in self._index:
+            logger.warning(
+                f"Transcript of {source_file_name} is already in the bundle."
+            )
+            return
+        member = self._member_name(source_file_name)
+        self._zip.writestr(member, data)
+        self._index[source_file_name] = {"member": member, "file_id": source_file_id}
+
+    def close(self):
+        """Writes the index and moves the finished bundle to its path."""
+        self._zip.writestr(
+            INDEX_NAME, json.dumps(self._index, ensure_ascii=False, indent=2)
+        )
+        self._zip.close()
+        os.replace(self._temp_path, self._path)
+        logger.info(f"Wrote {len(self._index)} transcripts to bundle {self._path}.")
+
+
+class TranscriptBundleReader:
+    """
+    Random access to the transcripts of a bundle by source_file_name.
+    Only the index and the requested member are decompressed.
+    """
+
+    def __init__(self, path: str):
+        self._zip = zipfile.ZipFile(path, "r")
+        self._index: Dict[str, dict] = json.loads(self._zip.read(INDEX_NAME))
+
+    def __enter__(self) -> "TranscriptBundleReader":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __contains__(self, source_file_name: str) -> bool:
+        return source_file_name in self._index
+
+    def close(self):
+        self._zip.close()
+
+    def names(self) -> List[str]:
+        """The source file names of all transcripts in the bundle."""
+        return list(self._index)
+
+    def file_id(self, source_file_name: str) -> Optional[str]:
+        return self._index[source_file_name]["file_id"]
+
+    def read_json(self, source_file_name: str) -> bytes:
+        """
+        Returns the transcript JSON of one call.
+
+        Raises:
+            KeyError: if the call is not in the bundle.
+        """
+        return self._zip.read(self._index[source_file_name]["member"])
+
+    def read(self, source_file_name: str) -> List[DialogLine]:
+        """Returns the validated transcript of one call."""
+        return transcript_adapter.validate_json(self.read_json(source_file_name))
@@ -0,0 +1,109 @@
+import logging
+import os
+import uuid
+from datetime import datetime
+from typing import Iterator, List, Optional
+from pydantic import BaseModel, ValidationError
+
+from call_analysis.analysis_strategies.gemini.output_schema import (
+    CallEvaluation,
+    DialogLine,
+)
+from constants import Directories
+from utils import create_full_path
+
+logger = logging.getLogger(__name__)
+
+
+class CachedTranscript(BaseModel):
+    """A cached transcript together with the recording it was made from."""
+
+    audio_hash: str
+    transcript: List[DialogLine]
+    source_file_id: Optional[str] = None
+    source_file_name: Optional[str] = None
+    # The last evaluation of the transcript and the prompt it was made with
+    evaluation: Optional[CallEvaluation] = None
+    evaluation_prompt_id: Optional[str] = None
+    cached_at: Optional[str] = None
+
+
+class TranscriptCache:
+    """
+    Local store of call transcripts keyed by the audio hash
+    (CallDeduplicator.audio_hash), one JSON file per recording.
+
+    Transcription is the expensive, audio-dependent part of the analysis.
+    With the transcripts kept, changed criteria or prompts only need the
+    text-only evaluation pass, and the whole archive can be re-scored
+    without sending any audio again.
+    """
+
+    def __init__(self, directory: str = Directories.TRANSCRIPT_CACHE):
+        self._directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, audio_hash: str) -> str:
+        return create_full_path(self._directory, f"{audio_hash}.json")
+
+    def _read(self, path: str) -> Optional[CachedTranscript]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return CachedTranscript.model_validate_json(f.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValidationError) as e:
+            logger.warning(f"Skipping unreadable cached transcript {path}: {e}")
+            return None
+
+    def get(self, audio_hash: str) -> Optional[CachedTranscript]:
+        return self._read(self._path(audio_hash))
+
+    def put(
+        self,
+        audio_hash: str,
+        transcript: List[DialogLine],
+        source_file_id: Optional[str] = None,
+        source_file_name: Optional[str] = None,
+        evaluation: Optional[CallEvaluation] = None,
+        evaluation_prompt_id: Optional[str] = None,
+    ):
+        """
+        Stores the transcript. Fields of an existing entry that are not
+        given (e.g. the source, when written by a strategy) are kept.
+        A new evaluation always replaces the prompt ID as well: without one,
+        the evaluation was not made by the evaluation prompt.
+        """
+        updates = {
+            "transcript": transcript,
+            "source_file_id": source_file_id,
+            "source_file_name": source_file_name,
+        }
+        updates = {key: value for key, value in updates.items() if value is not None}
+        if evaluation is not None:
+            updates["evaluation"] = evaluation
+            updates["evaluation_prompt_id"] = evaluation_prompt_id
+
+        entry = self.get(audio_hash) or CachedTranscript(
+            audio_hash=audio_hash, transcript=transcript
+        )
+        entry = entry.model_copy(
+            update={**updates, "cached_at": datetime.now().isoformat()}
+        )
+
+        # Write to a temporary file first, so readers never see a partial entry
+        path = self._path(audio_hash)
+        temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(entry.model_dump_json(indent=2))
+        os.replace(temp_path, path)
+        logger.debug("Cached transcript %s.", audio_hash)
+
+    def entries(self) -> Iterator[CachedTranscript]:
+        """Iterates over all cached transcripts."""
+        for file_name in sorted(os.listdir(self._directory)):
+            if not file_name.endswith(".json"):
+                continue
+            entry = self._read(create_full_path(self._directory, file_name))
+            if entry:
+                yield entry
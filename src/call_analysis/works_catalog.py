@@ -0,0 +1,222 @@
+import logging
+import math
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Apostrophe variants are dropped, so "Компʼютерна", "Комп'ютерна"
+# and "Компютерна" all normalize to the same form
+_APOSTROPHES = str.maketrans("", "", "'ʼ’‘`")
+_SEPARATOR_SPACING = re.compile(r"\s*([|/])\s*")
+_WHITESPACE = re.compile(r"\s+")
+_WORD = re.compile(r"\w+")
+# Words that many entries start with or that only join others: they say
+# nothing about which work is meant, so they are not compared
+_IGNORED_WORDS = frozenset(
+    {"заміна", "ремонт", "зняття", "встановлення", "та", "і", "й", "в", "у", "з"}
+)
+# Inflected forms of a word share at least this long a prefix ("свічок" / "свічки")
+_STEM_LENGTH = 4
+# Abbreviations like "зд." or "прд." are at most this long
+_ABBREVIATION_LENGTH = 3
+_MEMO_SIZE = 4096
+
+
+@dataclass
+class WorkMatch:
+    """
+    Attributes:
+        mention: The text as returned by the LLM.
+        canonical: The catalog entry it maps to, or None if unmapped.
+        confidence: 1.0 for an exact (normalized) match, otherwise the
+                    word similarity of the best candidate.
+    """
+
+    mention: str
+    canonical: Optional[str]
+    confidence: float
+
+
+class WorksCatalogIndex:
+    """
+    Maps free-text work mentions to the canonical entries of the
+    "top works" catalog from analysis_criteria.json.
+
+    The index is built once: a dict of normalized forms for exact matches
+    and an inverted index of word initials for fuzzy ones. A fuzzy lookup
+    compares the mention word by word with the entries that share a word
+    initial: inflected forms and abbreviations ("зд." for "заднього") match,
+    rare words weigh more than common ones, and the shared head words
+    ("Заміна", "Ремонт") are ignored. A fuzzy match must also lead the
+    runner-up by a margin - an ambiguous mention stays unmapped.
+    Results are memoized per mention (least recently used are dropped).
+    """
+
+    def __init__(
+        self,
+        catalog: List[str],
+        min_confidence: float = 0.6,
+        min_margin: float = 0.15,
+    ):
+        """
+        Args:
+            catalog: Canonical work names.
+            min_confidence: Lowest similarity accepted for a fuzzy match.
+            min_margin: Lowest lead of a fuzzy match over the second-best entry.
+        """
+        self._min_confidence = min_confidence
+        self._min_margin = min_margin
+        self._entries: List[str] = []
+        self._entry_words: List[List[str]] = []
+        self._exact: Dict[str, str] = {}
+        self._initial_index: Dict[str, Set[int]] = {}
+        self._memo: "OrderedDict[str, WorkMatch]" = OrderedDict()
+
+        for entry in catalog:
+            normalized = self.normalize(entry)
+            if not normalized or normalized in self._exact:
+                continue
+            self._exact[normalized] = entry
+
+            entry_id = len(self._entries)
+            words = self._words(normalized)
+            self._entries.append(entry)
+            self._entry_words.append(words)
+            for word in words:
+                self._initial_index.setdefault(word[0], set()).add(entry_id)
+
+        # Rare words identify an entry better than common ones
+        document_counts: Dict[str, int] = {}
+        for words in self._entry_words:
+            for word in set(words):
+                document_counts[word] = document_counts.get(word, 0) + 1
+        entry_count = max(len(self._entries), 1)
+        self._word_weights = {
+            word: math.log(1 + entry_count / count)
+            for word, count in document_counts.items()
+        }
+        self._unknown_word_weight = math.log(1 + entry_count)
+
+        logger.debug(f"WorksCatalogIndex built for {len(self._entries)} entries.")
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Casefolds and unifies apostrophes, whitespace and "|" / "/" spacing."""
+        text = text.casefold().translate(_APOSTROPHES)
+        text = _SEPARATOR_SPACING.sub(r" \1 ", text)
+        return _WHITESPACE.sub(" ", text).strip(" .,;")
+
+    @staticmethod
+    def _words(normalized: str) -> List[str]:
+        return [
+            word for word in _WORD.findall(normalized) if word not in _IGNORED_WORDS
+        ]
+
+    @staticmethod
+    def _words_match(first: str, second: str) -> bool:
+        """True for the same word, its inflected form or its abbreviation."""
+        if first == second:
+            return True
+        shorter, longer = sorted((first, second), key=len)
+        if len(shorter) >= _STEM_LENGTH:
+            return longer.startswith(shorter[:_STEM_LENGTH])
+        if len(shorter) > _ABBREVIATION_LENGTH or shorter[0] != longer[0]:
+            return False
+        # An abbreviation keeps some of the word's letters in order
+        letters = iter(longer)
+        return all(letter in letters for letter in shorter)
+
+    def _weight(self, word: str) -> float:
+        return self._word_weights.get(word, self._unknown_word_weight)
+
+    def _similarity(self, words: List[str], entry_words: List[str]) -> float:
+        """Weighted share of the words of both texts that have a match in the other."""
+        matched = total = 0.0
+        for word in words:
+            weight = self._weight(word)
+            total += weight
+            if any(self._words_match(word, other) for other in entry_words):
+                matched += weight
+        for other in entry_words:
+            weight = self._weight(other)
+            total += weight
+            if any(self._words_match(other, word) for word in words):
+                matched += weight
+        return matched / total if total else 0.0
+
+    def match(self, mention: str) -> WorkMatch:
+        """Maps a single mention to its catalog entry."""
+        cached = self._memo.get(mention)
+        if cached:
+            self._memo.move_to_end(mention)
+            return cached
+
+        normalized = self.normalize(mention)
+        canonical = self._exact.get(normalized)
+        if canonical:
+            result = WorkMatch(mention, canonical, 1.0)
+        else:
+            result = self._fuzzy_match(mention, normalized)
+
+        self._memo[mention] = result
+        if len(self._memo) > _MEMO_SIZE:
+            self._memo.popitem(last=False)
+        return result
+
+    def _fuzzy_match(self, mention: str, normalized: str) -> WorkMatch:
+        words = self._words(normalized)
+        candidates = set()
+        for word in words:
+            candidates.update(self._initial_index.get(word[0], ()))
+
+        scores = sorted(
+            (
+                (self._similarity(words, self._entry_words[entry_id]), entry_id)
+                for entry_id in candidates
+            ),
+            reverse=True,
+        )
+        if not scores:
+            return WorkMatch(mention, None, 0.0)
+
+        best_score, best_id = scores[0]
+        runner_up_score = scores[1][0] if len(scores) > 1 else 0.0
+        best_entry = self._entries[best_id]
+
+        if best_score < self._min_confidence:
+            return WorkMatch(mention, None, best_score)
+        if best_score - runner_up_score < self._min_margin:
+            logger.info(
+                f"Work mention '{mention}' is ambiguous: '{best_entry}' ({best_score:.2f}) "
+                f"vs '{self._entries[scores[1][1]]}' ({runner_up_score:.2f}). Kept as is."
+            )
+            return WorkMatch(mention, None, best_score)
+
+        logger.info(
+            f"Work mention '{mention}' mapped to '{best_entry}' (confidence {best_score:.2f})."
+        )
+        return WorkMatch(mention, best_entry, best_score)
+
+    def normalize_mentions(self, mentions: List[str]) -> tuple:
+        """
+        Maps a list of mentions. Mapped ones are replaced with their canonical
+        entry (without repeats); unmapped ones are kept as they are.
+
+        Returns:
+            (normalized mentions, list of unmapped WorkMatch)
+        """
+        result: List[str] = []
+        unmapped: List[WorkMatch] = []
+        for mention in mentions:
+            work_match = self.match(mention)
+            if work_match.canonical is None:
+                unmapped.append(work_match)
+                value = mention
+            else:
+                value = work_match.canonical
+            if value not in result:
+                result.append(value)
+        return result, unmapped
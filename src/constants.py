@@ -2,7 +2,6 @@ import os
 from dotenv import load_dotenv
 from utils import create_full_path
 
-
 load_dotenv()
 
 
@@ -15,6 +14,12 @@ class Directories:
 
     AUDIOFILES_ROOT = os.path.join(APP_DATA, "audiofiles")
 
+    RUNS = os.path.join(APP_DATA, "runs")
+
+    TRANSCRIPT_CACHE = os.path.join(APP_DATA, "transcript_cache")
+
+    RESULTS = os.path.join(APP_DATA, "results")
+
     ANALYSIS_STRATEGIES_ROOT = os.path.join(
         ROOT, "call_analysis", "analysis_strategies"
     )
@@ -31,10 +36,85 @@ class ConfigFiles:
 
     TOKEN_FILE = create_full_path(Directories.APP_DATA, "token.json")
 
+    # Phrase rules for the script-compliance fields
+    SCRIPT_RULES = create_full_path(Directories.APP_DATA, "script_rules.json")
+
+    # USD per 1M input (audio) / output tokens for each model
+    MODEL_PRICING = create_full_path(Directories.APP_DATA, "model_pricing.json")
+
+
+class SheetWriteModes:
+    # Every report is added as a new row
+    APPEND = "append"
+    # A call that already has a row (same TableConfig.UPSERT_KEY) gets it replaced
+    UPSERT = "upsert"
+
+
+class AnalysisModes:
+    # One multimodal request per call: transcription and evaluation together
+    SINGLE_PASS = "single"
+    # Cached transcription pass, then a text-only evaluation pass
+    TWO_PASS = "two_pass"
+
 
 class GeminiConfig:
     PROMPT = create_full_path(Directories.GEMINI_ROOT, "prompt_template.txt")
+    TRANSCRIPTION_PROMPT = create_full_path(
+        Directories.GEMINI_ROOT, "transcription_prompt.txt"
+    )
+    EVALUATION_PROMPT = create_full_path(
+        Directories.GEMINI_ROOT, "evaluation_prompt_template.txt"
+    )
+    ANALYSIS_MODE = os.getenv("GEMINI_ANALYSIS_MODE", AnalysisModes.SINGLE_PASS)
     MODEL = os.getenv("GEMINI_MODEL")
+    # Optional cheaper model for short calls; calls it fails on escalate to MODEL
+    FAST_MODEL = os.getenv("GEMINI_FAST_MODEL")
+    FAST_MODEL_MAX_DURATION = float(os.getenv("GEMINI_FAST_MODEL_MAX_DURATION", "120"))
+    FAST_MODEL_MAX_SIZE = int(
+        os.getenv("GEMINI_FAST_MODEL_MAX_SIZE", str(2 * 1024 * 1024))
+    )
+    # Single-pass mode: stream the response and validate it while it is generated
+    STREAMING = os.getenv("GEMINI_STREAMING", "false").lower() == "true"
+    # Attempts per call when the streamed output turns out malformed
+    STREAM_ATTEMPTS = int(os.getenv("GEMINI_STREAM_ATTEMPTS", "2"))
+
+
+class TokenBudgetConfig:
+    # Gemini token budgets; 0 means no limit. Requests are paced to fit both.
+    TOKENS_PER_MINUTE = int(os.getenv("GEMINI_TOKENS_PER_MINUTE", "0"))
+    TOKENS_PER_DAY = int(os.getenv("GEMINI_TOKENS_PER_DAY", "0"))
+    # Used for the estimate of a request before its actual usage is known
+    AUDIO_TOKENS_PER_SECOND = 32
+    OUTPUT_TOKENS = 2000
+    CHARS_PER_TOKEN = 4
+
+
+class HedgeConfig:
+    # Send a second request for calls slower than PERCENTILE of recent latencies
+    ENABLED = os.getenv("GEMINI_HEDGING", "false").lower() == "true"
+    PERCENTILE = float(os.getenv("GEMINI_HEDGE_PERCENTILE", "0.9"))
+    # At most this share of calls gets a second request
+    MAX_RATE = float(os.getenv("GEMINI_HEDGE_MAX_RATE", "0.1"))
+    # Latencies collected before hedging starts
+    MIN_SAMPLES = 20
+    # Shortest hedge delay, seconds
+    MIN_DELAY = 5.0
+
+
+class PreFilterConfig:
+    # Skip recordings not worth an analysis (missed calls, rings, silence)
+    ENABLED = os.getenv("PREFILTER_ENABLED", "false").lower() == "true"
+    # Shorter recordings are skipped (seconds)
+    MIN_DURATION = float(os.getenv("PREFILTER_MIN_DURATION", "10"))
+    # Share of frames with voice-level energy; 0 turns the check off
+    MIN_ACTIVE_RATIO = float(os.getenv("PREFILTER_MIN_ACTIVE_RATIO", "0.15"))
+    # MP3 frame gain that counts as voice
+    MIN_GLOBAL_GAIN = 165
+
+
+class TenantConfig:
+    # Gemini calls running at the same time across all tenants of a --tenants run
+    MAX_CONCURRENT_CALLS = int(os.getenv("TENANT_MAX_CONCURRENT_CALLS", "2"))
 
 
 class Constants:
@@ -42,6 +122,93 @@ class Constants:
     AUDIOFILES_FOLDER_ID = os.getenv("GOOGLE_DRIVE_AUDIOFILES_FOLDER_ID")
     SHEET_URL = os.getenv("TABLE_URL")
     TRANSCRIPTION_FOLDER_ID = os.getenv("GOOGLE_DRIVE_TRANSCRIPTION_FOLDER_ID")
+    ARCHIVE_FOLDER_ID = os.getenv("GOOGLE_DRIVE_ARCHIVE_FOLDER_ID")
+
+
+class ArchiveConfig:
+    # Move processed recordings out of the audio folder after all results are saved (opt-in)
+    ENABLED = os.getenv("ARCHIVE_PROCESSED_AUDIO", "false").lower() == "true"
+    # Used inside the audio folder if GOOGLE_DRIVE_ARCHIVE_FOLDER_ID is not set
+    DEFAULT_FOLDER_NAME = "Processed"
+    # Name format of the dated subfolders, e.g. "2025-10-16"
+    DATE_FORMAT = "%Y-%m-%d"
+
+
+class SummaryConfig:
+    # Tab of the spreadsheet with the per-manager / per-day aggregates
+    SHEET_TITLE = os.getenv("SUMMARY_SHEET_TITLE", "Summary")
+    # Running aggregates, updated incrementally by every run
+    STATE_FILE = create_full_path(Directories.APP_DATA, "aggregates.json")
+    # Days whose calls can still be replaced (e.g. re-scored); older days are closed
+    RETENTION_DAYS = int(os.getenv("SUMMARY_RETENTION_DAYS", "90"))
+
+
+class DedupConfig:
+    # Checksums of analyzed recordings, to find copies that arrive in later runs
+    INDEX_FILE = create_full_path(Directories.APP_DATA, "dedup_index.json")
+    RETENTION_DAYS = int(os.getenv("DEDUP_RETENTION_DAYS", "90"))
+
+
+class TranscriptModes:
+    # One "<name>_transcript.json" file per call
+    FILES = "files"
+    # One zip bundle per run with all transcripts and an index
+    BUNDLE = "bundle"
+
+
+class TranscriptConfig:
+    MODE = os.getenv("TRANSCRIPT_MODE", TranscriptModes.FILES)
+    # Name of the run's bundle, formatted with the run ID
+    BUNDLE_NAME = "transcripts_{run_id}.zip"
+
+
+class ResultSinkConfig:
+    # Also append the evaluated reports of each run to a local JSONL file
+    LOCAL_STORE = os.getenv("RESULTS_LOCAL_STORE", "false").lower() == "true"
+    LOCAL_STORE_FILE = "results_{run_id}.jsonl"
+    # Also POST the reports of each run as JSON to this URL
+    WEBHOOK_URL = os.getenv("RESULTS_WEBHOOK_URL")
+    WEBHOOK_TIMEOUT = 30
+
+
+class LoggingConfig:
+    LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    # "text" or "json" (one JSON object per line, with run_id / file_id)
+    FORMAT = os.getenv("LOG_FORMAT", "text")
+
+
+class TracingConfig:
+    # "none", "console", "file" or "otel" (OpenTelemetry API, configured by the environment)
+    EXPORTER = os.getenv("TRACING_EXPORTER", "none")
+    FILE = create_full_path(Directories.APP_DATA, "traces.jsonl")
+
+
+class MemoryProfilingConfig:
+    # tracemalloc + RSS reports per stage and per file; slows the run down
+    ENABLED = os.getenv("MEMORY_PROFILING", "false").lower() == "true"
+    # Allocation sites / files listed in the reports
+    TOP_SITES = int(os.getenv("MEMORY_PROFILING_TOP", "10"))
+
+
+class DownloadConfig:
+    # Files of this size (bytes) or larger are downloaded as concurrent byte ranges; 0 - off
+    RANGE_THRESHOLD = int(os.getenv("DRIVE_RANGE_THRESHOLD", "0"))
+    RANGE_SIZE = int(os.getenv("DRIVE_RANGE_SIZE", str(4 * 1024 * 1024)))
+    RANGE_WORKERS = int(os.getenv("DRIVE_RANGE_WORKERS", "4"))
+    # Attempts per range before the download of the file fails
+    RANGE_ATTEMPTS = 3
+
+
+class ClientPoolConfig:
+    # Timeout (seconds) for a single HTTP request to Google APIs
+    HTTP_TIMEOUT = 120
+    # Timeout (seconds) for a single Gemini request; an abandoned (hedged) request
+    # holds its worker thread until then
+    GEMINI_TIMEOUT = float(os.getenv("GEMINI_REQUEST_TIMEOUT", "600"))
+    # Keep-alive connections kept per thread-local client
+    MAX_CONNECTIONS = 10
+    # Refresh the access token this many seconds before it expires
+    TOKEN_REFRESH_MARGIN = 300
 
 
 class Scopes:
@@ -75,3 +242,7 @@ class TableConfig:
     NEGATIVE_COMMENT = "is_comment_negative"
     CELL_TO_COLOR = "comment"
     TOTAL_SCORE = "total_score"
+    # "append" or "upsert", see SheetWriteModes
+    WRITE_MODE = os.getenv("SHEET_WRITE_MODE", "append")
+    # Field (a mapped column) that identifies a call's row in the upsert mode
+    UPSERT_KEY = "source_file_name"
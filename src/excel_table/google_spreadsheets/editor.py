@@ -1,107 +1,147 @@
 import logging
 import json
 from call_analysis.analysis_strategies.gemini.output_schema import CallAnalysisResult
-from typing import Optional, Any
+from typing import Optional, Any, Callable, get_origin
+from pydantic import BaseModel
 from gspread.client import Client
-from gspread.utils import column_letter_to_index
+from gspread.exceptions import WorksheetNotFound
+from gspread.utils import column_letter_to_index, rowcol_to_a1
 import gspread_formatting as gsf
 from gspread.worksheet import Worksheet
 from constants import ConfigFiles
-from utils import configure_logging
+from utils import get_start_end_row
+from tracing import start_span
 
-configure_logging()
 logger = logging.getLogger(__name__)
 
 
+def _value_to_cell(value: Any) -> str:
+    """Converts any value to a string suitable for the cell."""
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    elif isinstance(value, list):
+        return ", ".join(map(str, value))
+    elif value is None:
+        return ""
+    return str(value)
+
+
+def _bool_to_cell(value: Any) -> str:
+    if value is None or value == "":
+        return ""
+    return "1" if value else "0"
+
+
+def _list_to_cell(value: Any) -> str:
+    if not value:
+        return ""
+    if isinstance(value, list):
+        return ", ".join(map(str, value))
+    return str(value)
+
+
+def _select_converter(field: str) -> Callable[[Any], str]:
+    """
+    Picks a cell converter based on the field's type in CallAnalysisResult.
+    Fields that are not part of the schema use the generic converter.
+    """
+    field_info = CallAnalysisResult.model_fields.get(field)
+    if field_info is None:
+        return _value_to_cell
+
+    annotation = field_info.annotation
+    if annotation is bool:
+        return _bool_to_cell
+    if get_origin(annotation) is list:
+        return _list_to_cell
+    return _value_to_cell
+
+
 class GoogleSheetEditor:
     def __init__(self, client: Client, worksheet: Worksheet):
         self.client = client
         self.mapping = {}
+        self._row_plan = ()
+        self._row_width = 0
+        # (first, last + 1) column indexes of each run of adjacent mapped columns
+        self._mapped_spans = ()
+        # key -> row number of the upsert mode, read from the sheet once
+        self._row_index: Optional[dict[str, int]] = None
         self.worksheet = worksheet
         logger.info("Authenticated with Google Sheets.")
 
     def load_mapping(self, mapping_path: str = ConfigFiles.COLUMN_MAPPING):
         with open(mapping_path, "r", encoding="utf-8") as f:
             self.mapping = json.load(f)
+        self._compile_mapping()
         logger.info(f"Column mapping loaded from {mapping_path}.")
 
-    def prepare_row_data(self, data: CallAnalysisResult) -> list:
-        """
-        **THIS IS AN AUXILIARY FUNCTION - THE BRAIN OF THE CLASS.**
-        Converts a Pydantic object into a simple list, ready to be written to a table row.
+    def _compile_mapping(self):
         """
-        if not self.mapping:
-            raise ValueError(
-                "Column map is not loaded. Call load_mapping() before writing."
-            )
-
-        # 1. Find the rightmost column from the map (e.g., 'U') to create a row of the correct length.
-        max_col_num = 0
-        for col_letter in self.mapping.values():
-            col_num = column_letter_to_index(col_letter)
-            if col_num > max_col_num:
-                max_col_num = col_num
-
-        # 2. Create an empty row (a list of empty strings) of the required length.
-        row = [""] * max_col_num
+        Compiles the column mapping into an index plan once, so that building
+        a row no longer re-parses column letters or rescans the mapping.
 
-        # 3. Fill this row with data from the Pydantic object.
+        The plan is a tuple of (field, column index, converter) entries,
+        and the row width is the index of the rightmost mapped column + 1.
+        Adjacent mapped columns are also grouped into spans, so that replacing
+        a row leaves the unmapped columns (e.g. manual notes) untouched.
+        """
+        plan = []
         for field, col_letter in self.mapping.items():
             # Get the column index (A=0, B=1, ...)
             col_index = column_letter_to_index(col_letter) - 1
-            # Get the field value from the Pydantic object (e.g., data.call_type)
-            value = getattr(data, field, "")
-
-            # 4. Convert the value to a string suitable for the cell.
-            if isinstance(value, bool):
-                row[col_index] = "1" if value else "0"
-            elif isinstance(value, list):
-                row[col_index] = ", ".join(map(str, value))
-            elif value is None:
-                row[col_index] = ""
-            else:
-                row[col_index] = str(value)
+            converter = _select_converter(field)
+            plan.append((field, col_index, converter))
 
-        return row
+        self._row_plan = tuple(plan)
+        self._row_width = max((entry[1] for entry in plan), default=-1) + 1
 
-    def _prepare_row_data(self, data: dict[str, Any]) -> list:
-        """
-        [UPDATED] Accepts a dictionary (Dict) and converts it into a list (list),
-        ready to be written to a table row according to the mapping.
-        """
+        spans = []
+        for col_index in sorted({entry[1] for entry in plan}):
+            if spans and spans[-1][1] == col_index:
+                spans[-1][1] = col_index + 1
+            else:
+                spans.append([col_index, col_index + 1])
+        self._mapped_spans = tuple(tuple(span) for span in spans)
+
+    def _ensure_mapping_loaded(self):
         if not self.mapping:
             raise ValueError(
                 "Column map is not loaded. Call load_mapping() before writing."
             )
 
-        # 1. Find the rightmost column from the map.
-        max_col_num = 0
-        for col_letter in self.mapping.values():
-            col_num = column_letter_to_index(col_letter)
-            if col_num > max_col_num:
-                max_col_num = col_num
+    def _fill_row(self, row: list, values: Any):
+        """
+        The shared fast path for all row builders.
+        Fills a preallocated row with converted values according to the index plan.
+        """
+        for field, col_index, converter in self._row_plan:
+            row[col_index] = converter(values.get(field))
 
-        # 2. Create an empty row of the required length.
-        row = [""] * max_col_num
+    @staticmethod
+    def _get_values(report: Any) -> Any:
+        """
+        Returns a field -> value view of a report without copying it.
+        For Pydantic objects this is the instance's own field dictionary;
+        dicts and report records (anything with .get()) are used as is.
+        """
+        if isinstance(report, BaseModel):
+            return report.__dict__
+        return report
 
-        # 3. Fill the row with data from the dictionary.
-        for field, col_letter in self.mapping.items():
-            # Get the column index
-            col_index = column_letter_to_index(col_letter) - 1
-            # Get the field value from the dictionary.
-            value = data.get(field)
-
-            # 4. Convert the value to a string suitable for the cell.
-            if isinstance(value, bool):
-                row[col_index] = "1" if value else "0"
-            elif isinstance(value, list):
-                row[col_index] = ", ".join(map(str, value))
-            elif value is None:
-                row[col_index] = ""
-            else:
-                row[col_index] = str(value)
+    def prepare_rows(self, reports: list) -> list[list[str]]:
+        """
+        Converts a batch of reports (Pydantic objects, dicts or report records
+        exposing .get()) into table rows.
+        The whole 2-D row buffer is allocated up front and then filled in place.
+        """
+        self._ensure_mapping_loaded()
 
-        return row
+        rows = [[""] * self._row_width for _ in range(len(reports))]
+        for row, report in zip(rows, reports):
+            self._fill_row(row, self._get_values(report))
+
+        return rows
 
     def write_rows(
         self,
@@ -110,10 +150,12 @@ class GoogleSheetEditor:
         sheet_name: Optional[str] = None,
     ):
         logger.debug("Using 'append_rows' method.")
-        logger.debug(f"Rows to add: {rows_to_add}")
+        # Lazy %-style arguments: the rows are only formatted if DEBUG is enabled
+        logger.debug("Rows to add: %s", rows_to_add)
         try:
-            response = self.worksheet.append_rows(rows_to_add)
-            logger.debug(f"Rows addition response: {response}")
+            with start_span("sheet.write_rows", rows=len(rows_to_add)):
+                response = self.worksheet.append_rows(rows_to_add)
+            logger.debug("Rows addition response: %s", response)
 
             logger.info(f"All of the rows have been written successfully.")
             return response
@@ -121,6 +163,177 @@ class GoogleSheetEditor:
             logger.error(f" (write_rows) An error occurred: {e}")
             return None
 
+    def _load_row_index(self, key_field: str) -> dict[str, int]:
+        """
+        Reads the key column once and returns key -> row number (1-based).
+        If a key occurs more than once, its first row is used.
+        """
+        col_letter = self.mapping.get(key_field)
+        if not col_letter:
+            raise ValueError(f"Key field '{key_field}' is not in the column mapping.")
+
+        values = self.worksheet.col_values(column_letter_to_index(col_letter))
+        row_index = {}
+        for row_number, value in enumerate(values, start=1):
+            if value:
+                row_index.setdefault(str(value), row_number)
+
+        logger.info(f"Loaded {len(row_index)} existing keys from column {col_letter}.")
+        return row_index
+
+    def upsert_rows(
+        self, rows_to_write: list[list[str]], key_field: str
+    ) -> Optional[list[int]]:
+        """
+        Replaces the rows whose key is already in the sheet and appends the rest.
+        Only the mapped cells of an existing row are replaced; its other columns are kept.
+
+        The key column is read only on the first call (the index is then kept
+        up to date in memory), and each call makes at most two writes:
+        one append_rows for the new rows and then one batch_update for the
+        existing ones. If the update fails after the append, the new rows are
+        already indexed, so retrying the same rows replaces them instead of
+        appending them again.
+
+        Args:
+            rows_to_write: Rows built by prepare_rows().
+            key_field: Mapped field that identifies a row, e.g. "source_file_name".
+
+        Returns:
+            The sheet row number of each input row, or None on error.
+        """
+        self._ensure_mapping_loaded()
+
+        try:
+            with start_span("sheet.upsert_rows", rows=len(rows_to_write)) as span:
+                if self._row_index is None:
+                    self._row_index = self._load_row_index(key_field)
+                key_col = column_letter_to_index(self.mapping[key_field]) - 1
+
+                row_numbers: list[Optional[int]] = [None] * len(rows_to_write)
+                updates = []
+                new_rows = []
+                # position in new_rows of each new key, so a key repeated
+                # within the batch still gets a single row
+                new_positions: dict[str, int] = {}
+                appended = []  # (input position, position in new_rows)
+
+                for position, row in enumerate(rows_to_write):
+                    key = row[key_col]
+                    row_number = self._row_index.get(key) if key else None
+                    if row_number:
+                        for start, end in self._mapped_spans:
+                            first = rowcol_to_a1(row_number, start + 1)
+                            last = rowcol_to_a1(row_number, end)
+                            updates.append(
+                                {"range": f"{first}:{last}", "values": [row[start:end]]}
+                            )
+                        row_numbers[position] = row_number
+                    elif key and key in new_positions:
+                        new_rows[new_positions[key]] = row
+                        appended.append((position, new_positions[key]))
+                    else:
+                        if key:
+                            new_positions[key] = len(new_rows)
+                        appended.append((position, len(new_rows)))
+                        new_rows.append(row)
+
+                replaced = len(rows_to_write) - len(appended)
+                span.set_attribute("updated", replaced)
+                span.set_attribute("appended", len(new_rows))
+
+                if new_rows:
+                    response = self.worksheet.append_rows(new_rows)
+                    updated_range = response.get("updates", {}).get("updatedRange")
+                    start_row, _ = get_start_end_row(updated_range)
+                    for position, new_position in appended:
+                        row_numbers[position] = start_row + new_position
+                    for key, new_position in new_positions.items():
+                        self._row_index[key] = start_row + new_position
+
+                if updates:
+                    try:
+                        self.worksheet.batch_update(updates)
+                    except Exception as e:
+                        logger.error(
+                            f" (upsert_rows) {len(new_rows)} new rows were appended, "
+                            f"but replacing {replaced} existing rows failed: {e}"
+                        )
+                        return None
+
+            logger.info(
+                f"Upserted rows: {replaced} replaced, {len(new_rows)} appended."
+            )
+            return row_numbers
+        except Exception as e:
+            logger.error(f" (upsert_rows) An error occurred: {e}")
+            return None
+
+    @staticmethod
+    def _table_cell(value: Any) -> dict:
+        """Converts a value to the CellData of a spreadsheets.batchUpdate request."""
+        if value is None:
+            return {}
+        if isinstance(value, bool):
+            return {"userEnteredValue": {"boolValue": value}}
+        if isinstance(value, (int, float)):
+            return {"userEnteredValue": {"numberValue": value}}
+        return {"userEnteredValue": {"stringValue": str(value)}}
+
+    def write_table(self, worksheet_title: str, rows: list[list]) -> bool:
+        """
+        Writes a whole table to another tab of the same spreadsheet (created
+        if missing) and trims the tab to the table's shape, in a single batch
+        request: rows and columns of an earlier, larger table don't stay behind.
+        """
+        spreadsheet = self.worksheet.spreadsheet
+        row_count = max(len(rows), 1)
+        column_count = max((len(row) for row in rows), default=1)
+        try:
+            try:
+                worksheet = spreadsheet.worksheet(worksheet_title)
+            except WorksheetNotFound:
+                logger.info(f"Creating worksheet '{worksheet_title}'...")
+                worksheet = spreadsheet.add_worksheet(
+                    title=worksheet_title, rows=row_count, cols=column_count
+                )
+
+            # Cells past the end of a short row are cleared too
+            table_rows = [
+                {
+                    "values": [
+                        self._table_cell(value)
+                        for value in row + [None] * (column_count - len(row))
+                    ]
+                }
+                for row in rows
+            ]
+            resize = {
+                "updateSheetProperties": {
+                    "properties": {
+                        "sheetId": worksheet.id,
+                        "gridProperties": {
+                            "rowCount": row_count,
+                            "columnCount": column_count,
+                        },
+                    },
+                    "fields": "gridProperties(rowCount,columnCount)",
+                }
+            }
+            write = {
+                "updateCells": {
+                    "start": {"sheetId": worksheet.id, "rowIndex": 0, "columnIndex": 0},
+                    "rows": table_rows,
+                    "fields": "userEnteredValue",
+                }
+            }
+            spreadsheet.batch_update({"requests": [resize, write]})
+            logger.info(f"Wrote {len(rows)} rows to worksheet '{worksheet_title}'.")
+            return True
+        except Exception as e:
+            logger.error(f" (write_table) An error occurred: {e}")
+            return False
+
     def color_cell(self, row: int, col_letter: str, red: int, green: int, blue: int):
         cell_range = f"{col_letter}{row}"
         self._color_cell_background(cell_range, red, green, blue)
@@ -0,0 +1,122 @@
+import logging
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+from google_drive.file_searcher import FileSearcher
+from google_drive.file_uploader import FileUploader
+from constants import ArchiveConfig
+
+logger = logging.getLogger(__name__)
+
+
+class AudioArchiver:
+    """
+    Finalization stage: moves processed recordings out of the audio (inbox)
+    folder into dated archive subfolders, so the inbox only holds the
+    unprocessed backlog and listing it stays proportional to new files.
+
+    A recording goes to the folder of the day it was recorded, so a run
+    over a backlog of several days fills several folders. The missing
+    folders are looked up and created with one batch request each.
+    """
+
+    def __init__(
+        self,
+        searcher: FileSearcher,
+        uploader: FileUploader,
+        archive_root_id: str,
+        date_format: str = ArchiveConfig.DATE_FORMAT,
+    ):
+        self._searcher = searcher
+        self._uploader = uploader
+        self._archive_root_id = archive_root_id
+        self._date_format = date_format
+        # date folder name -> folder ID
+        self._dated_folders: Dict[str, str] = {}
+
+    def _get_dated_folder_ids(self, folder_names: Iterable[str]) -> Dict[str, str]:
+        """
+        Finds or creates the archive subfolders with the given names.
+
+        Returns:
+            folder name -> folder ID, for the folders that are available.
+        """
+        missing_names = sorted(set(folder_names) - self._dated_folders.keys())
+        if missing_names:
+            found = self._searcher.get_folder_ids(
+                missing_names, parent_id=self._archive_root_id
+            )
+            # A folder whose lookup failed isn't created, so it can't be duplicated
+            names_to_create = [
+                name for name, folder_id in found.items() if not folder_id
+            ]
+            if names_to_create:
+                logger.info(f"Creating archive folders {names_to_create}...")
+                found.update(
+                    self._uploader.create_folders(
+                        names_to_create, parent_folder_id=self._archive_root_id
+                    )
+                )
+            self._dated_folders.update(
+                {name: folder_id for name, folder_id in found.items() if folder_id}
+            )
+
+        return {
+            name: self._dated_folders[name]
+            for name in folder_names
+            if name in self._dated_folders
+        }
+
+    def archive_files(
+        self,
+        file_ids: List[str],
+        inbox_folder_id: str,
+        days_by_file_id: Optional[Dict[str, str]] = None,
+    ) -> List[str]:
+        """
+        Moves the files from the inbox folder into the dated archive folders.
+        Should be called only after every result sink has confirmed the files.
+
+        Args:
+            days_by_file_id: file ID -> day the call was recorded ("YYYY-MM-DD").
+                             Files without a day are archived under today.
+
+        Returns:
+            IDs of the files that were moved.
+        """
+        file_ids = [file_id for file_id in file_ids if file_id]
+        if not file_ids:
+            logger.info("No processed files to archive.")
+            return []
+
+        days_by_file_id = days_by_file_id or {}
+        today = date.today()
+        file_ids_by_folder: Dict[str, List[str]] = {}
+        for file_id in file_ids:
+            day = days_by_file_id.get(file_id)
+            folder_name = (date.fromisoformat(day) if day else today).strftime(
+                self._date_format
+            )
+            file_ids_by_folder.setdefault(folder_name, []).append(file_id)
+
+        folder_ids = self._get_dated_folder_ids(file_ids_by_folder)
+
+        archived_ids = []
+        for folder_name, folder_file_ids in file_ids_by_folder.items():
+            folder_id = folder_ids.get(folder_name)
+            if not folder_id:
+                logger.error(
+                    f"Archive folder '{folder_name}' is not available. "
+                    f"{len(folder_file_ids)} files stay in the inbox."
+                )
+                continue
+
+            result = self._uploader.move_files(
+                folder_file_ids,
+                target_folder_id=folder_id,
+                source_folder_id=inbox_folder_id,
+            )
+            for file_id, error in result.errors.items():
+                logger.error(f"Failed to archive file {file_id}: {error}")
+            archived_ids.extend(result.responses)
+
+        return archived_ids
@@ -1,38 +1,175 @@
+import contextvars
 import logging
 import io
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Optional
 from googleapiclient.errors import HttpError
 from googleapiclient.http import MediaIoBaseDownload
-from utils import configure_logging
+from tracing import start_span
 
-configure_logging()
 logger = logging.getLogger(__name__)
 
 
 class AudioDownloader:
-    def __init__(self, service):
+    def __init__(
+        self,
+        service,
+        service_factory: Optional[Callable] = None,
+        range_threshold: int = 0,
+        range_size: int = 4 * 1024 * 1024,
+        max_workers: int = 4,
+        range_attempts: int = 3,
+    ):
+        """
+        Args:
+            service: Drive service of the calling thread.
+            service_factory: Returns the Drive service of the calling thread
+                             (e.g. GoogleClientPool.drive). Needed for ranged
+                             downloads, since a service can't be shared by threads.
+            range_threshold: Files of this size (bytes) or larger are downloaded
+                             as concurrent byte ranges; 0 turns ranged downloads off.
+            range_size: Size of one range (bytes).
+            max_workers: Ranges downloaded at the same time.
+            range_attempts: Attempts per range before the download fails.
+        """
         self.service = service
+        self._service_factory = service_factory
+        self._range_threshold = range_threshold if service_factory else 0
+        self._range_size = max(range_size, 256 * 1024)
+        self._max_workers = max(max_workers, 1)
+        self._range_attempts = max(range_attempts, 1)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
 
-    def download_file_in_memory(self, file_id: str) -> bytes | None:
+    def download_file_in_memory(
+        self, file_id: str, size: Optional[int] = None
+    ) -> bytes | bytearray | None:
+        """
+        Args:
+            size: File size in bytes, if known (Drive lists it as a string).
+                  Large files are downloaded in ranges only when it is given.
+
+        Returns:
+            The file content (a bytearray for ranged downloads), or None on error.
+        """
         if not self.service:
             logger.error("Google Drive service is not initialized.")
             return None
+
+        size = int(size) if size else 0
+        if self._range_threshold and size >= self._range_threshold:
+            return self._download_ranges(file_id, size)
+
         try:
-            request = self.service.files().get_media(fileId=file_id)
-            file_io_base = io.BytesIO()
-            downloader = MediaIoBaseDownload(file_io_base, request)
-
-            done = False
-            while not done:
-                status, done = downloader.next_chunk()
-                logger.debug(
-                    f"  Downloading file {file_id}: {int(status.progress() * 100)}%."
-                )
+            with start_span("drive.download", file_id=file_id) as span:
+                request = self.service.files().get_media(fileId=file_id)
+                file_io_base = io.BytesIO()
+                downloader = MediaIoBaseDownload(file_io_base, request)
+
+                done = False
+                while not done:
+                    status, done = downloader.next_chunk()
+                    logger.debug(
+                        "  Downloading file %s: %d%%.",
+                        file_id,
+                        int(status.progress() * 100),
+                    )
+
+                audio_bytes = file_io_base.getvalue()
+                span.set_attribute("bytes", len(audio_bytes))
 
             logger.info(f"File {file_id} successfully downloaded in memory.")
-            return file_io_base.getvalue()
+            return audio_bytes
 
         except HttpError as error:
             logger.error(
                 f"Unexpected API error occurred while downloading file {file_id}: {error}"
             )
             return None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Kept for the whole run, so the workers reuse their Drive services
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers, thread_name_prefix="download"
+                )
+            return self._executor
+
+    def _download_range(self, file_id: str, start: int, end: int) -> bytes:
+        """
+        Downloads bytes [start, end] of the file with an HTTP Range request,
+        retrying the range on its own if it fails or comes back incomplete.
+        """
+        expected = end - start + 1
+        for attempt in range(1, self._range_attempts + 1):
+            try:
+                request = self._service_factory().files().get_media(fileId=file_id)
+                request.headers["Range"] = f"bytes={start}-{end}"
+                data = request.execute()
+                if len(data) == expected:
+                    return data
+                error = f"got {len(data)} of {expected} bytes"
+            except (HttpError, OSError) as e:
+                error = str(e)
+
+            if attempt < self._range_attempts:
+                logger.warning(
+                    f"Range {start}-{end} of file {file_id} failed ({error}). "
+                    f"Retrying ({attempt}/{self._range_attempts})..."
+                )
+                time.sleep(0.5 * 2 ** (attempt - 1))
+
+        raise IOError(
+            f"Range {start}-{end} failed after {self._range_attempts} attempts: {error}"
+        )
+
+    def _download_ranges(self, file_id: str, size: int) -> bytearray | None:
+        """
+        Downloads a large file as concurrent byte ranges into one
+        preallocated buffer, so the ranges are never joined.
+        """
+        buffer = bytearray(size)
+        view = memoryview(buffer)
+
+        def fetch(start: int):
+            end = min(start + self._range_size, size) - 1
+            view[start : end + 1] = self._download_range(file_id, start, end)
+
+        try:
+            with start_span(
+                "drive.download", file_id=file_id, bytes=size, ranged=True
+            ) as span:
+                executor = self._get_executor()
+                # The workers keep the log context and the span of the file
+                futures = [
+                    executor.submit(contextvars.copy_context().run, fetch, start)
+                    for start in range(0, size, self._range_size)
+                ]
+                span.set_attribute("ranges", len(futures))
+                try:
+                    for future in futures:
+                        future.result()
+                except (HttpError, OSError) as e:
+                    for future in futures:
+                        future.cancel()
+                    # The running ranges still write into the buffer
+                    wait(futures)
+                    logger.error(f"Failed to download file {file_id}: {e}")
+                    return None
+        finally:
+            view.release()
+
+        logger.info(
+            f"File {file_id} successfully downloaded in memory ({len(futures)} ranges)."
+        )
+        return buffer
+
+    def close(self):
+        """Stops the range download threads, if any were started."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
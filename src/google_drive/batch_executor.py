@@ -0,0 +1,100 @@
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict
+from googleapiclient.errors import HttpError
+
+logger = logging.getLogger(__name__)
+
+# Google Drive accepts at most 100 calls in a single batch request.
+DRIVE_BATCH_LIMIT = 100
+
+
+@dataclass
+class BatchResult:
+    """
+    Outcome of a batched call, mapped back to the caller's keys.
+
+    Attributes:
+        responses: key -> API response for every request that succeeded.
+        errors: key -> HttpError for every request that failed.
+    """
+
+    responses: Dict[str, Any] = field(default_factory=dict)
+    errors: Dict[str, HttpError] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+class DriveBatchExecutor:
+    """
+    Executes many independent Drive API requests over HTTP batch requests
+    (service.new_batch_http_request), splitting them into chunks of up
+    to the API limit. Each chunk costs a single HTTP round-trip.
+    """
+
+    def __init__(self, service, batch_size: int = DRIVE_BATCH_LIMIT):
+        if not service:
+            raise ValueError("Service object cannot be None.")
+        if not 0 < batch_size <= DRIVE_BATCH_LIMIT:
+            raise ValueError(
+                f"Batch size has to be in range of 1 to {DRIVE_BATCH_LIMIT}."
+            )
+        self.service = service
+        self._batch_size = batch_size
+
+    def execute(self, requests: Dict[str, Any]) -> BatchResult:
+        """
+        Executes the given requests in batches.
+
+        Args:
+            requests: key -> prepared (not executed) API request,
+                      e.g. {"file_id": service.files().get(fileId=file_id)}.
+                      Media uploads can't be batched.
+
+        Returns:
+            BatchResult with every key mapped to its response or its error.
+        """
+        result = BatchResult()
+        keys = list(requests)
+
+        for start in range(0, len(keys), self._batch_size):
+            chunk = keys[start : start + self._batch_size]
+            self._execute_chunk(chunk, requests, result)
+
+        if result.errors:
+            logger.warning(
+                f"Batch finished with {len(result.errors)} failed out of {len(keys)} requests."
+            )
+        else:
+            logger.debug(f"Batch of {len(keys)} requests finished successfully.")
+
+        return result
+
+    def _execute_chunk(
+        self, chunk: list, requests: Dict[str, Any], result: BatchResult
+    ):
+        # Batch request ids have to be unique strings, so we use positions
+        # and map them back to the caller's keys in the callback.
+        keys_by_request_id = {str(index): key for index, key in enumerate(chunk)}
+
+        def callback(request_id: str, response: Any, exception: Exception):
+            key = keys_by_request_id[request_id]
+            if exception is not None:
+                result.errors[key] = exception
+            else:
+                result.responses[key] = response
+
+        batch = self.service.new_batch_http_request(callback=callback)
+        for request_id, key in keys_by_request_id.items():
+            batch.add(requests[key], request_id=request_id)
+
+        try:
+            batch.execute()
+        except HttpError as error:
+            # The whole batch failed: every request in it gets the same error
+            logger.error(f"Batch request of {len(chunk)} calls failed: {error}")
+            for key in chunk:
+                if key not in result.responses:
+                    result.errors[key] = error
@@ -1,67 +1,95 @@
 import logging
-import os.path
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-from constants import ConfigFiles
+import json
+import threading
 from google.oauth2.credentials import Credentials as Oauth2credentials
-import gspread
-from utils import configure_logging
+from constants import ClientPoolConfig
 
-configure_logging()
 logger = logging.getLogger(__name__)
 
+# Client libraries are imported inside the factory methods: the Drive stack
+# is needed by every run, but gspread and requests only once there is
+# something to write.
+
 
 class GoogleComponentCreator:
-    def __init__(self):
-        pass
+    """
+    Builds Google API clients from already obtained credentials.
+    Authentication itself is handled by GoogleAuth.
+    """
+
+    # Parsed discovery documents, shared by every client built in this process
+    _discovery_docs: dict[tuple[str, str], dict] = {}
+    _discovery_lock = threading.Lock()
 
-    def authenticate_user(
+    def __init__(
         self,
-        scopes: list[str],
-        token_path: str = ConfigFiles.TOKEN_FILE,
-        client_secret_path: str = ConfigFiles.CLIENT_SECRET_FILE,
+        timeout: int = ClientPoolConfig.HTTP_TIMEOUT,
+        max_connections: int = ClientPoolConfig.MAX_CONNECTIONS,
     ):
+        self._timeout = timeout
+        self._max_connections = max_connections
+
+    @classmethod
+    def _get_discovery_doc(cls, service_name: str, version: str) -> dict:
+        """
+        Returns the discovery document bundled with googleapiclient
+        (static discovery), read and parsed only once per process.
         """
-        Performs user authentication via OAuth 2.0.
-        On first launch, it opens a browser to get permission
-        and creates a token.json file for subsequent launches.
+        key = (service_name, version)
+        with cls._discovery_lock:
+            if key not in cls._discovery_docs:
+                from googleapiclient.discovery_cache import get_static_doc
 
-        Returns:
-            An authorized credentials object for use with the API.
+                doc = get_static_doc(service_name, version)
+                if doc is None:
+                    raise ValueError(
+                        f"No static discovery document for {service_name} {version}."
+                    )
+                cls._discovery_docs[key] = json.loads(doc)
+            return cls._discovery_docs[key]
+
+    def create_authorized_http(self, credentials: Oauth2credentials):
+        """
+        Creates an authorized keep-alive httplib2 transport.
+        httplib2 is not thread-safe, so each thread needs its own instance.
         """
-        creds = None
-        # The token.json file stores the user's access and refresh tokens.
-        if os.path.exists(token_path):
-            creds = Credentials.from_authorized_user_file(token_path, scopes)
-
-        # If the credentials are invalid or missing, start the login process.
-        if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
-                logger.info("Refreshing expired token...")
-                creds.refresh(Request())
-            else:
-                logger.info("Starting user authentication process...")
-                # Use client_secret.json to start the authentication flow
-                flow = InstalledAppFlow.from_client_secrets_file(
-                    client_secret_path, scopes
-                )
-                # Starts a local server to get the authorization code
-                creds = flow.run_local_server(port=0)
-
-            # Save credentials to token.json for the next launch
-            with open(token_path, "w") as token:
-                token.write(creds.to_json())
-                logger.info(f"Credentials saved to file '{token_path}'.")
-
-        logger.info("User authentication successful.")
-        return creds
-
-    def create_gspread_client(self, user_credentials: Oauth2credentials):
-        gspread_client = gspread.authorize(user_credentials)
+        import httplib2
+        from google_auth_httplib2 import AuthorizedHttp
+
+        return AuthorizedHttp(credentials, http=httplib2.Http(timeout=self._timeout))
+
+    def create_authorized_session(self, credentials: Oauth2credentials):
+        """Creates a requests session with a pooled keep-alive adapter."""
+        from google.auth.transport.requests import AuthorizedSession
+        from requests.adapters import HTTPAdapter
+
+        session = AuthorizedSession(credentials)
+        adapter = HTTPAdapter(
+            pool_connections=self._max_connections,
+            pool_maxsize=self._max_connections,
+        )
+        session.mount("https://", adapter)
+        return session
+
+    def create_gspread_client(
+        self,
+        user_credentials: Oauth2credentials,
+        session=None,
+    ):
+        import gspread
+
+        if session is None:
+            session = self.create_authorized_session(user_credentials)
+        gspread_client = gspread.Client(auth=user_credentials, session=session)
+        gspread_client.set_timeout(self._timeout)
         return gspread_client
 
-    def create_drive_service(self, credentials: Oauth2credentials):
-        drive_service = build("drive", "v3", credentials=credentials)
+    def create_drive_service(self, credentials: Oauth2credentials, http=None):
+        from googleapiclient.discovery import build_from_document
+
+        if http is None:
+            http = self.create_authorized_http(credentials)
+        drive_service = build_from_document(
+            self._get_discovery_doc("drive", "v3"), http=http
+        )
         return drive_service
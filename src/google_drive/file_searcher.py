@@ -1,9 +1,8 @@
 import logging
 from googleapiclient.errors import HttpError
 from typing import List, Dict, Any, Optional
-from utils import configure_logging
+from google_drive.batch_executor import DriveBatchExecutor, BatchResult
 
-configure_logging()
 logger = logging.getLogger(__name__)
 
 
@@ -20,6 +19,7 @@ class FileSearcher:
         if not service:
             raise ValueError("Service object cannot be None.")
         self.service = service
+        self._batch_executor = DriveBatchExecutor(service)
 
     def _query_executor(self, **kwargs) -> Optional[Dict[str, Any]]:
         """
@@ -41,17 +41,29 @@ class FileSearcher:
             logger.error(f"An API error occurred with params {kwargs}: {error}")
             return None
 
-    def get_folder_id(self, folder_name: str) -> Optional[str]:
-        """
-        Finds the ID of a folder by its name.
-        """
-        # Define the specific parameters for this query
-        params = {
-            "q": f"mimeType='application/vnd.google-apps.folder' and name='{folder_name}' and trashed=false",
+    @staticmethod
+    def _folder_query_params(
+        folder_name: str, parent_id: Optional[str] = None
+    ) -> Dict[str, str]:
+        query = f"mimeType='application/vnd.google-apps.folder' and name='{folder_name}' and trashed=false"
+        if parent_id:
+            query += f" and '{parent_id}' in parents"
+        return {
+            "q": query,
             "fields": "files(id, name)",
             "spaces": "drive",
         }
 
+    def get_folder_id(
+        self, folder_name: str, parent_id: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Finds the ID of a folder by its name,
+        optionally only among the children of the given parent folder.
+        """
+        # Define the specific parameters for this query
+        params = self._folder_query_params(folder_name, parent_id)
+
         response = self._query_executor(**params)
 
         if response:
@@ -69,11 +81,11 @@ class FileSearcher:
 
     def list_files_in_folder(self, folder_id: str) -> List[Dict[str, str]]:
         """
-        Returns a simple list of .mp3 files (id and name) from a folder.
+        Returns a simple list of .mp3 files (id, name, md5Checksum, size and createdTime) from a folder.
         """
         params = {
             "q": f"'{folder_id}' in parents and mimeType='audio/mpeg' and trashed=false",
-            "fields": "files(id, name)",
+            "fields": "files(id, name, md5Checksum, size, createdTime)",
             "spaces": "drive",
         }
 
@@ -85,3 +97,46 @@ class FileSearcher:
             return files_list
 
         return []
+
+    def get_folder_ids(
+        self, folder_names: List[str], parent_id: Optional[str] = None
+    ) -> Dict[str, Optional[str]]:
+        """
+        Finds the IDs of several folders by their names using batch requests,
+        optionally only among the children of the given parent folder.
+
+        Returns:
+            folder name -> folder ID, or None if the folder wasn't found.
+            Names whose lookup failed are left out.
+        """
+        requests = {
+            name: self.service.files().list(
+                **self._folder_query_params(name, parent_id)
+            )
+            for name in folder_names
+        }
+        result = self._batch_executor.execute(requests)
+
+        for name, error in result.errors.items():
+            logger.error(f"Lookup of folder '{name}' failed: {error}")
+
+        folder_ids = {}
+        for name, response in result.responses.items():
+            files = response.get("files", [])
+            folder_ids[name] = files[0]["id"] if files else None
+        return folder_ids
+
+    def get_files_metadata(
+        self, file_ids: List[str], fields: str = "id, name, md5Checksum, size"
+    ) -> BatchResult:
+        """
+        Fetches metadata of many files using batch requests.
+
+        Returns:
+            BatchResult mapping each file ID to its metadata or its error.
+        """
+        requests = {
+            file_id: self.service.files().get(fileId=file_id, fields=fields)
+            for file_id in file_ids
+        }
+        return self._batch_executor.execute(requests)
@@ -3,18 +3,21 @@ import os
 import mimetypes
 from googleapiclient.errors import HttpError
 from googleapiclient.http import MediaFileUpload
-from typing import List, Optional, Any
-from utils import configure_logging
+from typing import List, Dict, Optional, Any
+from google_drive.batch_executor import DriveBatchExecutor, BatchResult
+from tracing import start_span
 
-configure_logging()
 logger = logging.getLogger(__name__)
 
+FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
+
 
 class FileUploader:
     def __init__(self, service: Any):
         if not service:
             raise ValueError("Service object cannot be None.")
         self.service = service
+        self._batch_executor = DriveBatchExecutor(service)
 
     def upload_file(
         self, local_file_path: str, folder_id: str, drive_filename: Optional[str] = None
@@ -37,15 +40,20 @@ class FileUploader:
             media = MediaFileUpload(local_file_path, mimetype=mimetype, resumable=True)
 
             # 3. Execute the request to create (upload) the file
-            uploaded_file = (
-                self.service.files()
-                .create(
-                    body=file_metadata,
-                    media_body=media,
-                    fields="id",  # Request only the ID in the response for efficiency
+            with start_span(
+                "drive.upload",
+                file_name=drive_filename,
+                bytes=os.path.getsize(local_file_path),
+            ):
+                uploaded_file = (
+                    self.service.files()
+                    .create(
+                        body=file_metadata,
+                        media_body=media,
+                        fields="id",  # Request only the ID in the response for efficiency
+                    )
+                    .execute()
                 )
-                .execute()
-            )
 
             file_id = uploaded_file.get("id")
             logger.info(f"File '{drive_filename}' successfully uploaded. ID: {file_id}")
@@ -83,3 +91,90 @@ class FileUploader:
             f"Upload complete. Successfully uploaded {len(uploaded_ids)} out of {len(local_file_paths)} files."
         )
         return uploaded_ids
+
+    def create_folder(self, folder_name: str, parent_folder_id: str) -> Optional[str]:
+        """
+        Creates a folder inside the parent folder.
+
+        Returns:
+            ID of the created folder, or None if its creation failed.
+        """
+        try:
+            folder = (
+                self.service.files()
+                .create(
+                    body={
+                        "name": folder_name,
+                        "mimeType": FOLDER_MIME_TYPE,
+                        "parents": [parent_folder_id],
+                    },
+                    fields="id",
+                )
+                .execute()
+            )
+        except HttpError as error:
+            logger.error(
+                f"An API error occurred while creating folder '{folder_name}': {error}"
+            )
+            return None
+
+        logger.info(f"Folder '{folder_name}' created in {parent_folder_id}.")
+        return folder.get("id")
+
+    def create_folders(
+        self, folder_names: List[str], parent_folder_id: str
+    ) -> Dict[str, Optional[str]]:
+        """
+        Creates several folders inside the parent folder using batch requests.
+
+        Returns:
+            folder name -> ID of the created folder, or None if its creation failed.
+        """
+        requests = {
+            name: self.service.files().create(
+                body={
+                    "name": name,
+                    "mimeType": FOLDER_MIME_TYPE,
+                    "parents": [parent_folder_id],
+                },
+                fields="id",
+            )
+            for name in folder_names
+        }
+        result = self._batch_executor.execute(requests)
+
+        for name, error in result.errors.items():
+            logger.error(
+                f"An API error occurred while creating folder '{name}': {error}"
+            )
+
+        logger.info(
+            f"Created {len(result.responses)} out of {len(folder_names)} folders in {parent_folder_id}."
+        )
+        return {name: result.responses.get(name, {}).get("id") for name in folder_names}
+
+    def move_files(
+        self, file_ids: List[str], target_folder_id: str, source_folder_id: str
+    ) -> BatchResult:
+        """
+        Moves files from one folder to another by changing their parents,
+        using batch requests.
+
+        Returns:
+            BatchResult mapping each file ID to its response or its error.
+        """
+        requests = {
+            file_id: self.service.files().update(
+                fileId=file_id,
+                addParents=target_folder_id,
+                removeParents=source_folder_id,
+                fields="id, parents",
+            )
+            for file_id in file_ids
+        }
+        result = self._batch_executor.execute(requests)
+
+        logger.info(
+            f"Moved {len(result.responses)} out of {len(file_ids)} files to folder {target_folder_id}."
+        )
+        return result
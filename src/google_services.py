@@ -1,45 +1,45 @@
 import logging
 import os.path
+import threading
+from datetime import datetime, timezone
+from typing import Optional
 from google.oauth2.credentials import Credentials
-from google.auth.transport.requests import Request
-from google_auth_oauthlib.flow import InstalledAppFlow
-from constants import ConfigFiles
+from constants import ConfigFiles, ClientPoolConfig
 from google_drive.components_creator import GoogleComponentCreator
-from utils import configure_logging
 
-configure_logging()
 logger = logging.getLogger(__name__)
 
+# Heavy client libraries (google.genai, httpx, requests, oauthlib) are imported
+# inside the methods that need them, so that a run which finds no new files
+# never pays for importing them.
+
 
 class GoogleServicesProvider:
     def __init__(self, scopes: list[str]):
         self._scopes = scopes
         self._auth = GoogleAuth(scopes=self._scopes)
-        self._creator = GoogleComponentCreator()
-        self.drive_service = None
-        self.gspread_client = None
+        self.pool = GoogleClientPool(auth=self._auth)
 
     def get_clients(self) -> tuple:
+        """
+        Returns the Drive service and gspread client for the calling thread.
+        The pool keeps one client of each kind per thread, so tenants running
+        in separate threads never share a (not thread-safe) HTTP connection.
+        """
+        return self.get_drive_service(), self.pool.gspread()
 
-        if self.drive_service and self.gspread_client:
-            logger.info("Returning cached Google clients.")
-            return self.drive_service, self.gspread_client
-
-        logger.info("Setting up Google clients...")
-
-        user_credentials = self._auth.get_credentials()
-
-        logger.info("Creating Google Drive service...")
-        self.drive_service = self._creator.create_drive_service(
-            credentials=user_credentials
-        )
-        logger.info("Google Drive service is ready.")
+    def get_drive_service(self):
+        """
+        Returns only the Drive service - enough for the cheap listing check,
+        without building (and importing) the Sheets client.
+        """
+        return self.pool.drive()
 
-        logger.info("Creating gspread client...")
-        self.gspread_client = self._creator.create_gspread_client(user_credentials)
-        logger.info("gspread client is ready.")
+    def get_gemini_client(self) -> "GeminiClient":
+        return self.pool.gemini()
 
-        return self.drive_service, self.gspread_client
+    def close(self):
+        self.pool.close()
 
 
 class GoogleAuth:
@@ -74,12 +74,16 @@ class GoogleAuth:
         # If credentials are not valid or are missing, start the login process.
         if not creds or not creds.valid:
             if creds and creds.expired and creds.refresh_token:
+                from google.auth.transport.requests import Request
+
                 logger.info("Refreshing expired token...")
                 creds.refresh(Request())
             else:
+                from google_auth_oauthlib.flow import InstalledAppFlow
+
                 logger.info("Starting user authentication process...")
                 # Use client_secret.json to start the authentication flow
-                flow = InstalledAppFlow.from_authorized_user_file(
+                flow = InstalledAppFlow.from_client_secrets_file(
                     self._client_secret_path, self._scopes
                 )
                 # Starts a local server to receive the authorization code
@@ -99,3 +103,165 @@ class GoogleAuth:
         # _authenticate_user already handles getting, refreshing AND saving
         creds = self._authenticate_user()
         return creds
+
+    def refresh_credentials(self, creds: Credentials):
+        """
+        Refreshes the access token in place and saves it for the next runs.
+        """
+        from google.auth.transport.requests import Request
+
+        creds.refresh(Request())
+        self._save_credentials(creds)
+
+
+class CredentialsRefresher:
+    """
+    Background daemon thread that refreshes the shared credentials
+    shortly before they expire, so that no API request has to refresh
+    the token itself in the critical path.
+    """
+
+    def __init__(
+        self,
+        auth: GoogleAuth,
+        credentials: Credentials,
+        margin: int = ClientPoolConfig.TOKEN_REFRESH_MARGIN,
+        retry_interval: int = 30,
+    ):
+        self._auth = auth
+        self._credentials = credentials
+        self._margin = margin
+        self._retry_interval = retry_interval
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="credentials-refresher", daemon=True
+        )
+        self._thread.start()
+        logger.debug("Credentials refresher started.")
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _seconds_until_refresh(self) -> float:
+        expiry = self._credentials.expiry
+        if expiry is None:
+            # The token has no known expiry - check again later
+            return float(self._margin)
+        # google-auth keeps 'expiry' as a naive UTC datetime
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return (expiry - now).total_seconds() - self._margin
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            delay = self._seconds_until_refresh()
+            if delay > 0:
+                self._stop_event.wait(delay)
+                continue
+
+            try:
+                logger.info("Refreshing access token in the background...")
+                self._auth.refresh_credentials(self._credentials)
+            except Exception as e:
+                logger.error(f"Background token refresh failed: {e}")
+                self._stop_event.wait(self._retry_interval)
+
+
+class GoogleClientPool:
+    """
+    Hands out thread-local Drive, Sheets and Gemini clients.
+
+    All clients share one set of credentials, kept fresh by a
+    CredentialsRefresher. Each thread gets its own keep-alive transport,
+    because httplib2 (used by googleapiclient) is not thread-safe.
+    """
+
+    def __init__(
+        self,
+        auth: GoogleAuth,
+        creator: Optional[GoogleComponentCreator] = None,
+        max_connections: int = ClientPoolConfig.MAX_CONNECTIONS,
+        gemini_timeout: float = ClientPoolConfig.GEMINI_TIMEOUT,
+    ):
+        self._auth = auth
+        self._creator = creator or GoogleComponentCreator()
+        self._max_connections = max_connections
+        self._gemini_timeout = gemini_timeout
+        self._credentials: Optional[Credentials] = None
+        self._refresher: Optional[CredentialsRefresher] = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def credentials(self) -> Credentials:
+        """Authenticates once per process and starts the background refresher."""
+        with self._lock:
+            if self._credentials is None:
+                self._credentials = self._auth.get_credentials()
+                self._refresher = CredentialsRefresher(self._auth, self._credentials)
+                self._refresher.start()
+            return self._credentials
+
+    def drive(self):
+        """Returns the Drive v3 service of the calling thread."""
+        service = getattr(self._local, "drive", None)
+        if service is None:
+            service = self._creator.create_drive_service(self.credentials)
+            self._local.drive = service
+            logger.debug(
+                f"Drive service created for {threading.current_thread().name}."
+            )
+        return service
+
+    def gspread(self):
+        """Returns the gspread client of the calling thread."""
+        client = getattr(self._local, "gspread", None)
+        if client is None:
+            client = self._creator.create_gspread_client(self.credentials)
+            self._local.gspread = client
+            logger.debug(
+                f"gspread client created for {threading.current_thread().name}."
+            )
+        return client
+
+    def gemini(self) -> "GeminiClient":
+        """
+        Returns the Gemini client of the calling thread.
+        The API key is read from the environment (GEMINI_API_KEY).
+        """
+        client = getattr(self._local, "gemini", None)
+        if client is None:
+            import httpx
+            from google.genai import Client as GeminiClient, types
+
+            http_options = types.HttpOptions(
+                # Milliseconds
+                timeout=int(self._gemini_timeout * 1000),
+                client_args={
+                    "limits": httpx.Limits(
+                        max_connections=self._max_connections,
+                        max_keepalive_connections=self._max_connections,
+                    )
+                },
+            )
+            client = GeminiClient(http_options=http_options)
+            self._local.gemini = client
+            logger.debug(
+                f"Gemini client created for {threading.current_thread().name}."
+            )
+        return client
+
+    def close(self):
+        """Stops the background token refresher."""
+        with self._lock:
+            if self._refresher:
+                self._refresher.stop()
+                self._refresher = None
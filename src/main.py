@@ -1,114 +1,515 @@
 import logging
-from google.genai import Client
-
-from utils import configure_logging
-from constants import Scopes, Constants, ConfigFiles, GeminiConfig, Directories
-from google_services import GoogleServicesProvider
-from excel_table.google_spreadsheets.editor import GoogleSheetEditor
-from google_drive.audio_downloader import AudioDownloader
-from google_drive.file_searcher import FileSearcher
-from google_drive.file_uploader import FileUploader
-from call_analysis.analysis_strategies.gemini.gemini_strategy import (
-    GeminiAnalysisStrategy,
+import argparse
+from typing import Optional
+
+from app_logging import configure_logging, log_context
+from tracing import configure_tracing
+from memory_profiling import (
+    configure_memory_profiling,
+    disable_file_memory_tracking,
+    memory_snapshot,
+    stop_memory_profiling,
 )
-from call_analysis.analysis_strategies.analysis_processor import (
-    CallAnalyzer,
-    ReportEvaluator,
+from constants import (
+    Scopes,
+    ConfigFiles,
+    GeminiConfig,
+    Directories,
+    ArchiveConfig,
+    AnalysisModes,
+    LoggingConfig,
+    TracingConfig,
+    MemoryProfilingConfig,
+    TokenBudgetConfig,
+    HedgeConfig,
+    PreFilterConfig,
+    ResultSinkConfig,
+    DownloadConfig,
+    TenantConfig,
+    TranscriptConfig,
+    TranscriptModes,
+    TableConfig,
+    SheetWriteModes,
 )
-from call_analysis.result_handlers import SheetResultHandler, TranscriptHandler
+from google_services import GoogleServicesProvider
+from google_drive.file_searcher import FileSearcher
+from tenants import Tenant, load_tenants
 
 logger = logging.getLogger(__name__)
 
+# Only the modules needed for the "anything new?" listing check are imported
+# at startup. Gemini, gspread and the Pydantic schemas are imported by the
+# stages that use them, so a cron run that finds no new files exits early
+# without loading them.
+
 
-def execute():
+def execute(
+    resume_run_id: str | None = None,
+    rescore: bool = False,
+    tenants_path: str | None = None,
+):
     logger.info("Starting analysis pipeline...")
+    tenants = load_tenants(tenants_path) if tenants_path else None
 
     # --- 1. Setup Google Services & Clients ---
-    gemini_client = Client()
     scopes = [Scopes.DRIVE]
 
     service_provider = GoogleServicesProvider(scopes)
+    try:
+        if rescore:
+            for tenant in tenants or [Tenant.from_env()]:
+                _rescore_pipeline(service_provider, tenant)
+        elif resume_run_id:
+            _resume_pipeline(service_provider, resume_run_id, tenants)
+        elif tenants:
+            _run_tenants(service_provider, tenants)
+        else:
+            _run_pipeline(service_provider, Tenant.from_env())
+    finally:
+        service_provider.close()
+        stop_memory_profiling()
+
+
+def _run_pipeline(
+    service_provider: GoogleServicesProvider,
+    tenant: Tenant,
+    analysis_strategy: Optional["BaseAnalysisStrategy"] = None,
+):
+    # --- 2. Cheap check: find the audio folder and list new files ---
+    drive_service = service_provider.get_drive_service()
+    searcher = FileSearcher(service=drive_service)
 
-    drive_service, gspread_client = service_provider.get_clients()
+    audio_folder_id = _find_audio_folder(searcher, tenant)
+    if not audio_folder_id:
+        return
 
-    spreadsheet = gspread_client.open_by_url(Constants.SHEET_URL)
-    worksheet = spreadsheet.sheet1
+    audio_files = searcher.list_files_in_folder(audio_folder_id)
 
-    # --- 2. Setup Core Components ---
-    searcher = FileSearcher(service=drive_service)
-    downloader = AudioDownloader(service=drive_service)
-    uploader = FileUploader(service=drive_service)
-    sheet_editor = GoogleSheetEditor(client=gspread_client, worksheet=worksheet)
-    sheet_editor.load_mapping(mapping_path=ConfigFiles.COLUMN_MAPPING)
+    if not audio_files:
+        logger.warning("No files for processing in the folder.")
+        return
 
-    # --- 3. Find Audio Files Folder ---
-    audio_folder_id = Constants.AUDIOFILES_FOLDER_ID
+    # --- 3. Analysis and writing: the heavy imports happen only from here on ---
+    from call_analysis.run_checkpoint import RunCheckpoint
 
-    if audio_folder_id:
-        logger.info(
-            f"Using direct folder ID from AUDIOFILES_FOLDER_ID: {audio_folder_id}"
+    checkpoint = RunCheckpoint(RunCheckpoint.new_run_id())
+    checkpoint.start(
+        audio_folder_id=audio_folder_id, audio_files=audio_files, tenant=tenant.name
+    )
+    logger.info(
+        f"Run ID: {checkpoint.run_id}. If the run fails, continue it with: --resume {checkpoint.run_id}"
+    )
+
+    with log_context(run_id=checkpoint.run_id):
+        _process_files(
+            service_provider, searcher, checkpoint, tenant, analysis_strategy
         )
-    else:
-        logger.warning(
-            "AUDIOFILES_FOLDER_ID is not set. Falling back to search by AUDIOFILES_FOLDER_NAME."
+
+
+def _run_tenants(service_provider: GoogleServicesProvider, tenants: list[Tenant]):
+    """
+    Runs the pipeline of every tenant in one process.
+
+    The tenants share the Google clients and the token budget; each one has
+    its own strategy and transcript cache. Each tenant runs in its own thread,
+    and a FairShareGate hands the Gemini calls out to them in weighted
+    round-robin order.
+    """
+    import contextvars
+    from concurrent.futures import ThreadPoolExecutor
+    from call_analysis.analysis_strategies.fair_share_strategy import (
+        FairShareGate,
+        current_tenant,
+    )
+    from call_analysis.transcript_cache import TranscriptCache
+
+    if len(tenants) > 1:
+        # tracemalloc has one process-wide peak, shared by the tenant threads
+        disable_file_memory_tracking("tenants run in parallel threads")
+
+    budget_scheduler = _create_token_budget_scheduler()
+    gate = FairShareGate(
+        {tenant.name: tenant.weight for tenant in tenants},
+        max_concurrent=TenantConfig.MAX_CONCURRENT_CALLS,
+    )
+
+    # The two-pass strategy writes to the transcript cache of its tenant
+    strategies = {
+        tenant.name: _create_analysis_strategy(
+            service_provider,
+            TranscriptCache(tenant.transcript_cache_dir),
+            criteria_path=tenant.criteria_path,
+            budget_scheduler=budget_scheduler,
+            gate=gate,
         )
+        for tenant in tenants
+    }
+
+    def run_tenant(tenant: Tenant):
+        logger.info(f"Starting tenant '{tenant.name}'...")
+        # The gate hands out the calls made in this thread (and its workers) to the tenant
+        current_tenant.set(tenant.name)
+        strategy = strategies[tenant.name]
+        try:
+            _run_pipeline(service_provider, tenant, analysis_strategy=strategy)
+        except Exception:
+            # One station's failure doesn't stop the others
+            logger.exception(f"Tenant '{tenant.name}' failed.")
+
+    with ThreadPoolExecutor(
+        max_workers=len(tenants), thread_name_prefix="tenant"
+    ) as executor:
+        futures = [
+            executor.submit(contextvars.copy_context().run, run_tenant, tenant)
+            for tenant in tenants
+        ]
+        for future in futures:
+            future.result()
+
+    logger.info(f"Gemini calls per tenant: {gate.served()}")
+    for strategy in strategies.values():
+        if hasattr(strategy, "log_stats"):
+            strategy.log_stats()
+        if hasattr(strategy, "close"):
+            strategy.close()
+
+
+def _resume_pipeline(
+    service_provider: GoogleServicesProvider,
+    run_id: str,
+    tenants: Optional[list[Tenant]] = None,
+):
+    """
+    Continues a checkpointed run from its first incomplete stage.
+    Calls that were already analyzed are not sent to Gemini again.
+    """
+    from call_analysis.run_checkpoint import RunCheckpoint, RunStages
+
+    checkpoint = RunCheckpoint(run_id)
+    if not checkpoint.exists():
+        logger.error(f"Process stopped: No checkpoint found for run '{run_id}'.")
+        return
 
-        folder_name = Constants.AUDIOFILES_FOLDER_NAME
-        if not folder_name:
+    logger.info(f"Resuming run {run_id}...")
+    checkpoint.load()
+
+    tenant = Tenant.from_env()
+    if checkpoint.tenant and checkpoint.tenant != tenant.name:
+        tenant = next(
+            (item for item in tenants or [] if item.name == checkpoint.tenant), None
+        )
+        if tenant is None:
             logger.error(
-                "Process stopped: Neither AUDIOFILES_FOLDER_ID nor AUDIOFILES_FOLDER_NAME environment variables are set."
+                f"Process stopped: Run '{run_id}' belongs to tenant '{checkpoint.tenant}'. "
+                f"Pass the tenants file with --tenants."
             )
             return
 
-        audio_folder_id = searcher.get_folder_id(folder_name)
+    drive_service = service_provider.get_drive_service()
+    searcher = FileSearcher(service=drive_service)
 
-        if not audio_folder_id:
-            logger.error(
-                f"Process stopped: Folder '{folder_name}' not found on Google Drive."
-            )
-            return
+    with log_context(run_id=checkpoint.run_id):
+        if not checkpoint.is_completed(RunStages.ANALYSIS):
+            _drop_removed_files(searcher, checkpoint)
+        _process_files(service_provider, searcher, checkpoint, tenant)
+
+
+def _drop_removed_files(searcher: FileSearcher, checkpoint: "RunCheckpoint"):
+    """
+    Re-checks the files of a resumed run that aren't analyzed yet with one
+    batched metadata request. Files deleted or trashed since the run started
+    are dropped from it, instead of failing their downloads.
+    """
+    analyzed_ids = {call.source_file_id for call in checkpoint.processed_calls}
+    pending_ids = [
+        file["id"]
+        for file in checkpoint.audio_files
+        if file.get("id") and file["id"] not in analyzed_ids
+    ]
+    if not pending_ids:
+        return
 
-    # --- 4. List Audio Files ---
-    audio_files = searcher.list_files_in_folder(audio_folder_id)
+    result = searcher.get_files_metadata(pending_ids, fields="id, trashed")
+    removed_ids = {
+        file_id
+        for file_id, error in result.errors.items()
+        if getattr(error, "status_code", None) == 404
+    }
+    removed_ids.update(
+        file_id
+        for file_id, metadata in result.responses.items()
+        if metadata.get("trashed")
+    )
+    if removed_ids:
+        logger.warning(
+            f"{len(removed_ids)} files of the run were deleted or trashed since it started. "
+            "They are skipped."
+        )
+        checkpoint.audio_files = [
+            file for file in checkpoint.audio_files if file.get("id") not in removed_ids
+        ]
+
+
+def _rescore_entry(entry, strategy, rule_scorer) -> tuple:
+    """
+    Re-scores one cached transcript.
+
+    The LLM call is skipped only when the cached evaluation was made with the
+    current prompt and the script rules decide every script field. The cached
+    values are kept as they are: as in a normal run, the rules don't override
+    the LLM, ReportEvaluator only logs their disagreements.
+
+    Args:
+        entry: The CachedTranscript to re-score.
+        strategy: The two-pass strategy with the current evaluation prompt.
+        rule_scorer: The ScriptRuleScorer of the script fields.
+
+    Returns:
+        (the analysis or None if the evaluation failed, True if no LLM call was made)
+    """
+    if (
+        entry.evaluation
+        and entry.evaluation_prompt_id == strategy.evaluation_prompt_id
+        and rule_scorer.is_confident(rule_scorer.score(entry.transcript))
+    ):
+        return strategy.combine(entry.transcript, entry.evaluation), True
+    return strategy.rescore(entry), False
+
+
+def _rescore_pipeline(service_provider: GoogleServicesProvider, tenant: Tenant):
+    """
+    Re-evaluates every cached transcript of the tenant with its current
+    criteria and prompt (text-only requests, no audio is downloaded) and
+    writes the new reports to its sheet.
+    """
+    from excel_table.google_spreadsheets.editor import GoogleSheetEditor
+    from call_analysis.analysis_strategies.analysis_processor import (
+        ProcessedCall,
+        ReportEvaluator,
+    )
+    from call_analysis.result_handlers import SheetResultHandler
+    from call_analysis.rule_scorer import ScriptRuleScorer
+    from call_analysis.transcript_cache import TranscriptCache
 
-    if not audio_files:
-        logger.warning("No files for processing in the folder.")
+    if TableConfig.WRITE_MODE != SheetWriteModes.UPSERT:
+        logger.info(
+            "Re-scoring replaces the existing rows of the calls (upsert mode), "
+            f"regardless of SHEET_WRITE_MODE='{TableConfig.WRITE_MODE}'."
+        )
+
+    logger.info(f"Re-scoring the cached calls of tenant '{tenant.name}'...")
+    transcript_cache = TranscriptCache(tenant.transcript_cache_dir)
+    strategy = _create_strategy_factory(
+        service_provider,
+        transcript_cache,
+        mode=AnalysisModes.TWO_PASS,
+        criteria_path=tenant.criteria_path,
+    )(GeminiConfig.MODEL)
+    rule_scorer = ScriptRuleScorer.from_file(ConfigFiles.SCRIPT_RULES)
+
+    processed_calls = []
+    reused_evaluations = 0
+    for entry in transcript_cache.entries():
+        file_name = entry.source_file_name or entry.audio_hash
+        logger.info(f"Re-scoring {file_name}...")
+
+        analysis, reused = _rescore_entry(entry, strategy, rule_scorer)
+        reused_evaluations += reused
+
+        if not analysis:
+            logger.warning(f"Re-scoring of {file_name} failed. Skipping.")
+            continue
+
+        processed_calls.append(
+            ProcessedCall(
+                source_file_name=file_name,
+                analysis=analysis,
+                source_file_id=entry.source_file_id,
+            )
+        )
+
+    if not processed_calls:
+        logger.warning("No cached transcripts were re-scored. Process finished.")
         return
 
-    logger.info("Building Gemini prompt...")
-    prompt = GeminiAnalysisStrategy.build_prompt_from_template(
-        criteria_path=ConfigFiles.ANALYSIS_CRITERIA, template_path=GeminiConfig.PROMPT
+    logger.info(
+        f"{reused_evaluations} of {len(processed_calls)} calls were confirmed by the script rules without an LLM call."
     )
+    evaluated_reports = ReportEvaluator(
+        processed_calls,
+        rule_scorer=rule_scorer,
+        works_index=_create_works_index(tenant.criteria_path),
+    ).generate_evaluated_reports()
+
+    _, gspread_client = service_provider.get_clients()
+    worksheet = gspread_client.open_by_url(tenant.sheet_url).sheet1
+    sheet_editor = GoogleSheetEditor(client=gspread_client, worksheet=worksheet)
+    sheet_editor.load_mapping(mapping_path=ConfigFiles.COLUMN_MAPPING)
+
+    # Appending would add a second row for every call that is already in the sheet
+    sheet_handler = SheetResultHandler(sheet_editor, write_mode=SheetWriteModes.UPSERT)
+    if sheet_handler.save_and_format_reports(
+        reports=evaluated_reports, sheet_url=tenant.sheet_url
+    ):
+        logger.info(f"Re-scored {len(evaluated_reports)} calls.")
+
+
+def _find_audio_folder(searcher: FileSearcher, tenant: Tenant) -> str | None:
+    audio_folder_id = tenant.audio_folder_id
 
-    # --- 5. Setup Call Analysis Strategy ---
-    gemini_strategy = GeminiAnalysisStrategy(
-        client=gemini_client, model=GeminiConfig.MODEL, prompt=prompt
+    if audio_folder_id:
+        logger.info(
+            f"Using direct folder ID from AUDIOFILES_FOLDER_ID: {audio_folder_id}"
+        )
+        return audio_folder_id
+
+    logger.warning(
+        "AUDIOFILES_FOLDER_ID is not set. Falling back to search by AUDIOFILES_FOLDER_NAME."
+    )
+
+    folder_name = tenant.audio_folder_name
+    if not folder_name:
+        logger.error(
+            "Process stopped: Neither AUDIOFILES_FOLDER_ID nor AUDIOFILES_FOLDER_NAME environment variables are set."
+        )
+        return None
+
+    audio_folder_id = searcher.get_folder_id(folder_name)
+
+    if not audio_folder_id:
+        logger.error(
+            f"Process stopped: Folder '{folder_name}' not found on Google Drive."
+        )
+        return None
+
+    return audio_folder_id
+
+
+def _process_files(
+    service_provider: GoogleServicesProvider,
+    searcher: FileSearcher,
+    checkpoint: "RunCheckpoint",
+    tenant: Tenant,
+    analysis_strategy: Optional["BaseAnalysisStrategy"] = None,
+):
+    """
+    Runs the stages of a checkpointed run for one tenant.
+
+    Args:
+        analysis_strategy: A strategy shared with other tenants; by default
+                           one is created for the tenant's criteria.
+    """
+    from excel_table.google_spreadsheets.editor import GoogleSheetEditor
+    from google_drive.audio_downloader import AudioDownloader
+    from google_drive.file_uploader import FileUploader
+    from call_analysis.analysis_strategies.analysis_processor import (
+        CallAnalyzer,
+        ReportEvaluator,
+    )
+    from call_analysis.deduplicator import CallDeduplicator
+    from call_analysis.rule_scorer import ScriptRuleScorer
+    from call_analysis.transcript_cache import TranscriptCache
+    from call_analysis.report_aggregator import ReportAggregator
+    from call_analysis.result_handlers import (
+        SheetResultHandler,
+        SummaryResultHandler,
+        TranscriptHandler,
+    )
+    from call_analysis.run_checkpoint import RunStages
+    from call_analysis.result_sinks import (
+        ResultDispatcher,
+        SheetSink,
+        SummarySink,
+        TranscriptSink,
+        LocalStoreSink,
+        WebhookSink,
     )
+    from utils import create_full_path
+
+    audio_folder_id = checkpoint.audio_folder_id
+
+    # --- 4. Setup Clients & Core Components ---
+    drive_service, gspread_client = service_provider.get_clients()
 
-    # --- 6. Setup Analyzer (Context) ---
-    analyzer = CallAnalyzer(strategy=gemini_strategy, downloader=downloader)
+    spreadsheet = gspread_client.open_by_url(tenant.sheet_url)
+    worksheet = spreadsheet.sheet1
 
-    # --- 7. Run Analysis ---
-    processed_calls = analyzer.analyze_files(audio_files)
+    uploader = FileUploader(service=drive_service)
+    sheet_editor = GoogleSheetEditor(client=gspread_client, worksheet=worksheet)
+    sheet_editor.load_mapping(mapping_path=ConfigFiles.COLUMN_MAPPING)
+
+    # --- 5-7. Run Analysis (skipped if the run already finished it) ---
+    if not checkpoint.is_completed(RunStages.ANALYSIS):
+        # --- 5. Setup Call Analysis Strategy ---
+        transcript_cache = TranscriptCache(tenant.transcript_cache_dir)
+        owns_strategy = analysis_strategy is None
+        if owns_strategy:
+            analysis_strategy = _create_analysis_strategy(
+                service_provider, transcript_cache, criteria_path=tenant.criteria_path
+            )
+
+        # --- 6. Setup Analyzer (Context) ---
+        downloader = AudioDownloader(
+            service=drive_service,
+            service_factory=service_provider.pool.drive,
+            range_threshold=DownloadConfig.RANGE_THRESHOLD,
+            range_size=DownloadConfig.RANGE_SIZE,
+            max_workers=DownloadConfig.RANGE_WORKERS,
+            range_attempts=DownloadConfig.RANGE_ATTEMPTS,
+        )
+        analyzer = CallAnalyzer(
+            strategy=analysis_strategy,
+            downloader=downloader,
+            deduplicator=CallDeduplicator(
+                transcript_cache, index_path=tenant.dedup_index_file
+            ),
+            checkpoint=checkpoint,
+            transcript_cache=transcript_cache,
+            pre_filter=_create_pre_filter(),
+        )
+
+        # --- 7. Run Analysis ---
+        # Results are recorded in the checkpoint as they are produced
+        try:
+            analyzer.analyze_files(
+                checkpoint.audio_files, known_results=list(checkpoint.processed_calls)
+            )
+        finally:
+            downloader.close()
+        checkpoint.complete_stage(RunStages.ANALYSIS)
+        memory_snapshot("analysis")
+
+        if hasattr(analysis_strategy, "log_stats"):
+            analysis_strategy.log_stats()
+        # A shared strategy is closed by its owner
+        if owns_strategy and hasattr(analysis_strategy, "close"):
+            analysis_strategy.close()
+
+    processed_calls = checkpoint.processed_calls
 
     if not processed_calls:
         logger.warning("No analysis results were obtained. Process finished.")
         return
 
-    logger.debug(f"Processed calls list: {processed_calls}")
+    logger.debug("Processed calls list: %s", processed_calls)
 
     # --- 8. Run Post-Processing & Evaluation ---
-    evaluator = ReportEvaluator(processed_calls)
+    evaluator = ReportEvaluator(
+        processed_calls,
+        rule_scorer=ScriptRuleScorer.from_file(ConfigFiles.SCRIPT_RULES),
+        works_index=_create_works_index(tenant.criteria_path),
+    )
 
     evaluated_reports = evaluator.generate_evaluated_reports()
+    memory_snapshot("evaluation")
 
-    logger.debug(f"Evaluated reports list: {evaluated_reports}")
+    logger.debug("Evaluated reports list: %s", evaluated_reports)
 
     # --- 9. Setup Result Handlers ---
     logger.info("Setting up result handlers...")
     sheet_handler = SheetResultHandler(sheet_editor)
 
-    transcript_folder_id = Constants.TRANSCRIPTION_FOLDER_ID
+    transcript_folder_id = tenant.transcript_folder_id
 
     if transcript_folder_id:
         logger.info(f"Using separate folder for transcripts: {transcript_folder_id}")
@@ -118,30 +519,359 @@ def execute():
         )
         transcript_folder_id = audio_folder_id
 
+    bundle_name = None
+    if TranscriptConfig.MODE == TranscriptModes.BUNDLE:
+        bundle_name = TranscriptConfig.BUNDLE_NAME.format(run_id=checkpoint.run_id)
+        logger.info(f"Transcripts will be uploaded as one bundle: {bundle_name}")
+
     transcript_handler = TranscriptHandler(
         uploader=uploader,
         local_save_directory=Directories.AUDIOFILES_ROOT,
         drive_folder_id=transcript_folder_id,
+        bundle_name=bundle_name,
     )
 
-    # --- 10. Writing results to a table and drive ---
+    # --- 10. Write the results to all sinks in parallel ---
+    days_by_file_id = {
+        file["id"]: file["createdTime"][:10]
+        for file in checkpoint.audio_files
+        if file.get("createdTime")
+    }
+    sinks = [
+        SheetSink(sheet_handler, sheet_url=tenant.sheet_url),
+        # Same spreadsheet client as the rows, so it runs right after them
+        SummarySink(
+            SummaryResultHandler(
+                sheet_editor, ReportAggregator(tenant.summary_state_file)
+            ),
+            days_by_file_id,
+        ),
+        TranscriptSink(transcript_handler),
+    ]
+    if ResultSinkConfig.LOCAL_STORE:
+        sinks.append(
+            LocalStoreSink(
+                create_full_path(
+                    Directories.RESULTS,
+                    ResultSinkConfig.LOCAL_STORE_FILE.format(run_id=checkpoint.run_id),
+                )
+            )
+        )
+    if ResultSinkConfig.WEBHOOK_URL:
+        sinks.append(
+            WebhookSink(
+                ResultSinkConfig.WEBHOOK_URL,
+                run_id=checkpoint.run_id,
+                timeout=ResultSinkConfig.WEBHOOK_TIMEOUT,
+            )
+        )
 
-    # 10.1. Save to Google Sheet and color cells
-    sheet_handler.save_and_format_reports(
-        reports=evaluated_reports, sheet_url=Constants.SHEET_URL
-    )
+    dispatcher = ResultDispatcher(sinks, checkpoint)
+    outcomes = dispatcher.dispatch(evaluated_reports)
+    memory_snapshot("results")
+    incomplete_sinks = [outcome.name for outcome in outcomes if not outcome.completed]
+
+    # --- 11. Archive processed audio, only once every sink has confirmed it ---
+    if ArchiveConfig.ENABLED and not checkpoint.is_completed(RunStages.ARCHIVE):
+        already_archived = set(checkpoint.confirmed_file_ids(RunStages.ARCHIVE))
+        acknowledged_ids = [
+            file_id
+            for file_id in dispatcher.acknowledged_file_ids(evaluated_reports)
+            if file_id not in already_archived
+        ]
+        if acknowledged_ids:
+            archived_ids = _archive_processed_files(
+                searcher,
+                uploader,
+                acknowledged_ids,
+                audio_folder_id,
+                tenant.archive_folder_id,
+                days_by_file_id,
+            )
+            checkpoint.confirm_files(RunStages.ARCHIVE, archived_ids)
+        if not incomplete_sinks:
+            checkpoint.complete_stage(RunStages.ARCHIVE)
 
-    # 10.2. Save and upload transcripts
-    transcript_handler.save_and_upload_transcripts(reports=evaluated_reports)
+    if incomplete_sinks:
+        logger.warning(
+            f"Not all results were stored (incomplete: {', '.join(incomplete_sinks)}). "
+            f"Retry with: --resume {checkpoint.run_id}"
+        )
+        return
 
     logger.info("Whole process successfully finished!")
 
 
+def _create_works_index(
+    criteria_path: str = ConfigFiles.ANALYSIS_CRITERIA,
+) -> "WorksCatalogIndex":
+    from call_analysis.works_catalog import WorksCatalogIndex
+    from utils import read_json
+
+    criteria = read_json(criteria_path)
+    return WorksCatalogIndex(criteria["top_works"])
+
+
+def _create_analysis_strategy(
+    service_provider: GoogleServicesProvider,
+    transcript_cache: "TranscriptCache",
+    criteria_path: str = ConfigFiles.ANALYSIS_CRITERIA,
+    budget_scheduler: Optional["TokenBudgetScheduler"] = None,
+    gate: Optional["FairShareGate"] = None,
+):
+    """
+    Creates the Gemini strategy for the configured analysis mode.
+    If GEMINI_FAST_MODEL is set, short calls go to it first and the main
+    model is used for long calls and escalations.
+    With GEMINI_HEDGING, slow calls are sent a second time.
+    With a gate (several tenants), every request - hedges included - waits
+    for a call slot of the current tenant.
+    """
+    from call_analysis.analysis_strategies.fair_share_strategy import (
+        FairShareStrategy,
+    )
+    from call_analysis.analysis_strategies.hedged_strategy import (
+        HedgedAnalysisStrategy,
+    )
+
+    strategy = _create_routed_strategy(
+        service_provider, transcript_cache, criteria_path, budget_scheduler
+    )
+    if not HedgeConfig.ENABLED:
+        return FairShareStrategy(strategy, gate) if gate else strategy
+
+    return HedgedAnalysisStrategy(
+        strategy,
+        percentile=HedgeConfig.PERCENTILE,
+        max_hedge_rate=HedgeConfig.MAX_RATE,
+        min_samples=HedgeConfig.MIN_SAMPLES,
+        min_delay=HedgeConfig.MIN_DELAY,
+        gate=gate,
+    )
+
+
+def _create_routed_strategy(
+    service_provider: GoogleServicesProvider,
+    transcript_cache: "TranscriptCache",
+    criteria_path: str,
+    budget_scheduler: Optional["TokenBudgetScheduler"],
+):
+    from call_analysis.analysis_strategies.routing_strategy import (
+        ModelRoute,
+        RoutingAnalysisStrategy,
+    )
+    from utils import read_json
+
+    make_strategy = _create_strategy_factory(
+        service_provider, transcript_cache, criteria_path=criteria_path
+    )
+    if budget_scheduler is None:
+        budget_scheduler = _create_token_budget_scheduler()
+    if budget_scheduler:
+        make_strategy = _with_token_budget(make_strategy, budget_scheduler)
+    main_strategy = make_strategy(GeminiConfig.MODEL)
+
+    if not GeminiConfig.FAST_MODEL:
+        return main_strategy
+
+    pricing = read_json(ConfigFiles.MODEL_PRICING)
+
+    def prices(model: str) -> dict:
+        model_prices = pricing.get(model, {})
+        return {
+            "input_price": model_prices.get("input", 0.0),
+            "output_price": model_prices.get("output", 0.0),
+        }
+
+    fast_route = ModelRoute(
+        name=GeminiConfig.FAST_MODEL,
+        strategy=make_strategy(GeminiConfig.FAST_MODEL),
+        max_duration=GeminiConfig.FAST_MODEL_MAX_DURATION,
+        max_size=GeminiConfig.FAST_MODEL_MAX_SIZE,
+        **prices(GeminiConfig.FAST_MODEL),
+    )
+    main_route = ModelRoute(
+        name=GeminiConfig.MODEL, strategy=main_strategy, **prices(GeminiConfig.MODEL)
+    )
+    return RoutingAnalysisStrategy([fast_route, main_route])
+
+
+def _create_pre_filter() -> Optional["RecordingPreFilter"]:
+    """Creates the recording pre-filter if it is enabled."""
+    if not PreFilterConfig.ENABLED:
+        return None
+
+    from call_analysis.pre_filter import RecordingPreFilter
+
+    return RecordingPreFilter(
+        min_duration=PreFilterConfig.MIN_DURATION,
+        min_active_ratio=PreFilterConfig.MIN_ACTIVE_RATIO,
+        min_global_gain=PreFilterConfig.MIN_GLOBAL_GAIN,
+    )
+
+
+def _create_token_budget_scheduler() -> Optional["TokenBudgetScheduler"]:
+    """Creates the scheduler of the configured token budget, or None without one."""
+    if not (TokenBudgetConfig.TOKENS_PER_MINUTE or TokenBudgetConfig.TOKENS_PER_DAY):
+        return None
+
+    from call_analysis.analysis_strategies.budget_strategy import TokenBudgetScheduler
+
+    logger.info(
+        f"Gemini token budget: {TokenBudgetConfig.TOKENS_PER_MINUTE or 'unlimited'} per minute, "
+        f"{TokenBudgetConfig.TOKENS_PER_DAY or 'unlimited'} per day."
+    )
+    return TokenBudgetScheduler(
+        tokens_per_minute=TokenBudgetConfig.TOKENS_PER_MINUTE,
+        tokens_per_day=TokenBudgetConfig.TOKENS_PER_DAY,
+    )
+
+
+def _with_token_budget(make_strategy, scheduler: "TokenBudgetScheduler"):
+    """
+    Wraps a strategy factory so every created strategy is paced
+    by the same token budget scheduler, shared by all models.
+    """
+    from call_analysis.analysis_strategies.budget_strategy import (
+        BudgetedAnalysisStrategy,
+    )
+
+    def make_budgeted_strategy(model: str):
+        strategy = make_strategy(model)
+        return BudgetedAnalysisStrategy(
+            strategy,
+            scheduler,
+            prompt_tokens=len(strategy.prompt) // TokenBudgetConfig.CHARS_PER_TOKEN,
+            audio_tokens_per_second=TokenBudgetConfig.AUDIO_TOKENS_PER_SECOND,
+            output_tokens=TokenBudgetConfig.OUTPUT_TOKENS,
+        )
+
+    return make_budgeted_strategy
+
+
+def _create_strategy_factory(
+    service_provider: GoogleServicesProvider,
+    transcript_cache: "TranscriptCache",
+    mode: str = GeminiConfig.ANALYSIS_MODE,
+    criteria_path: str = ConfigFiles.ANALYSIS_CRITERIA,
+):
+    """Returns a function that creates the strategy of the given mode for a model."""
+    from call_analysis.analysis_strategies.gemini.gemini_strategy import (
+        GeminiAnalysisStrategy,
+    )
+    from call_analysis.analysis_strategies.gemini.streaming_strategy import (
+        StreamingGeminiAnalysisStrategy,
+    )
+    from call_analysis.analysis_strategies.gemini.two_pass_strategy import (
+        TwoPassGeminiStrategy,
+    )
+    from utils import read_file
+
+    gemini_client = service_provider.get_gemini_client()
+
+    if mode == AnalysisModes.TWO_PASS:
+        logger.info("Building Gemini prompts for the two-pass mode...")
+        transcription_prompt = read_file(GeminiConfig.TRANSCRIPTION_PROMPT)
+        evaluation_prompt = GeminiAnalysisStrategy.build_prompt_from_template(
+            criteria_path=criteria_path,
+            template_path=GeminiConfig.EVALUATION_PROMPT,
+        )
+        return lambda model: TwoPassGeminiStrategy(
+            client=gemini_client,
+            model=model,
+            transcription_prompt=transcription_prompt,
+            evaluation_prompt=evaluation_prompt,
+            cache=transcript_cache,
+        )
+
+    if mode != AnalysisModes.SINGLE_PASS:
+        logger.warning(f"Unknown analysis mode '{mode}'. Using single-pass mode.")
+
+    logger.info("Building Gemini prompt...")
+    prompt = GeminiAnalysisStrategy.build_prompt_from_template(
+        criteria_path=criteria_path,
+        template_path=GeminiConfig.PROMPT,
+    )
+    if GeminiConfig.STREAMING:
+        return lambda model: StreamingGeminiAnalysisStrategy(
+            client=gemini_client,
+            model=model,
+            prompt=prompt,
+            max_attempts=GeminiConfig.STREAM_ATTEMPTS,
+        )
+    return lambda model: GeminiAnalysisStrategy(
+        client=gemini_client, model=model, prompt=prompt
+    )
+
+
+def _archive_processed_files(
+    searcher: FileSearcher,
+    uploader: "FileUploader",
+    file_ids: list[str],
+    audio_folder_id: str,
+    archive_root_id: Optional[str] = None,
+    days_by_file_id: Optional[dict[str, str]] = None,
+) -> list[str]:
+    """Returns the IDs of the files that were moved to the archive."""
+    from google_drive.audio_archiver import AudioArchiver
+
+    if not archive_root_id:
+        folder_name = ArchiveConfig.DEFAULT_FOLDER_NAME
+        archive_root_id = searcher.get_folder_id(folder_name, parent_id=audio_folder_id)
+        if not archive_root_id:
+            archive_root_id = uploader.create_folder(
+                folder_name, parent_folder_id=audio_folder_id
+            )
+
+    if not archive_root_id:
+        logger.error("Archive folder is not available. Skipping archiving.")
+        return []
+
+    archiver = AudioArchiver(
+        searcher=searcher, uploader=uploader, archive_root_id=archive_root_id
+    )
+    archived_ids = archiver.archive_files(
+        file_ids, inbox_folder_id=audio_folder_id, days_by_file_id=days_by_file_id
+    )
+    logger.info(f"Archived {len(archived_ids)} processed audio files.")
+    return archived_ids
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(
+        description="Transcribes and analyzes call recordings from Google Drive."
+    )
+    modes = parser.add_mutually_exclusive_group()
+    modes.add_argument(
+        "--resume",
+        metavar="RUN_ID",
+        help="Continue a failed run from its first incomplete stage.",
+    )
+    modes.add_argument(
+        "--rescore",
+        action="store_true",
+        help="Re-evaluate all cached transcripts with the current criteria (no audio is sent).",
+    )
+    parser.add_argument(
+        "--tenants",
+        metavar="PATH",
+        help="JSON file with several stations (audio folder, sheet, ...) to process in one run.",
+    )
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    configure_logging()
+    args = _parse_args()
+    configure_logging(level=LoggingConfig.LEVEL, log_format=LoggingConfig.FORMAT)
+    configure_tracing(exporter=TracingConfig.EXPORTER, file_path=TracingConfig.FILE)
+    configure_memory_profiling(
+        enabled=MemoryProfilingConfig.ENABLED, top_sites=MemoryProfilingConfig.TOP_SITES
+    )
     try:
         logger.info("Application starting...")
-        execute()
+        execute(
+            resume_run_id=args.resume, rescore=args.rescore, tenants_path=args.tenants
+        )
         logger.info("Application finished successfully.")
 
     except Exception as e:
@@ -0,0 +1,183 @@
+import heapq
+import logging
+import os
+import tracemalloc
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_MB = 1024 * 1024
+
+
+def _current_rss() -> Optional[int]:
+    """Resident set size of the process in bytes, or None if it can't be read."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+
+        # Not the current RSS, but the peak (KiB on Linux, bytes on macOS)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except (ImportError, OSError):
+        return None
+
+
+def _format_mb(value: Optional[int]) -> str:
+    return "n/a" if value is None else f"{value / _MB:.1f} MB"
+
+
+class MemoryProfiler:
+    """
+    Tracks where the memory of a run goes, using tracemalloc and RSS samples.
+
+    - snapshot(stage) logs the traced and resident memory after a pipeline
+      stage and the allocation sites that grew the most since the previous one;
+    - track_file(name) measures the peak memory of processing one file on top
+      of what was already allocated, and keeps the heaviest files for the report.
+
+    Tracing every allocation slows Python down noticeably, so the profiler
+    is only used when MEMORY_PROFILING is enabled.
+
+    tracemalloc has a single, process-wide peak: the per-file peaks are only
+    meaningful while one file is processed at a time, so they can be turned
+    off with disable_file_tracking() (e.g. when tenants run in parallel).
+    """
+
+    def __init__(self, top_sites: int = 10, frames: int = 1):
+        """
+        Args:
+            top_sites: Number of allocation sites / files listed in the reports.
+            frames: Stack depth recorded per allocation (more is slower).
+        """
+        self._top_sites = top_sites
+        self._frames = frames
+        self._previous: Optional[tracemalloc.Snapshot] = None
+        self._track_files = True
+        self._files = 0
+        self._file_peak_sum = 0
+        # min-heap of (peak, file name) with the heaviest files
+        self._heaviest_files: List[Tuple[int, str]] = []
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self._frames)
+        self._previous = self._take_snapshot()
+        logger.info(f"Memory profiling started. RSS: {_format_mb(_current_rss())}")
+
+    def stop(self):
+        self.report()
+        tracemalloc.stop()
+
+    @staticmethod
+    def _take_snapshot() -> tracemalloc.Snapshot:
+        # Allocations of the profiler itself are not interesting
+        return tracemalloc.take_snapshot().filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            )
+        )
+
+    def snapshot(self, stage: str):
+        """Logs the memory after a pipeline stage and its top allocation sites."""
+        current, peak = tracemalloc.get_traced_memory()
+        logger.info(
+            f"[memory] {stage}: traced {_format_mb(current)} (peak {_format_mb(peak)}), "
+            f"RSS {_format_mb(_current_rss())}"
+        )
+
+        snapshot = self._take_snapshot()
+        if self._previous is not None:
+            stats = snapshot.compare_to(self._previous, "lineno")
+            for stat in stats[: self._top_sites]:
+                if stat.size_diff <= 0:
+                    break
+                logger.info(
+                    f"[memory]   +{stat.size_diff / 1024:.1f} KiB "
+                    f"({stat.count_diff:+d} blocks) {stat.traceback}"
+                )
+        self._previous = snapshot
+
+    def disable_file_tracking(self, reason: str):
+        self._track_files = False
+        logger.info(f"[memory] Per-file peaks are not tracked: {reason}.")
+
+    @contextmanager
+    def track_file(self, file_name: str):
+        """Measures the peak memory of processing one file."""
+        if not self._track_files:
+            yield
+            return
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            _, peak = tracemalloc.get_traced_memory()
+            file_peak = max(peak - baseline, 0)
+            self._files += 1
+            self._file_peak_sum += file_peak
+
+            entry = (file_peak, file_name)
+            if len(self._heaviest_files) < self._top_sites:
+                heapq.heappush(self._heaviest_files, entry)
+            elif entry > self._heaviest_files[0]:
+                heapq.heapreplace(self._heaviest_files, entry)
+
+    def report(self):
+        """Logs the per-file peaks collected by track_file()."""
+        if not self._files:
+            return
+        logger.info(
+            f"[memory] {self._files} files, average peak per file "
+            f"{_format_mb(self._file_peak_sum // self._files)}. Heaviest files:"
+        )
+        for file_peak, file_name in sorted(self._heaviest_files, reverse=True):
+            logger.info(f"[memory]   {_format_mb(file_peak)} {file_name}")
+
+
+_profiler: Optional[MemoryProfiler] = None
+
+
+def configure_memory_profiling(enabled: bool = False, top_sites: int = 10):
+    """
+    Starts the profiler once, at the entry point.
+    Without a call (or when disabled) the helpers below are no-ops.
+    """
+    global _profiler
+    if not enabled or _profiler is not None:
+        return
+    _profiler = MemoryProfiler(top_sites=top_sites)
+    _profiler.start()
+
+
+def memory_snapshot(stage: str):
+    if _profiler:
+        _profiler.snapshot(stage)
+
+
+@contextmanager
+def track_file_memory(file_name: str):
+    if _profiler is None:
+        yield
+        return
+    with _profiler.track_file(file_name):
+        yield
+
+
+def disable_file_memory_tracking(reason: str):
+    """Turns off the per-file peaks, which need files to be processed one at a time."""
+    if _profiler:
+        _profiler.disable_file_tracking(reason)
+
+
+def stop_memory_profiling():
+    """Logs the final report and stops tracing allocations."""
+    global _profiler
+    if _profiler:
+        _profiler.stop()
+        _profiler = None
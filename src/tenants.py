@@ -0,0 +1,107 @@
+import logging
+import re
+from dataclasses import dataclass
+from typing import List, Optional
+
+from constants import (
+    Constants,
+    ConfigFiles,
+    SummaryConfig,
+    Directories,
+    DedupConfig,
+)
+from utils import read_json, create_full_path
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Tenant:
+    """
+    One service station: where its recordings come from and where its
+    results go. A single-station setup is one tenant built from the .env.
+
+    Attributes:
+        name: Short unique name, used in logs and file names.
+        sheet_url: The results spreadsheet.
+        audio_folder_id: Drive folder with the recordings.
+        audio_folder_name: Used to find the folder if audio_folder_id is not set.
+        transcript_folder_id: Drive folder for transcripts (default: the audio folder).
+        archive_folder_id: Drive folder for processed recordings.
+        criteria_path: Analysis criteria of the station's prompt.
+        weight: Share of the Gemini capacity relative to the other tenants.
+    """
+
+    name: str
+    sheet_url: str
+    audio_folder_id: Optional[str] = None
+    audio_folder_name: Optional[str] = None
+    transcript_folder_id: Optional[str] = None
+    archive_folder_id: Optional[str] = None
+    criteria_path: str = ConfigFiles.ANALYSIS_CRITERIA
+    weight: int = 1
+
+    @classmethod
+    def from_env(cls) -> "Tenant":
+        return cls(
+            name="default",
+            sheet_url=Constants.SHEET_URL,
+            audio_folder_id=Constants.AUDIOFILES_FOLDER_ID,
+            audio_folder_name=Constants.AUDIOFILES_FOLDER_NAME,
+            transcript_folder_id=Constants.TRANSCRIPTION_FOLDER_ID,
+            archive_folder_id=Constants.ARCHIVE_FOLDER_ID,
+        )
+
+    @property
+    def summary_state_file(self) -> str:
+        """Running aggregates of the tenant's summary tab."""
+        if self.name == "default":
+            return SummaryConfig.STATE_FILE
+        return create_full_path(Directories.APP_DATA, f"aggregates_{self.name}.json")
+
+    @property
+    def transcript_cache_dir(self) -> str:
+        """Cached transcripts and evaluations of the tenant's calls (see TranscriptCache)."""
+        if self.name == "default":
+            return Directories.TRANSCRIPT_CACHE
+        return create_full_path(Directories.APP_DATA, f"transcript_cache_{self.name}")
+
+    @property
+    def dedup_index_file(self) -> str:
+        """Checksums of the tenant's analyzed recordings (see CallDeduplicator)."""
+        if self.name == "default":
+            return DedupConfig.INDEX_FILE
+        return create_full_path(Directories.APP_DATA, f"dedup_index_{self.name}.json")
+
+
+def load_tenants(path: str) -> List[Tenant]:
+    """
+    Loads the tenants from a JSON list of objects with the Tenant fields.
+    A relative criteria_path is resolved against app_data.
+
+    Raises:
+        ValueError: if a tenant is incomplete or the names are not unique.
+    """
+    tenants = []
+    for entry in read_json(path):
+        name = entry.get("name")
+        if not name or not re.fullmatch(r"[\w-]+", name):
+            raise ValueError(f"Tenant name '{name}' must be letters, digits, _ or -.")
+        if not entry.get("sheet_url"):
+            raise ValueError(f"Tenant '{name}' has no sheet_url.")
+        if not entry.get("audio_folder_id") and not entry.get("audio_folder_name"):
+            raise ValueError(f"Tenant '{name}' has no audio folder.")
+
+        criteria_path = entry.pop("criteria_path", None)
+        if criteria_path:
+            entry["criteria_path"] = create_full_path(
+                Directories.APP_DATA, criteria_path
+            )
+        tenants.append(Tenant(**entry))
+
+    names = [tenant.name for tenant in tenants]
+    if len(set(names)) != len(names):
+        raise ValueError("Tenant names must be unique.")
+
+    logger.info(f"Loaded {len(tenants)} tenants from {path}: {names}")
+    return tenants
@@ -0,0 +1,167 @@
+import contextvars
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TracingExporters:
+    NONE = "none"  # no-op, the default
+    CONSOLE = "console"  # one JSON line per finished span on stderr
+    FILE = "file"  # one JSON line per finished span in a local file
+    # OpenTelemetry API; the SDK and its exporter are configured by the environment
+    OTEL = "otel"
+
+
+class _NoOpSpan:
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+
+_NOOP_SPAN = _NoOpSpan()
+
+
+class _LocalSpan:
+    """A finished-on-exit span of the local (console/file) exporters."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "attributes", "start")
+
+    def __init__(self, name: str, parent: Optional["_LocalSpan"]):
+        self.name = name
+        self.span_id = os.urandom(8).hex()
+        # A span without a parent starts a new trace
+        self.trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        self.parent_id = parent.span_id if parent else None
+        self.attributes: Dict[str, Any] = {}
+        self.start = time.time()
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+
+_current_span: contextvars.ContextVar[Optional[_LocalSpan]] = contextvars.ContextVar(
+    "current_span", default=None
+)
+
+
+class _LocalTracer:
+    """Writes finished spans as JSON lines to a stream (console or file)."""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def start_span(self, name: str, attributes: Dict[str, Any]) -> Iterator[_LocalSpan]:
+        span = _LocalSpan(name, _current_span.get())
+        span.attributes.update(attributes)
+        token = _current_span.set(span)
+        status = "ok"
+        try:
+            yield span
+        except BaseException as e:
+            status = f"error: {type(e).__name__}"
+            raise
+        finally:
+            _current_span.reset(token)
+            self._export(span, time.time(), status)
+
+    def _export(self, span: _LocalSpan, end: float, status: str):
+        record = {
+            "name": span.name,
+            "trace_id": span.trace_id,
+            "span_id": span.span_id,
+            "parent_id": span.parent_id,
+            "start": span.start,
+            "duration_ms": round((end - span.start) * 1000, 2),
+            "status": status,
+            "attributes": span.attributes,
+        }
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            self._stream.write(line + "\n")
+            self._stream.flush()
+
+
+class _OtelTracer:
+    """Thin adapter over the OpenTelemetry API."""
+
+    def __init__(self):
+        from opentelemetry import trace
+
+        self._tracer = trace.get_tracer("call_analyzer")
+
+    @contextmanager
+    def start_span(self, name: str, attributes: Dict[str, Any]):
+        with self._tracer.start_as_current_span(
+            name, attributes=_otel_attributes(attributes)
+        ) as span:
+            yield _OtelSpan(span)
+
+
+class _OtelSpan:
+    def __init__(self, span):
+        self._span = span
+
+    def set_attribute(self, key: str, value: Any):
+        if value is not None:
+            self._span.set_attribute(key, value)
+
+
+def _otel_attributes(attributes: Dict[str, Any]) -> Dict[str, Any]:
+    # OpenTelemetry accepts only primitive values and rejects None
+    return {
+        key: value if isinstance(value, (str, bool, int, float)) else str(value)
+        for key, value in attributes.items()
+        if value is not None
+    }
+
+
+_tracer = None
+
+
+def configure_tracing(exporter: str = TracingExporters.NONE, file_path: str = ""):
+    """
+    Selects the span exporter once, at the entry point.
+    Without a call (or with "none") every span is a no-op.
+    """
+    global _tracer
+
+    if exporter == TracingExporters.CONSOLE:
+        _tracer = _LocalTracer(sys.stderr)
+    elif exporter == TracingExporters.FILE:
+        _tracer = _LocalTracer(open(file_path, "a", encoding="utf-8"))
+    elif exporter == TracingExporters.OTEL:
+        try:
+            _tracer = _OtelTracer()
+        except ImportError:
+            logger.warning(
+                "TRACING_EXPORTER is 'otel', but opentelemetry is not installed. Tracing is disabled."
+            )
+            _tracer = None
+    else:
+        _tracer = None
+
+    if _tracer:
+        logger.info(f"Tracing enabled with the '{exporter}' exporter.")
+
+
+@contextmanager
+def start_span(name: str, **attributes: Any):
+    """
+    Starts a span nested in the current one (or a new trace if there is none).
+    The yielded span accepts set_attribute(key, value) for values known later,
+    e.g. the number of downloaded bytes or used tokens.
+    """
+    if _tracer is None:
+        yield _NOOP_SPAN
+        return
+
+    with _tracer.start_span(name, attributes) as span:
+        yield span
@@ -1,19 +1,9 @@
 import os
-import sys
-import logging
 import json
 import re
 from typing import Optional, Tuple
 
 
-def configure_logging():
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[logging.StreamHandler(sys.stdout)],
-    )
-
-
 def create_full_path(directory: str, file_name: str):
     return os.path.join(directory, file_name)
 
@@ -52,6 +42,11 @@ def write_json_file(input_data: list[dict], output_file_path: str):
         )
 
 
+def write_binary_file(data: bytes, output_file_path: str):
+    with open(output_file_path, "wb") as final:
+        final.write(data)
+
+
 def add_new_key(dictionary: dict, key: str, value=None):
 
     if key in dictionary:
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The application modules are imported from src, as when running src/main.py
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
@@ -0,0 +1,104 @@
+"""
+Tests of the archiving of processed recordings and of the re-check of the
+files of a resumed run, with Drive replaced by in-memory fakes.
+"""
+
+from datetime import date
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from call_analysis.run_checkpoint import RunCheckpoint
+from google_drive.audio_archiver import AudioArchiver
+from google_drive.batch_executor import BatchResult
+from main import _drop_removed_files
+
+
+class FakeSearcher:
+    def __init__(self, existing_folders, failing_lookups=()):
+        self.existing_folders = existing_folders
+        self.failing_lookups = set(failing_lookups)
+        self.lookups = []
+
+    def get_folder_ids(self, folder_names, parent_id=None):
+        self.lookups.append(list(folder_names))
+        return {
+            name: self.existing_folders.get(name)
+            for name in folder_names
+            if name not in self.failing_lookups
+        }
+
+
+class FakeUploader:
+    def __init__(self):
+        self.created = []
+        self.moves = {}
+
+    def create_folders(self, folder_names, parent_folder_id):
+        self.created.append(list(folder_names))
+        return {name: f"new-{name}" for name in folder_names}
+
+    def move_files(self, file_ids, target_folder_id, source_folder_id):
+        self.moves[target_folder_id] = list(file_ids)
+        return BatchResult(responses={file_id: {} for file_id in file_ids})
+
+
+def test_files_are_archived_by_day_with_one_batch_per_step():
+    searcher = FakeSearcher({"2026-10-01": "old-folder"})
+    uploader = FakeUploader()
+    archiver = AudioArchiver(searcher, uploader, archive_root_id="root")
+
+    archived = archiver.archive_files(
+        ["a", "b", "c", "d"],
+        inbox_folder_id="inbox",
+        days_by_file_id={"a": "2026-10-01", "b": "2026-10-02", "c": "2026-10-02"},
+    )
+
+    today = date.today().isoformat()
+    assert sorted(archived) == ["a", "b", "c", "d"]
+    assert searcher.lookups == [sorted(["2026-10-01", "2026-10-02", today])]
+    assert uploader.created == [sorted(["2026-10-02", today])]
+    assert uploader.moves == {
+        "old-folder": ["a"],
+        "new-2026-10-02": ["b", "c"],
+        f"new-{today}": ["d"],
+    }
+
+    # Known folders are not looked up again
+    archiver.archive_files(["e"], "inbox", {"e": "2026-10-01"})
+    assert len(searcher.lookups) == 1
+
+
+def test_folder_with_failed_lookup_is_not_created():
+    searcher = FakeSearcher({}, failing_lookups={"2026-10-02"})
+    uploader = FakeUploader()
+    archiver = AudioArchiver(searcher, uploader, archive_root_id="root")
+
+    archived = archiver.archive_files(["a"], "inbox", {"a": "2026-10-02"})
+
+    assert archived == []
+    assert uploader.created == []
+
+
+class FakeMetadataSearcher:
+    def get_files_metadata(self, file_ids, fields):
+        self.requested = list(file_ids)
+        return BatchResult(
+            responses={"kept": {"trashed": False}, "trashed": {"trashed": True}},
+            errors={
+                "deleted": HttpError(httplib2.Response({"status": 404}), b"{}"),
+                "unreachable": HttpError(httplib2.Response({"status": 500}), b"{}"),
+            },
+        )
+
+
+def test_resumed_run_drops_deleted_and_trashed_files(tmp_path):
+    checkpoint = RunCheckpoint("run", directory=str(tmp_path))
+    checkpoint.audio_files = [
+        {"id": file_id} for file_id in ["kept", "trashed", "deleted", "unreachable"]
+    ]
+    searcher = FakeMetadataSearcher()
+
+    _drop_removed_files(searcher, checkpoint)
+
+    assert [file["id"] for file in checkpoint.audio_files] == ["kept", "unreachable"]
@@ -0,0 +1,43 @@
+"""
+Tests of the frame-header parsing used by the recording pre-filter.
+"""
+
+from call_analysis.audio_info import estimate_duration, measure_activity
+from call_analysis.pre_filter import RecordingPreFilter
+
+# MPEG-1, 128 kbps, 44.1 kHz, stereo: 417-byte frames of 1152 samples
+FRAME_SIZE = 417
+LAYER_2_HEADER = bytes([0xFF, 0xFD, 0x80, 0x00])
+# Layer III with a CRC after the header (protection bit cleared)
+PROTECTED_LAYER_3_HEADER = bytes([0xFF, 0xFA, 0x90, 0x00])
+# Header, CRC and MPEG-1 stereo side information
+XING_OFFSET = 4 + 2 + 32
+
+
+def _frames(header: bytes, count: int) -> bytes:
+    return (header + bytes(FRAME_SIZE - len(header))) * count
+
+
+def test_layer_2_recording_has_unknown_voice_activity():
+    recording = _frames(LAYER_2_HEADER, 1000)  # ~26 s
+
+    activity = measure_activity(recording)
+
+    assert activity.frames == 1000
+    assert activity.active_frames is None
+    assert activity.active_ratio is None
+    # Only the voice activity check is skipped, not the whole recording
+    assert RecordingPreFilter(min_duration=10.0).check(recording) is None
+    assert RecordingPreFilter(min_duration=60.0).check(recording) is not None
+
+
+def test_xing_frame_count_is_read_after_the_crc():
+    frame_count = 5000
+    xing_frame = bytearray(_frames(PROTECTED_LAYER_3_HEADER, 1))
+    xing_frame[XING_OFFSET : XING_OFFSET + 12] = (
+        b"Xing" + (1).to_bytes(4, "big") + frame_count.to_bytes(4, "big")
+    )
+    # Far fewer frames than the Xing count: a CBR estimate would be much shorter
+    recording = bytes(xing_frame) + _frames(PROTECTED_LAYER_3_HEADER, 10)
+
+    assert estimate_duration(recording) == frame_count * 1152 / 44100
@@ -0,0 +1,104 @@
+"""
+Memory regression test of the analysis pipeline.
+
+Runs the mock pipeline (mock strategy, in-memory downloader, local sinks)
+over thousands of synthetic files and checks that the audio of a file is
+released once it is analyzed: the peak memory may only grow by the small
+per-call results, not by the recordings.
+"""
+
+import tracemalloc
+from typing import List
+
+from call_analysis.analysis_strategies.analysis_processor import (
+    CallAnalyzer,
+    ProcessedCall,
+    ReportEvaluator,
+)
+from call_analysis.analysis_strategies.mock_strategy import MockAnalysisStrategy
+from call_analysis.deduplicator import CallDeduplicator
+from call_analysis.result_sinks import LocalStoreSink, ResultDispatcher, ResultSink
+from call_analysis.run_checkpoint import RunCheckpoint
+
+AUDIO_SIZE = 256 * 1024
+SMALL_RUN = 500
+LARGE_RUN = 2500
+# Retained per file on top of the audio-free results; far below AUDIO_SIZE
+MAX_GROWTH_PER_FILE = 32 * 1024
+
+
+class SyntheticDownloader:
+    """Returns a distinct recording per file, as the Drive downloader would."""
+
+    def download_file_in_memory(self, file_id: str, size=None) -> bytes:
+        index = int(file_id.rsplit("-", 1)[1])
+        return index.to_bytes(8, "big") * (AUDIO_SIZE // 8)
+
+
+class CountingSink(ResultSink):
+    """Acknowledges every report without keeping it."""
+
+    name = "counting"
+    lane = "counting"
+
+    def __init__(self):
+        self.written = 0
+
+    def write(self, reports: List[ProcessedCall]) -> List[ProcessedCall]:
+        self.written += len(reports)
+        return reports
+
+
+def _synthetic_files(count: int) -> List[dict]:
+    return [
+        {
+            "id": f"file-{index}",
+            "name": f"call_{index}.mp3",
+            "md5Checksum": f"{index:032x}",
+            "size": str(AUDIO_SIZE),
+        }
+        for index in range(count)
+    ]
+
+
+def _pipeline_peak(file_count: int, tmp_path) -> int:
+    """Runs the whole mock pipeline and returns its peak traced memory."""
+    files = _synthetic_files(file_count)
+    checkpoint = RunCheckpoint(f"run-{file_count}", directory=str(tmp_path))
+    counting_sink = CountingSink()
+    sinks = [
+        counting_sink,
+        LocalStoreSink(str(tmp_path / f"results_{file_count}.jsonl")),
+    ]
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        analyzer = CallAnalyzer(
+            strategy=MockAnalysisStrategy(),
+            downloader=SyntheticDownloader(),
+            deduplicator=CallDeduplicator(),
+        )
+        processed_calls = analyzer.analyze_files(files)
+        reports = ReportEvaluator(processed_calls).generate_evaluated_reports()
+        outcomes = ResultDispatcher(sinks, checkpoint).dispatch(reports)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert len(reports) == file_count
+    assert all(outcome.completed for outcome in outcomes)
+    assert counting_sink.written == file_count
+    return peak
+
+
+def test_memory_does_not_grow_with_audio_of_processed_files(tmp_path):
+    small_peak = _pipeline_peak(SMALL_RUN, tmp_path)
+    large_peak = _pipeline_peak(LARGE_RUN, tmp_path)
+
+    growth_per_file = (large_peak - small_peak) / (LARGE_RUN - SMALL_RUN)
+    assert growth_per_file < MAX_GROWTH_PER_FILE, (
+        f"Peak memory grows by {growth_per_file / 1024:.1f} KiB per file "
+        f"({small_peak / 2**20:.1f} MB for {SMALL_RUN} files, "
+        f"{large_peak / 2**20:.1f} MB for {LARGE_RUN})."
+    )
@@ -0,0 +1,146 @@
+"""
+Tests of the script-compliance phrase rules and of the re-scoring decision
+they drive (reuse the cached evaluation or call the LLM).
+"""
+
+from typing import List
+
+from call_analysis.analysis_strategies.gemini.output_schema import (
+    CallEvaluation,
+    DialogLine,
+    SpeakerTypes,
+)
+from call_analysis.analysis_strategies.gemini.two_pass_strategy import (
+    TwoPassGeminiStrategy,
+)
+from call_analysis.analysis_strategies.mock_strategy import MockAnalysisStrategy
+from call_analysis.rule_scorer import ScriptRuleScorer
+from call_analysis.transcript_cache import CachedTranscript
+from constants import ConfigFiles
+from main import _rescore_entry
+
+PROMPT_ID = "current-prompt"
+
+
+def _manager_lines(*texts: str) -> List[DialogLine]:
+    return [DialogLine(speaker=SpeakerTypes.MANAGER, text=text) for text in texts]
+
+
+def test_overlapping_phrases_of_two_fields_are_both_found():
+    # "кілометрів" is inside "скільки кілометрів": a match of the longer
+    # phrase must not use up the text the other field needs
+    scorer = ScriptRuleScorer(
+        {
+            "distance_asked": {
+                "speaker": SpeakerTypes.MANAGER.value,
+                "window": "any",
+                "phrase_groups": [["скільки кілометрів"]],
+            },
+            "unit_named": {
+                "speaker": SpeakerTypes.MANAGER.value,
+                "window": "any",
+                "phrase_groups": [["кілометрів"]],
+            },
+        }
+    )
+
+    decisions = scorer.score(_manager_lines("Скільки кілометрів у вас на одометрі?"))
+
+    assert decisions == {"distance_asked": True, "unit_named": True}
+
+
+def test_field_needs_every_phrase_group():
+    scorer = ScriptRuleScorer.from_file(ConfigFiles.SCRIPT_RULES)
+
+    greeting_only = scorer.score(_manager_lines("Добрий день!"))
+    greeting_and_name = scorer.score(_manager_lines("Добрий день, мене звати Олена."))
+
+    assert greeting_only["script_greeting"] is None
+    assert greeting_and_name["script_greeting"] is True
+
+
+class FakeTwoPassStrategy:
+    """Records the LLM re-evaluations instead of making them."""
+
+    evaluation_prompt_id = PROMPT_ID
+    combine = staticmethod(TwoPassGeminiStrategy.combine)
+
+    def __init__(self):
+        self.rescored = []
+
+    def rescore(self, entry: CachedTranscript):
+        self.rescored.append(entry.audio_hash)
+        return self.combine(entry.transcript, entry.evaluation)
+
+
+def _cached_entry(transcript: List[DialogLine]) -> CachedTranscript:
+    # The LLM said the year wasn't asked, the rules will say it was
+    evaluation = CallEvaluation(
+        **{
+            **MockAnalysisStrategy()
+            .analyse_call(b"")
+            .model_dump(include=set(CallEvaluation.model_fields)),
+            "car_info_year_asked": False,
+        }
+    )
+    return CachedTranscript(
+        audio_hash="hash",
+        transcript=transcript,
+        evaluation=evaluation,
+        evaluation_prompt_id=PROMPT_ID,
+    )
+
+
+def test_rescore_skips_the_llm_when_the_rules_decide_every_field():
+    scorer = ScriptRuleScorer.from_file(ConfigFiles.SCRIPT_RULES)
+    strategy = FakeTwoPassStrategy()
+    entry = _cached_entry(
+        _manager_lines(
+            "Добрий день, мене звати Олена.",
+            "Якого року ваше авто і який пробіг?",
+            "Дякую, до побачення!",
+        )
+    )
+
+    analysis, reused = _rescore_entry(entry, strategy, scorer)
+
+    assert reused is True
+    assert strategy.rescored == []
+    # The rules don't override the LLM, as in a normal run
+    assert analysis.car_info_year_asked is False
+
+
+def test_rescore_calls_the_llm_when_a_field_is_undecided():
+    scorer = ScriptRuleScorer.from_file(ConfigFiles.SCRIPT_RULES)
+    strategy = FakeTwoPassStrategy()
+    # No farewell: the rules can't decide script_farewell
+    entry = _cached_entry(
+        _manager_lines(
+            "Добрий день, мене звати Олена.",
+            "Якого року ваше авто і який пробіг?",
+        )
+    )
+
+    analysis, reused = _rescore_entry(entry, strategy, scorer)
+
+    assert reused is False
+    assert strategy.rescored == ["hash"]
+    assert analysis is not None
+
+
+def test_rescore_calls_the_llm_when_the_prompt_changed():
+    scorer = ScriptRuleScorer.from_file(ConfigFiles.SCRIPT_RULES)
+    strategy = FakeTwoPassStrategy()
+    entry = _cached_entry(
+        _manager_lines(
+            "Добрий день, мене звати Олена.",
+            "Якого року ваше авто і який пробіг?",
+            "Дякую, до побачення!",
+        )
+    )
+    entry.evaluation_prompt_id = "old-prompt"
+
+    _, reused = _rescore_entry(entry, strategy, scorer)
+
+    assert reused is False
+    assert strategy.rescored == ["hash"]
@@ -0,0 +1,88 @@
+"""
+Tests of the incremental JSON scanner and the streaming Gemini strategy.
+"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+from google.genai import types
+
+from call_analysis.analysis_strategies.gemini.json_stream import (
+    IncrementalJsonObjectScanner,
+    JsonStreamEvents,
+    MalformedJsonStreamError,
+)
+from call_analysis.analysis_strategies.gemini.streaming_strategy import (
+    StreamingGeminiAnalysisStrategy,
+)
+from call_analysis.analysis_strategies.mock_strategy import MockAnalysisStrategy
+
+ANALYSIS_JSON = MockAnalysisStrategy().analyse_call(b"").model_dump_json()
+
+
+def _scan(text: str, chunk_size: int) -> list:
+    scanner = IncrementalJsonObjectScanner(streamed_arrays={"transcript"})
+    events = []
+    for start in range(0, len(text), chunk_size):
+        events.extend(scanner.feed(text[start : start + chunk_size]))
+    assert scanner.text == text
+    return events
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 10_000])
+def test_pieces_do_not_depend_on_the_chunking(chunk_size):
+    events = _scan(ANALYSIS_JSON, chunk_size)
+
+    fields = {key: json.loads(raw) for event, key, raw in events if event == "field"}
+    items = [json.loads(raw) for event, _, raw in events if event == "item"]
+    assert fields == json.loads(ANALYSIS_JSON)
+    assert items == json.loads(ANALYSIS_JSON)["transcript"]
+    assert events[-1] == (JsonStreamEvents.END, None, None)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        '{"call_type": "Test",}',
+        '{"top_works_mentioned": ["Test",]}',
+        '{"transcript": [{"speaker": "Клієнт", "text": "Так",}]}',
+    ],
+)
+def test_trailing_comma_is_rejected(text):
+    scanner = IncrementalJsonObjectScanner(streamed_arrays={"transcript"})
+
+    with pytest.raises(MalformedJsonStreamError):
+        list(scanner.feed(text))
+
+
+class FakeModels:
+    """Streams a malformed response first and a valid one then."""
+
+    def __init__(self):
+        self.responses = [
+            ('{"call_type": "Test",}', 100),
+            (ANALYSIS_JSON, 300),
+        ]
+
+    def generate_content_stream(self, model, contents, config):
+        text, tokens = self.responses.pop(0)
+        usage = types.GenerateContentResponseUsageMetadata(
+            prompt_token_count=tokens - 10,
+            candidates_token_count=10,
+            total_token_count=tokens,
+        )
+        return iter([SimpleNamespace(text=text, usage_metadata=usage)])
+
+
+def test_usage_is_counted_per_attempt():
+    strategy = StreamingGeminiAnalysisStrategy(
+        client=SimpleNamespace(models=FakeModels()), model="model", prompt="prompt"
+    )
+
+    assert strategy.analyse_call(b"audio") is not None
+    assert [usage.total_token_count for usage in strategy.attempt_usages] == [
+        100,
+        300,
+    ]
+    assert strategy.last_usage.total_token_count == 400
@@ -0,0 +1,65 @@
+"""
+Tests of the incremental summary tab: the aggregates state file and the
+write of the summary table.
+"""
+
+import os
+
+from call_analysis.report_aggregator import ReportAggregator
+from excel_table.google_spreadsheets.editor import GoogleSheetEditor
+
+
+def test_corrupt_state_starts_empty_and_is_kept_aside(tmp_path):
+    state_path = tmp_path / "aggregates.json"
+    state_path.write_text('{"groups": {"Olena|2026-10-01|', encoding="utf-8")
+
+    aggregator = ReportAggregator(state_path=str(state_path))
+
+    assert aggregator.summary_rows()[1:] == []
+    assert os.path.exists(f"{state_path}.corrupt")
+    aggregator.save()
+    assert ReportAggregator(state_path=str(state_path)).summary_rows()[1:] == []
+
+
+def test_malformed_state_starts_empty(tmp_path):
+    state_path = tmp_path / "aggregates.json"
+    state_path.write_text('{"groups": {"key": {"count": 1}}}', encoding="utf-8")
+
+    aggregator = ReportAggregator(state_path=str(state_path))
+
+    assert aggregator.summary_rows()[1:] == []
+
+
+class FakeWorksheet:
+    id = 7
+
+
+class FakeSpreadsheet:
+    def __init__(self):
+        self.requests = []
+
+    def worksheet(self, title):
+        return FakeWorksheet()
+
+    def batch_update(self, body):
+        self.requests.extend(body["requests"])
+
+
+class FakeMainWorksheet:
+    def __init__(self, spreadsheet):
+        self.spreadsheet = spreadsheet
+
+
+def test_write_table_trims_the_tab_to_the_table_in_one_batch():
+    spreadsheet = FakeSpreadsheet()
+    editor = GoogleSheetEditor(client=None, worksheet=FakeMainWorksheet(spreadsheet))
+
+    assert editor.write_table("Summary", [["manager", "calls"], ["Olena", 3]])
+
+    resize, write = spreadsheet.requests
+    grid = resize["updateSheetProperties"]["properties"]["gridProperties"]
+    assert grid == {"rowCount": 2, "columnCount": 2}
+    assert write["updateCells"]["rows"][1]["values"] == [
+        {"userEnteredValue": {"stringValue": "Olena"}},
+        {"userEnteredValue": {"numberValue": 3}},
+    ]